@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Benchmark of FileStorage reload() and save() times and of the snapshot
+size with file.json against the binary format (HBNB_STORAGE_FORMAT).
+
+Usage: python3 -m benchmarks.bench_binary [size ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from benchmarks.bench_lazy_reload import write_store
+from models.engine import binary_snapshot
+from models.engine.file_storage import FileStorage
+import models
+
+
+def timed(storage_format, action):
+    """returns the time of action ("reload" or "save") in a format"""
+    FileStorage._FileStorage__format = storage_format
+    FileStorage._FileStorage__serialized.clear()
+    if action == "reload":
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__attributes = None
+    start = time.perf_counter()
+    getattr(models.storage, action)()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__file_path = path
+        for size in sizes:
+            write_store(path, size)
+            binary_snapshot.convert(path, os.path.join(tmp, "file.bin"),
+                                    True)
+            print("{} places".format(size))
+            for storage_format, name in (("json", "file.json"),
+                                         ("binary", "file.bin")):
+                reload = timed(storage_format, "reload")
+                save = timed(storage_format, "save")
+                print("  {:>6}: reload {:7.3f}s  save {:7.3f}s  {:6.1f} MB"
+                      .format(storage_format, reload, save,
+                              os.path.getsize(os.path.join(tmp, name)) /
+                              (1024 * 1024)))
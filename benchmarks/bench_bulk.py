@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""
+Benchmark of the console creating places: a loop of create commands
+(one save each) against create_many and against the same loop in a
+begin/commit batch (one save for all).
+
+Usage: python3 -m benchmarks.bench_bulk [count ...]
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from console import HBNBCommand
+from models.engine.file_storage import FileStorage
+
+
+def timed(commands):
+    """returns the time of the console running commands on an empty
+    store"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__classes = {}
+    FileStorage._FileStorage__attributes = None
+    FileStorage._FileStorage__dirty.clear()
+    FileStorage._FileStorage__serialized.clear()
+    cli = HBNBCommand()
+    with open(os.devnull, "w") as out, contextlib.redirect_stdout(out):
+        start = time.perf_counter()
+        for command in commands:
+            cli.onecmd(command)
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 5000]
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        for count in counts:
+            loop = timed(["create Place"] * count)
+            batch = timed(["begin"] + ["create Place"] * count + ["commit"])
+            many = timed(["create_many Place {}".format(count)])
+            print("{:>6} places: create loop {:7.2f}s ({:6.0f}/s)  "
+                  "begin/commit {:6.3f}s ({:6.0f}/s)  create_many {:6.3f}s "
+                  "({:6.0f}/s)".format(count, loop, count / loop, batch,
+                                       count / batch, many, count / many))
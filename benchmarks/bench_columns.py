@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""
+Benchmark of a range filter over the places ("price_by_night between
+50 and 100 and max_guest >= 3") with FileStorage.select, which runs it
+over the NumPy columns, against a scan of all the places. The columns
+are built by a first select, before the timings.
+
+Usage: python3 -m benchmarks.bench_columns [size ...]
+"""
+import random
+import sys
+import time
+from models.engine.file_storage import FileStorage
+from models.engine.storage_engine import matches
+from models.place import Place
+import models
+
+CONDITIONS = [("price_by_night", ">=", 50), ("price_by_night", "<=", 100),
+              ("max_guest", ">=", 3)]
+
+
+def fill(size):
+    """stores size places with random prices and guest counts"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__classes = {}
+    FileStorage._FileStorage__attributes = None
+    FileStorage._FileStorage__columns = None
+    FileStorage._FileStorage__dirty.clear()
+    rand = random.Random(size)
+    for i in range(size):
+        place = Place(id=str(i), price_by_night=rand.randrange(500),
+                      max_guest=rand.randrange(1, 9))
+        models.storage.new(place)
+
+
+def timed(select):
+    """returns the result and the time of select(Place, CONDITIONS)"""
+    start = time.perf_counter()
+    found = select(Place, CONDITIONS)
+    return found, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    for size in sizes:
+        fill(size)
+        models.storage.select(Place, CONDITIONS)
+        scanned, scan = timed(
+            lambda cls, conditions: {
+                key: obj for key, obj in models.storage.all(cls).items()
+                if matches(obj, conditions)})
+        found, columns = timed(models.storage.select)
+        assert found.keys() == scanned.keys()
+        print("{:>9} places, {:>7} found: scan {:8.1f} ms  columns "
+              "{:8.1f} ms  x{:.0f}".format(size, len(found), scan * 1000,
+                                           columns * 1000, scan / columns))
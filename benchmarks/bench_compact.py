@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Benchmark of the memory of the model instances with and without the
+compact models (HBNB_COMPACT_MODELS=1): peak RSS of a fresh interpreter
+reloading a file.json of places with every Place attribute set.
+
+Usage: python3 -m benchmarks.bench_compact [size]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from benchmarks.bench_lazy_reload import REPO
+
+CODE = """
+import resource
+import models
+print(len(models.storage.all()), resource.getrusage(
+    resource.RUSAGE_SELF).ru_maxrss // 1024)
+"""
+
+
+def write_places(path, size):
+    """writes a file.json of size places with all their attributes"""
+    with open(path, mode="w", encoding="utf-8") as file:
+        file.write("{")
+        for i in range(size):
+            place_id = str(uuid.uuid4())
+            value = {"id": place_id, "__class__": "Place",
+                     "created_at": "2024-05-18T19:48:26.867683",
+                     "updated_at": "2024-05-18T19:48:26.867707",
+                     "city_id": "city {}".format(i % 1000),
+                     "user_id": "user {}".format(i % 10000),
+                     "name": "place {}".format(i),
+                     "description": "description {}".format(i),
+                     "number_rooms": i % 7, "number_bathrooms": i % 3,
+                     "max_guest": i % 11, "price_by_night": i % 500,
+                     "latitude": 37.7 + i / 1e7,
+                     "longitude": -122.4 - i / 1e7,
+                     "amenity_ids": []}
+            if i:
+                file.write(", ")
+            file.write('"Place.{}": {}'.format(place_id, json.dumps(value)))
+        file.write("}")
+
+
+def peak_rss(tmp, compact):
+    """returns the peak RSS in MB of a fresh interpreter reloading the
+    store of tmp"""
+    env = dict(os.environ, PYTHONPATH=REPO,
+               HBNB_COMPACT_MODELS="1" if compact else "0")
+    out = subprocess.run([sys.executable, "-c", CODE], cwd=tmp, env=env,
+                         check=True, stdout=subprocess.PIPE)
+    return int(out.stdout.split()[-1])
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp:
+        write_places(os.path.join(tmp, "file.json"), size)
+        usual = peak_rss(tmp, False)
+        compact = peak_rss(tmp, True)
+        print("{} places".format(size))
+        print("  __dict__ instances: peak RSS {:6} MB".format(usual))
+        print("  compact instances:  peak RSS {:6} MB  (-{:.0%})".format(
+            compact, 1 - compact / usual))
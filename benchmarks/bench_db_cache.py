@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Benchmark of the cache of instances of DBStorage: memory kept after
+reading every object of a large database with a bounded cache against an
+unlimited one, and the time of get() for hot keys (cache hits) against
+cold ones (rows read from SQLite), with the counters of cache_info().
+
+Usage: python3 -m benchmarks.bench_db_cache [count] [cache size]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+from models.user import User
+from models.engine.db_storage import DBStorage
+
+
+def open_storage(path, cache):
+    """returns a DBStorage on the database at path"""
+    with patch.dict(os.environ, {"HBNB_SQLITE_PATH": path,
+                                 "HBNB_SQLITE_CACHE": str(cache)}):
+        storage = DBStorage()
+    storage.reload()
+    return storage
+
+
+def fill(path, count):
+    """creates count users in the database, returns their ids"""
+    storage = open_storage(path, 0)
+    with patch("models.storage", storage):
+        ids = [User().id for i in range(count)]
+        storage.save()
+    storage.close()
+    return ids
+
+
+def memory(path, cache):
+    """returns the memory (bytes) kept after reading every user"""
+    tracemalloc.start()
+    storage = open_storage(path, cache)
+    for key, obj in storage.iterate(User):
+        pass
+    kept = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    storage.close()
+    return kept
+
+
+def lookups(path, cache, ids, hot):
+    """returns the (µs per get() of hot keys, µs per get() of cold keys,
+    cache_info()) of a workload of 90% gets on the hot keys"""
+    storage = open_storage(path, cache)
+    hot_ids = ids[:hot]
+    times = {"hot": [], "cold": []}
+    for i in range(200000):
+        if random.random() < 0.9:
+            kind, id = "hot", random.choice(hot_ids)
+        else:
+            kind, id = "cold", random.choice(ids)
+        start = time.perf_counter()
+        storage.get(User, id)
+        times[kind].append(time.perf_counter() - start)
+    info = storage.cache_info()
+    storage.close()
+    return (sum(times["hot"]) / len(times["hot"]) * 1e6,
+            sum(times["cold"]) / len(times["cold"]) * 1e6, info)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    cache = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hbnb.db")
+        ids = fill(path, count)
+        for size in (0, cache):
+            print("cache {:>9}: {:7.1f} MB kept after reading {} "
+                  "users".format(size or "unlimited",
+                                 memory(path, size) / 2 ** 20, count))
+        hot, cold, info = lookups(path, cache, ids, cache // 2)
+        print("get(): {:.1f} µs hot, {:.1f} µs cold".format(hot, cold))
+        print("cache_info(): {}".format(info))
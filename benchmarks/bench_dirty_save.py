@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Benchmark of FileStorage.save() after a single update: the full
+re-serialization of every object (the previous save(), written to a
+file of its own) against the dirty-tracking save(), without and with
+the cached text of clean objects (HBNB_STORAGE_CACHE=1).
+
+Usage: python3 -m benchmarks.bench_dirty_save [size ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from models.engine.file_storage import FileStorage
+from models.place import Place
+import models
+
+
+def full_save(path):
+    """the save() FileStorage used before dirty tracking"""
+    json_dict = {}
+    for key, value in models.storage.all().items():
+        json_dict[key] = value.to_dict()
+    with open(path, mode="w", encoding="utf-8") as file:
+        json.dump(json_dict, file)
+
+
+def dirty_save(place, cache):
+    """returns the time of the save after one change to place"""
+    FileStorage._FileStorage__cache = cache
+    FileStorage._FileStorage__serialized.clear()
+    models.storage.save()
+    place.name = "updated"
+    start = time.perf_counter()
+    models.storage.save()
+    return time.perf_counter() - start
+
+
+def run(size, path):
+    """prints the timings of the saves for a store of size places; the
+    full save writes to path, not to the file of the storage, which
+    would then see the change of another process and merge it"""
+    FileStorage._FileStorage__objects = {}
+    places = [Place() for i in range(size)]
+    models.storage.save()
+    places[0].name = "updated"
+    start = time.perf_counter()
+    full_save(path)
+    full = time.perf_counter() - start
+    dirty = dirty_save(places[1], False)
+    cached = dirty_save(places[2], True)
+    print("{:>9} objects: full {:8.3f}s  dirty {:8.3f}s  x{:.1f}  "
+          "cached {:8.3f}s  x{:.1f}".format(size, full, dirty, full / dirty,
+                                            cached, full / cached))
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        for size in sizes:
+            run(size, os.path.join(tmp, "full.json"))
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Benchmark of the geographic searches of FileStorage (radius, bounding
+box, k nearest neighbours) through the grid index, against the scan of
+all the places of StorageEngine. The grid is built by a first search,
+before the timings.
+
+The places are spread over the contiguous United States.
+
+Usage: python3 -m benchmarks.bench_geo [size ...]
+"""
+import random
+import sys
+import time
+from models.engine.file_storage import FileStorage
+from models.engine.storage_engine import StorageEngine
+from models.place import Place
+import models
+
+QUERIES = (("near", (40.7128, -74.0060, 10)),
+           ("within", (37.70, -122.52, 37.81, -122.35)),
+           ("nearest", (41.8781, -87.6298, 10)))
+
+
+def fill(size):
+    """stores size places with random coordinates"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__classes = {}
+    FileStorage._FileStorage__attributes = None
+    FileStorage._FileStorage__columns = None
+    FileStorage._FileStorage__geo = None
+    FileStorage._FileStorage__dirty.clear()
+    rand = random.Random(size)
+    for i in range(size):
+        models.storage.new(Place(id=str(i),
+                                 latitude=rand.uniform(24.5, 49.4),
+                                 longitude=rand.uniform(-124.8, -66.9)))
+
+
+def timed(search, args):
+    """returns the result and the time of search(*args)"""
+    start = time.perf_counter()
+    found = search(*args)
+    return found, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    for size in sizes:
+        fill(size)
+        models.storage.within(0, 0, 0, 0)
+        print("{} places".format(size))
+        for name, args in QUERIES:
+            scanned, scan = timed(getattr(StorageEngine, name),
+                                  (models.storage,) + args)
+            found, indexed = timed(getattr(models.storage, name), args)
+            # within() is unordered, near() and nearest() by distance
+            assert sorted(found) == sorted(scanned)
+            assert name == "within" or list(found) == list(scanned)
+            print("  {:>7} ({:>4} found): scan {:9.1f} ms  grid {:7.2f} ms"
+                  "  x{:.0f}".format(name, len(found), scan * 1000,
+                                     indexed * 1000, scan / indexed))
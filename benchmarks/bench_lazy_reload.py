@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Benchmark of the console startup time (import of models, which reloads
+file.json) with the eager and the lazy reload of FileStorage, followed
+by one show-like access of a single object.
+
+Usage: python3 -m benchmarks.bench_lazy_reload [size ...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHOW = ("import models; "
+        "models.storage.all()['Place.{}']")
+
+
+def write_store(path, size, description=""):
+    """writes a file.json of size places, returns the id of the last"""
+    with open(path, mode="w", encoding="utf-8") as file:
+        file.write("{")
+        for i in range(size):
+            place_id = str(uuid.uuid4())
+            value = {"id": place_id, "__class__": "Place",
+                     "created_at": "2024-05-18T19:48:26.867683",
+                     "updated_at": "2024-05-18T19:48:26.867707",
+                     "name": "place {}".format(i), "price_by_night": i,
+                     "description": description}
+            if i:
+                file.write(", ")
+            file.write('"Place.{}": {}'.format(place_id, json.dumps(value)))
+        file.write("}")
+    return place_id
+
+
+def startup(tmp, place_id, lazy):
+    """returns the time of a fresh interpreter loading the store"""
+    env = dict(os.environ, PYTHONPATH=REPO,
+               HBNB_STORAGE_LAZY="1" if lazy else "0")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", SHOW.format(place_id)],
+                   cwd=tmp, env=env, check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            place_id = write_store(os.path.join(tmp, "file.json"), size)
+            eager = startup(tmp, place_id, False)
+            lazy = startup(tmp, place_id, True)
+            print("{:>9} objects: eager {:8.3f}s  lazy {:8.3f}s  x{:.1f}"
+                  .format(size, eager, lazy, eager / lazy))
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Benchmark of the peak memory (max RSS) of FileStorage.reload() and
+FileStorage.save() with the streaming reader/writer, against the
+previous json.load()/json.dump() of a full copy of the store.
+
+Each scenario runs in a fresh interpreter. The default store is about
+300 MB (500k places with a 400 character description).
+
+Usage: python3 -m benchmarks.bench_memory [size]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from benchmarks.bench_lazy_reload import REPO, write_store
+
+PEAK = ("import resource; print(resource.getrusage("
+        "resource.RUSAGE_SELF).ru_maxrss // 1024)")
+SCENARIOS = {
+    "reload (json.load)": """
+import json
+from models.engine.file_storage import FileStorage
+from models.place import Place
+with open("file.json") as file:
+    json_dict = json.load(file)
+objects = {key: Place(**value) for key, value in json_dict.items()}
+""",
+    "reload (streaming)": """
+import models
+models.storage
+""",
+    "save (json.dump)": """
+import json
+import models
+json_dict = {}
+for key, value in models.storage.all().items():
+    json_dict[key] = value.to_dict()
+with open("file.json", mode="w", encoding="utf-8") as file:
+    json.dump(json_dict, file)
+""",
+    "save (streaming)": """
+import models
+models.storage.save()
+""",
+}
+
+
+def peak_rss(tmp, code):
+    """returns the peak RSS in MB of a fresh interpreter running code"""
+    env = dict(os.environ, PYTHONPATH=REPO)
+    out = subprocess.run([sys.executable, "-c", code + PEAK], cwd=tmp,
+                         env=env, check=True, stdout=subprocess.PIPE)
+    return int(out.stdout.split()[-1])
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        write_store(path, size, description="x" * 400)
+        print("{} places, file.json {} MB".format(
+            size, os.path.getsize(path) // (1024 * 1024)))
+        for name, code in SCENARIOS.items():
+            print("{:>20}: peak RSS {:6} MB".format(name,
+                                                    peak_rss(tmp, code)))
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Benchmark of a cold-start `console.py -c "show Place <id>"` on stores of
+growing size, with the eager reload, the lazy reload and the memory-mapped
+snapshot index (HBNB_STORAGE_MMAP=1): the mapped startup stays about the
+same whatever the size of the store.
+
+Usage: python3 -m benchmarks.bench_mmap_show [size ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_lazy_reload import REPO, write_store
+
+MODES = [("eager", {}), ("lazy", {"HBNB_STORAGE_LAZY": "1"}),
+         ("mmap", {"HBNB_STORAGE_MMAP": "1"})]
+INDEX = ("import models; from models.place import Place; "
+         "models.storage.get(Place, '{}').save()")
+
+
+def show(tmp, place_id, env):
+    """returns the time of a fresh console showing one place"""
+    env = dict(os.environ, PYTHONPATH=REPO, **env)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(REPO, "console.py"), "-c",
+                    "show Place {}".format(place_id)], cwd=tmp, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            place_id = write_store(os.path.join(tmp, "file.json"), size)
+            # a first save in mapped mode writes file.json.idx
+            subprocess.run([sys.executable, "-c", INDEX.format(place_id)],
+                           cwd=tmp, check=True,
+                           env=dict(os.environ, PYTHONPATH=REPO,
+                                    HBNB_STORAGE_MMAP="1"))
+            times = {name: min(show(tmp, place_id, env) for i in range(3))
+                     for name, env in MODES}
+            print("{:>9} objects: ".format(size) + "  ".join(
+                "{} {:7.3f}s".format(name, times[name])
+                for name, env in MODES))
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""
+Benchmark of the reload time of FileStorage against the number of
+processes parsing the snapshot (HBNB_STORAGE_WORKERS), in a fresh
+interpreter, for a single indexed file.json and for 16 shards.
+
+Usage: python3 -m benchmarks.bench_parallel_reload [objects] [workers ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from benchmarks.bench_lazy_reload import REPO, write_store
+
+# the first use of models.storage reloads it
+RELOAD = ("import time; start = time.perf_counter(); import models; "
+          "models.storage; print(time.perf_counter() - start)")
+INDEX = "import models; models.storage.save()"
+
+
+def run(tmp, code, **env):
+    """runs code in a fresh interpreter on the store in tmp, returns its
+    output"""
+    env = dict(os.environ, PYTHONPATH=REPO, **env)
+    return subprocess.run([sys.executable, "-c", code], cwd=tmp, env=env,
+                          check=True, capture_output=True,
+                          text=True).stdout
+
+
+def reload_time(tmp, workers, shards):
+    """returns the best time of a reload by workers processes"""
+    return min(float(run(tmp, RELOAD, HBNB_STORAGE_WORKERS=str(workers),
+                         HBNB_STORAGE_SHARDS=shards))
+               for i in range(3))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    workers = [int(arg) for arg in sys.argv[2:]] or [1, 2, 4, 8]
+    print("{} CPUs".format(os.cpu_count()))
+    with tempfile.TemporaryDirectory() as tmp:
+        write_store(os.path.join(tmp, "file.json"), count)
+        # a save with workers > 1 writes the offset index, file.json.idx
+        run(tmp, INDEX, HBNB_STORAGE_WORKERS="2")
+        subprocess.run([sys.executable, "-m", "models.engine.shards",
+                        "split", os.path.join(tmp, "file.json"), "16"],
+                       cwd=REPO, check=True)
+        for shards in ("", "16"):
+            print("{} objects, {}:".format(
+                count, "16 shards" if shards else "one file"))
+            base = None
+            for n in workers:
+                elapsed = reload_time(tmp, n, shards)
+                base = base or elapsed
+                print("  {:2d} workers: {:7.2f}s  x{:.2f}".format(
+                    n, elapsed, base / elapsed))
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Benchmark of the sharded snapshots of FileStorage: time of a save after
+one Review changed, in a store of mostly users and places, with one
+file.json, one file per class and 16 buckets of keys. The serialized
+cache is off (the default, see HBNB_STORAGE_CACHE), as for a store too
+large to keep its text in memory, so a save re-encodes every object of
+the shards it rewrites.
+
+Usage: python3 -m benchmarks.bench_shards [objects]
+"""
+import os
+import sys
+import tempfile
+import time
+from models.place import Place
+from models.review import Review
+from models.user import User
+from models.engine.file_storage import FileStorage
+import models
+
+SHARDINGS = [("one file", None), ("per class", "class"),
+             ("16 buckets", 16)]
+
+
+def fill(tmp, sharding, count):
+    """returns a review of a store of count objects saved with
+    sharding in the directory tmp"""
+    FileStorage._FileStorage__file_path = os.path.join(
+        tmp, "{}.json".format(sharding))
+    FileStorage._FileStorage__shards = sharding
+    FileStorage._FileStorage__shard_keys = \
+        {} if isinstance(sharding, int) else None
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__classes = {}
+    FileStorage._FileStorage__attributes = None
+    FileStorage._FileStorage__columns = None
+    FileStorage._FileStorage__geo = None
+    FileStorage._FileStorage__dirty.clear()
+    for i in range(count // 2):
+        User().first_name = "user {}".format(i)
+        Place().name = "place {}".format(i)
+    review = Review()
+    models.storage.save()
+    return review
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, sharding in SHARDINGS:
+            review = fill(tmp, sharding, count)
+            times = []
+            for i in range(5):
+                review.text = "review {}".format(i)
+                start = time.perf_counter()
+                models.storage.save()
+                times.append(time.perf_counter() - start)
+            print("{:>10}: save after one Review changed {:8.1f} ms".format(
+                name, min(times) * 1000))
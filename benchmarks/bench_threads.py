@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Benchmark of FileStorage used by several threads:
+- throughput of reader threads (get, all(User), count) and writer threads
+  (create, update, destroy) running together with a thread saving in a
+  loop, for a few mixes of threads;
+- the longest a writer waits while a save of a large store runs, against
+  the time of the save itself: a first save (every object unsaved), then
+  a save after 1% of the objects changed.
+
+Usage: python3 -m benchmarks.bench_threads [objects] [seconds]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from models.user import User
+from models.engine.file_storage import FileStorage
+import models
+
+MIXES = [(1, 1), (4, 1), (4, 4), (8, 2)]
+
+
+def reset(count):
+    """fills an empty store with count users, all unsaved"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__classes = {}
+    FileStorage._FileStorage__attributes = None
+    FileStorage._FileStorage__dirty.clear()
+    FileStorage._FileStorage__serialized.clear()
+    return [User().id for i in range(count)]
+
+
+def throughput(ids, readers, writers, seconds):
+    """returns the (reads/s, writes/s, saves) of the threads running
+    together for seconds"""
+    storage = models.storage
+    done = threading.Event()
+    counts = {"read": 0, "write": 0, "save": 0}
+
+    def read():
+        n = 0
+        while not done.is_set():
+            storage.get(User, random.choice(ids))
+            storage.count(User)
+            n += 1
+            if n % 1000 == 0:
+                storage.all(User)
+        counts["read"] += n
+
+    def write():
+        n = 0
+        while not done.is_set():
+            user = User()
+            user.first_name = "Betty"
+            storage.delete(user)
+            n += 1
+        counts["write"] += n
+
+    def save():
+        while not done.is_set():
+            storage.save()
+            counts["save"] += 1
+
+    threads = [threading.Thread(target=read) for i in range(readers)]
+    threads += [threading.Thread(target=write) for i in range(writers)]
+    threads.append(threading.Thread(target=save))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    done.set()
+    for thread in threads:
+        thread.join()
+    return (counts["read"] / seconds, counts["write"] / seconds,
+            counts["save"])
+
+
+def stall(count, changed=None):
+    """returns the (time of a save of count users, longest time a writer
+    thread waited during it). The users are all unsaved, or only the
+    changed first ones after a first save"""
+    ids = reset(count)
+    if changed is not None:
+        models.storage.save()
+        for id in ids[:changed]:
+            models.storage.get(User, id).first_name = "Betty"
+    done = threading.Event()
+    waits = []
+
+    def write():
+        while not done.is_set():
+            start = time.perf_counter()
+            User()
+            waits.append(time.perf_counter() - start)
+            time.sleep(0.0005)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    start = time.perf_counter()
+    models.storage.save()
+    elapsed = time.perf_counter() - start
+    done.set()
+    writer.join()
+    return elapsed, max(waits)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        ids = reset(10000)
+        models.storage.save()
+        for readers, writers in MIXES:
+            reads, writes, saves = throughput(ids, readers, writers,
+                                              seconds)
+            print("{} readers, {} writers: {:9.0f} reads/s {:8.0f} "
+                  "writes/s {:4d} saves".format(readers, writers, reads,
+                                                writes, saves))
+        for changed in (None, count // 100):
+            elapsed, longest = stall(count, changed)
+            print("save of {} objects ({} changed): {:.2f}s, longest "
+                  "writer wait {:.1f} ms".format(
+                      count, count if changed is None else changed,
+                      elapsed, longest * 1000))
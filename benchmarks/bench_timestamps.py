@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Microbenchmark of the instances BaseModel(**kwargs) builds per second
+from to_dict() dictionaries, with the former strptime path against the
+fromisoformat one.
+
+Usage: python3 -m benchmarks.bench_timestamps [count]
+"""
+from datetime import datetime
+import sys
+import time
+from models.base_model import time_form
+from models.place import Place
+
+
+class LegacyPlace(Place):
+    """Place rebuilt the way BaseModel.__init__ did before"""
+
+    def __init__(self, *args, **kwargs):
+        """sets each attribute, parsing the timestamps with strptime"""
+        for key, value in kwargs.items():
+            if key == "__class__":
+                continue
+            if key in ("created_at", "updated_at"):
+                value = datetime.strptime(value, time_form)
+            setattr(self, key, value)
+
+
+def rate(cls, dicts):
+    """returns the instances of cls built per second from dicts"""
+    start = time.perf_counter()
+    for value in dicts:
+        cls(**value)
+    return len(dicts) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    value = Place(name="Loft", city_id="c1", price_by_night=80).to_dict()
+    dicts = [dict(value) for _ in range(count)]
+    before = rate(LegacyPlace, dicts)
+    after = rate(Place, dicts)
+    print("{} instances".format(count))
+    print("  strptime:      {:10.0f}/s".format(before))
+    print("  fromisoformat: {:10.0f}/s  (x{:.1f})".format(
+        after, after / before))
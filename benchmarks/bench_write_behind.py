@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Benchmark of piping create commands into console.py with synchronous
+saves against the write-behind mode of FileStorage.
+
+Usage: python3 -m benchmarks.bench_write_behind [count]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_lazy_reload import REPO
+
+MODES = {
+    "synchronous": {},
+    "write-behind": {"HBNB_STORAGE_WRITE_BEHIND": "1"},
+    "journal": {"HBNB_STORAGE_JOURNAL": "1"},
+    "journal + write-behind": {"HBNB_STORAGE_JOURNAL": "1",
+                               "HBNB_STORAGE_WRITE_BEHIND": "1"},
+}
+
+
+def pipe(count, env):
+    """returns the time console.py takes to run count create commands"""
+    commands = "create Place\n" * count
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=REPO, **env)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(REPO, "console.py")],
+                       input=commands.encode(), cwd=tmp, env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - start
+        stored = subprocess.run(
+            [sys.executable, "-c",
+             "import models; print(models.storage.count())"],
+            cwd=tmp, env=env, stdout=subprocess.PIPE, check=True)
+        assert int(stored.stdout) == count
+    return elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, env in MODES.items():
+        elapsed = pipe(count, env)
+        print("{:>24}: {:8.2f}s  {:9.0f} creates/s".format(
+            name, elapsed, count / elapsed))
@@ -2,8 +2,15 @@
 """
 BaseModel class that defines all common attributes/methods for other classes
 """
+import argparse
 import cmd
+import json
 import shlex
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from itertools import islice
 from models.base_model import BaseModel
 from models.user import User
 from models.place import Place
@@ -12,6 +19,7 @@ from models.city import City
 from models.amenity import Amenity
 from models.review import Review
 from models import storage
+from models.engine import query
 from re import search
 
 
@@ -25,19 +33,57 @@ class HBNBCommand(cmd.Cmd):
 
     doc_header = "Documented commands (type help <topic>):"
     ruler = '='
+    # batches opened by begin and not committed yet
+    open_batches = 0
+    # 1 once the changes could not be saved at exit
+    exit_status = 0
 
     def do_EOF(self, line):
         """Exit the program with Ctrl+D"""
+        self.close_batches()
         return True
 
     def do_quit(self, line):
         """Quit command to exit the program"""
+        self.close_batches()
+        return True
+
+    def close_batches(self, report=None, own=0):
+        """
+            Commits the batches begin left open, with a warning on
+            report (the standard error by default), and the own batches
+            of the caller, then writes the saves still pending. Returns
+            False (and sets exit_status) if the changes could not be
+            saved
+        """
+        report = report or sys.stderr
+        if self.open_batches:
+            print("** {} begin without commit: committed **".format(
+                self.open_batches), file=report)
+        try:
+            while self.open_batches + own:
+                if self.open_batches:
+                    self.open_batches -= 1
+                else:
+                    own -= 1
+                storage.commit()
+            storage.flush()
+        except Exception as error:
+            print("** cannot save: {}: {} **".format(
+                type(error).__name__, error), file=report)
+            self.exit_status = 1
+            return False
         return True
 
     def emptyline(self):
         """An empty line + ENTER shouldn’t execute anything"""
         pass
 
+    def precmd(self, line):
+        """Loads what other consoles saved before running the command"""
+        storage.refresh()
+        return line
+
     def do_create(self, arg):
         """Creates a new instance of BaseModel"""
         args_list = shlex.split(arg)
@@ -50,6 +96,110 @@ class HBNBCommand(cmd.Cmd):
         else:
             print("** class doesn't exist **")
 
+    def do_create_many(self, arg):
+        """
+            Creates <n> instances of a class, saved once at the end
+            (create_many <class> <n>), and prints their ids
+        """
+        args_list = shlex.split(arg)
+        if not args_list:
+            print("** class name missing **")
+        elif args_list[0] not in HBNBCommand.list_classes:
+            print("** class doesn't exist **")
+        elif len(args_list) < 2 or not args_list[1].isdigit():
+            print("** number of instances missing **")
+        else:
+            cls = globals()[args_list[0]]
+            with storage.batch():
+                for _ in range(int(args_list[1])):
+                    print(cls().id)
+                storage.save()
+
+    def do_import(self, arg):
+        """
+            Creates (or replaces, by id) the instances of a class read
+            from a JSON Lines file, one to_dict()-like object per line,
+            saved once at the end (import <class> <file.jsonl>); prints
+            the number of instances imported
+        """
+        args_list = shlex.split(arg)
+        if not args_list:
+            print("** class name missing **")
+        elif args_list[0] not in HBNBCommand.list_classes:
+            print("** class doesn't exist **")
+        elif len(args_list) < 2:
+            print("** file name missing **")
+        else:
+            cls = globals()[args_list[0]]
+            count = 0
+            try:
+                file = open(args_list[1], encoding="utf-8")
+            except OSError as error:
+                print("** cannot read {}: {} **".format(args_list[1],
+                                                        error.strerror))
+                return
+            with file, storage.batch():
+                for number, line in enumerate(file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        attributes = json.loads(line)
+                        if not isinstance(attributes, dict):
+                            raise ValueError("not an object")
+                        attributes.pop("__class__", None)
+                        instance = cls(**attributes)
+                    except ValueError as error:
+                        print("** line {}: {} **".format(number, error))
+                        continue
+                    storage.new(instance)
+                    count += 1
+                storage.save()
+            print(count)
+
+    def do_destroy_where(self, arg):
+        """
+            Deletes the instances of a class that meet all the conditions
+            (destroy_where <class> <attribute><operator><value> ...),
+            saved once; prints the number of instances destroyed
+        """
+        args_list = shlex.split(arg)
+        if not args_list:
+            print("** class name missing **")
+        elif args_list[0] not in HBNBCommand.list_classes:
+            print("** class doesn't exist **")
+        elif len(args_list) < 2:
+            print("** condition missing **")
+        else:
+            conditions = []
+            for condition in args_list[1:]:
+                parsed = query.parse_condition(condition)
+                if parsed is None:
+                    print("** invalid condition {} **".format(condition))
+                    return
+                conditions.append(parsed)
+            found = storage.select(args_list[0], conditions)
+            with storage.batch():
+                for instance in found.values():
+                    storage.delete(instance)
+                storage.save()
+            print(len(found))
+
+    def do_begin(self, arg):
+        """
+            Starts a batch: the changes of the next commands are only
+            saved by the matching commit (batches nest)
+        """
+        storage.begin()
+        self.open_batches += 1
+
+    def do_commit(self, arg):
+        """Ends the batch started by begin and saves its changes"""
+        if not self.open_batches:
+            print("** no batch to commit **")
+            return
+        self.open_batches -= 1
+        storage.commit()
+
     def do_show(self, arg):
         """
             Prints the string representation of an instance
@@ -63,11 +213,11 @@ class HBNBCommand(cmd.Cmd):
         elif len(args_list) < 2:
             print("** instance id missing **")
         else:
-            id_object = "{}.{}".format(args_list[0], args_list[1])
-            if id_object not in storage.all():
+            instance = storage.get(args_list[0], args_list[1])
+            if instance is None:
                 print("** no instance found **")
             else:
-                print(storage.all()[id_object])
+                print(instance)
 
     def do_destroy(self, arg):
         """
@@ -82,31 +232,99 @@ class HBNBCommand(cmd.Cmd):
         elif len(args_list) < 2:
             print("** instance id missing **")
         else:
-            id_object = "{}.{}".format(args_list[0], args_list[1])
-            if id_object not in storage.all():
+            instance = storage.get(args_list[0], args_list[1])
+            if instance is None:
                 print("** no instance found **")
             else:
-                del storage.all()[id_object]
+                storage.delete(instance)
                 storage.save()
 
     def do_all(self, arg):
         """
             Prints all string representation of all instances
-            based or not on the class name
+            based or not on the class name, one at a time. Options:
+                limit=<n> offset=<n>: prints one page of <n> instances,
+                    then the cursor=<...> of the next page, if any
+                cursor=<...>: starts where the previous page stopped
+                format=jsonl: prints one JSON object (to_dict()) per line
+            (e.g. all Place limit=100 format=jsonl)
         """
-        element_list = []
         args_list = shlex.split(arg)
-        if not args_list:
-            for value in storage.all().values():
-                element_list.append(str(value))
-            print(element_list)
-        elif args_list[0] in HBNBCommand.list_classes:
-            for value in storage.all().values():
-                if value.__class__.__name__ == args_list[0]:
-                    element_list.append(str(value))
-            print(element_list)
-        else:
-            print("** class doesn't exist **")
+        class_name = None
+        if args_list and "=" not in args_list[0]:
+            class_name = args_list.pop(0)
+            if class_name not in HBNBCommand.list_classes:
+                print("** class doesn't exist **")
+                return
+        options = {}
+        for option in args_list:
+            name, sep, value = option.partition("=")
+            if not sep or name not in ("limit", "offset", "cursor",
+                                       "format") or \
+                    (name in ("limit", "offset") and not value.isdigit()) or \
+                    (name == "format" and value not in ("list", "jsonl")):
+                print("** invalid option {} **".format(option))
+                return
+            options[name] = value
+        items = storage.iterate(class_name)
+        position = int(options.get("offset", 0))
+        if "cursor" in options:
+            position = HBNBCommand.resume(class_name, options["cursor"])
+            if position is None:
+                print("** invalid cursor **")
+                return
+            items = storage.iterate(class_name)
+        items = islice(items, position, None)
+        limit = options.get("limit")
+        page = items if limit is None else islice(items, int(limit))
+        last = HBNBCommand.print_items(page, options.get("format", "list"))
+        if limit is not None and last is not None and \
+                next(items, None) is not None:
+            print("cursor={}:{}".format(position + int(limit), last))
+
+    @staticmethod
+    def print_items(items, output_format):
+        """
+            Prints the (key, instance) items as they come, as the list of
+            their string representation or as JSON Lines; returns the last
+            key printed (None if there was none)
+        """
+        last = None
+        if output_format == "list":
+            print("[", end="")
+        for key, value in items:
+            if output_format == "jsonl":
+                print(json.dumps(value.to_dict()))
+            else:
+                print("{}{!r}".format(", " if last else "", str(value)),
+                      end="")
+            last = key
+        if output_format == "list":
+            print("]")
+        return last
+
+    @staticmethod
+    def resume(class_name, cursor):
+        """
+            Returns the position of the next page of a cursor
+            <position>:<last key>. The last key is checked at its position
+            and searched for if objects were added or destroyed since;
+            when it is gone, the page resumes at the position
+        """
+        position, sep, key = cursor.partition(":")
+        if not sep or not position.isdigit():
+            return None
+        position = int(position)
+        if position == 0:
+            return 0
+        before = next(islice(storage.iterate(class_name), position - 1,
+                             None), None)
+        if before is not None and before[0] == key:
+            return position
+        for index, (other, value) in enumerate(storage.iterate(class_name)):
+            if other == key:
+                return index + 1
+        return position - 1
 
     def do_update(self, arg):
         """Updates an instance by adding or updating attribute"""
@@ -118,8 +336,8 @@ class HBNBCommand(cmd.Cmd):
         elif len(args_list) < 2:
             print("** instance id missing **")
         else:
-            id_object = "{}.{}".format(args_list[0], args_list[1])
-            if id_object not in storage.all():
+            instance = storage.get(args_list[0], args_list[1])
+            if instance is None:
                 print("** no instance found **")
             elif (len(args_list) == 3 and args_list[2].startswith("{") and
                   args_list[2].endswith("}")):
@@ -127,7 +345,6 @@ class HBNBCommand(cmd.Cmd):
                 try:
                     attributes = eval(args_list[2])
                     if isinstance(attributes, dict):
-                        instance = storage.all()[id_object]
                         for key, value in attributes.items():
                             setattr(instance, key, value)
                         instance.save()
@@ -140,7 +357,6 @@ class HBNBCommand(cmd.Cmd):
             elif len(args_list) < 4:
                 print("** value missing **")
             else:
-                instance = storage.all()[id_object]
                 attr_name = args_list[2]
                 attr_value = args_list[3]
                 try:
@@ -163,13 +379,225 @@ class HBNBCommand(cmd.Cmd):
                 setattr(instance, attr_name, attr_value)
                 instance.save()
 
+    def do_lookup(self, arg):
+        """
+            Prints all string representation of the instances of a class
+            whose attribute holds a value (e.g. lookup City state_id <id>)
+        """
+        args_list = shlex.split(arg)
+        if not args_list:
+            print("** class name missing **")
+        elif args_list[0] not in HBNBCommand.list_classes:
+            print("** class doesn't exist **")
+        elif len(args_list) < 2:
+            print("** attribute name missing **")
+        elif len(args_list) < 3:
+            print("** value missing **")
+        else:
+            element_list = []
+            found = storage.lookup(args_list[0], args_list[1], args_list[2])
+            for value in found.values():
+                element_list.append(str(value))
+            print(element_list)
+
+    def do_select(self, arg):
+        """
+            Prints all string representation of the instances of a class
+            that meet all the conditions <attribute><operator><value>,
+            operator being one of < <= == != >= >
+            (e.g. select Place price_by_night>=50 max_guest>=3)
+        """
+        args_list = shlex.split(arg)
+        if not args_list:
+            print("** class name missing **")
+        elif args_list[0] not in HBNBCommand.list_classes:
+            print("** class doesn't exist **")
+        else:
+            conditions = []
+            for condition in args_list[1:]:
+                parsed = query.parse_condition(condition)
+                if parsed is None:
+                    print("** invalid condition {} **".format(condition))
+                    return
+                conditions.append(parsed)
+            element_list = []
+            for value in storage.select(args_list[0], conditions).values():
+                element_list.append(str(value))
+            print(element_list)
+
+    def do_near(self, arg):
+        """
+            Prints all string representation of the places at most
+            <km> away from a point, nearest first
+            (near <latitude> <longitude> <km>)
+        """
+        numbers = HBNBCommand.parse_numbers(arg, 3)
+        if numbers is not None:
+            HBNBCommand.print_places(storage.near(*numbers))
+
+    def do_nearest(self, arg):
+        """
+            Prints all string representation of the <k> places nearest
+            to a point, nearest first (nearest <latitude> <longitude> <k>)
+        """
+        numbers = HBNBCommand.parse_numbers(arg, 3)
+        if numbers is not None:
+            HBNBCommand.print_places(storage.nearest(
+                numbers[0], numbers[1], int(numbers[2])))
+
+    def do_within(self, arg):
+        """
+            Prints all string representation of the places in a box
+            (within <min latitude> <min longitude> <max latitude>
+            <max longitude>)
+        """
+        numbers = HBNBCommand.parse_numbers(arg, 4)
+        if numbers is not None:
+            HBNBCommand.print_places(storage.within(*numbers))
+
+    @staticmethod
+    def parse_numbers(arg, count):
+        """
+            Returns the count numbers of arg, or prints the error and
+            returns None
+        """
+        args_list = shlex.split(arg)
+        if len(args_list) < count:
+            print("** {} numbers expected **".format(count))
+            return None
+        try:
+            return [float(value) for value in args_list[:count]]
+        except ValueError:
+            print("** invalid number **")
+            return None
+
+    @staticmethod
+    def print_places(places):
+        """Prints all string representation of the places found"""
+        print([str(value) for value in places.values()])
+
+    def do_explain(self, arg):
+        """
+            Prints how a query runs: the index or scan chosen, the
+            conditions checked on each object, the order and the limit
+            (e.g. explain Place.where(city_id == "<id>", max_guest > 2))
+        """
+        parsed = HBNBCommand.parse_query(arg)
+        if parsed is not None:
+            for line in parsed.explain(storage):
+                print(line)
+
+    def run_query(self, arg):
+        """
+            Prints the instances found by a query such as
+            Place.where(price_by_night < 100).order_by(-max_guest)
+            .limit(10), or their number when it ends with .count()
+        """
+        parsed = HBNBCommand.parse_query(arg)
+        if parsed is None:
+            return
+        found = parsed.run(storage)
+        if parsed.count:
+            print(found)
+        else:
+            print([str(value) for value in found.values()])
+
+    @staticmethod
+    def parse_query(arg):
+        """
+            Returns the Query of <class>.where(...)..., or prints the
+            error and returns None
+        """
+        args_list = arg.strip().split(".", 1)
+        if not args_list[0]:
+            print("** class name missing **")
+        elif args_list[0] not in HBNBCommand.list_classes:
+            print("** class doesn't exist **")
+        elif len(args_list) < 2:
+            print("** query missing **")
+        else:
+            try:
+                return query.parse(globals()[args_list[0]], args_list[1])
+            except ValueError as error:
+                print("** invalid query: {} **".format(error))
+        return None
+
     def do_count(self, arg):
         """Count the number of instances of a class"""
-        count = 0
-        for key in storage.all().keys():
-            if key.split(".")[0] == arg:
-                count += 1
-        print(count)
+        print(storage.count(arg))
+
+    def run_batch(self, file, checkpoint=0, report=sys.stderr):
+        """
+            Runs the commands of the file object file, one per line
+            (blank lines and # comments are skipped), without prompts.
+            The saves are deferred to the end, or to a checkpoint every
+            <checkpoint> commands. A command in error (an exception or a
+            ** message **) is reported on report with its line number and
+            the batch goes on. The throughput and latency statistics are
+            written to report at the end, with a warning for a begin
+            without commit (committed). Returns the number of commands
+            in error, plus one if the changes could not be saved
+        """
+        latencies = []
+        errors = 0
+        saving = 0.0
+        start = time.perf_counter()
+        storage.begin()
+        try:
+            for number, line in enumerate(file, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                out = StringIO()
+                began = time.perf_counter()
+                try:
+                    with redirect_stdout(out):
+                        stop = self.onecmd(line)
+                except Exception as error:
+                    stop = False
+                    out.write("** {}: {} **\n".format(type(error).__name__,
+                                                      error))
+                latencies.append(time.perf_counter() - began)
+                output = out.getvalue()
+                sys.stdout.write(output)
+                for message in output.splitlines():
+                    if message.startswith("**"):
+                        errors += 1
+                        print("line {}: {}: {}".format(number, line,
+                                                       message), file=report)
+                        break
+                if stop:
+                    break
+                if checkpoint and len(latencies) % checkpoint == 0:
+                    began = time.perf_counter()
+                    storage.commit()
+                    storage.begin()
+                    saving += time.perf_counter() - began
+        finally:
+            began = time.perf_counter()
+            if not self.close_batches(report, own=1):
+                errors += 1
+            saving += time.perf_counter() - began
+        HBNBCommand.print_stats(latencies, errors, saving,
+                                time.perf_counter() - start, report)
+        return errors
+
+    @staticmethod
+    def print_stats(latencies, errors, saving, elapsed, report):
+        """Writes the statistics of a batch to report"""
+        print("batch: {} commands, {} errors, {:.3f}s, {:.0f} commands/s"
+              .format(len(latencies), errors, elapsed,
+                      len(latencies) / elapsed if elapsed else 0),
+              file=report)
+        if latencies:
+            latencies = sorted(latencies)
+            last = len(latencies) - 1
+            print("latency (ms): " + "  ".join(
+                "{} {:.3f}".format(name, 1000 * latencies[
+                    min(last, int(len(latencies) * rank))])
+                for name, rank in (("p50", 0.5), ("p95", 0.95),
+                                   ("p99", 0.99), ("max", 1))), file=report)
+        print("saving: {:.3f}s".format(saving), file=report)
 
     def default(self, arg):
         """
@@ -180,9 +608,27 @@ class HBNBCommand(cmd.Cmd):
         if args_list[0] in HBNBCommand.list_classes:
             method = args_list[1].split("(")[0]
             if method == "all":
-                return self.do_all(args_list[0])
+                params = args_list[1].partition("(")[2].rpartition(")")[0]
+                return self.do_all(" ".join(
+                    [args_list[0]] + [shlex.quote(option.strip())
+                                      for option in params.split(",")
+                                      if option.strip()]))
             elif method == "count":
                 return self.do_count(args_list[0])
+            elif method == "lookup":
+                params = args_list[1].split("(", 1)[1].rsplit(")", 1)[0]
+                args_lookup = "{} {}".format(args_list[0],
+                                             params.replace(",", " "))
+                return self.do_lookup(args_lookup)
+            elif method == "where":
+                return self.run_query(arg)
+            elif method == "select":
+                params = args_list[1].split("(", 1)[1].rsplit(")", 1)[0]
+                args_select = " ".join(
+                    [args_list[0]] + [shlex.quote(condition.strip())
+                                      for condition in params.split(",")
+                                      if condition.strip()])
+                return self.do_select(args_select)
             elif method == "show":
                 id_show = args_list[1].split('"')[1]
                 args_show = "{} {}".format(args_list[0], id_show)
@@ -208,4 +654,29 @@ class HBNBCommand(cmd.Cmd):
 
 
 if __name__ == "__main__":
-    HBNBCommand().cmdloop()
+    parser = argparse.ArgumentParser(description="HBNB command interpreter")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run the commands of FILE ('-' for the "
+                        "standard input) without prompts")
+    parser.add_argument("--checkpoint", metavar="N", type=int, default=0,
+                        help="in batch mode, save every N commands "
+                        "(default: once, at the end)")
+    parser.add_argument("-c", metavar="COMMAND", dest="command",
+                        help="run COMMAND and exit")
+    arguments = parser.parse_args()
+    if arguments.command is not None:
+        console = HBNBCommand()
+        console.onecmd(arguments.command)
+        console.close_batches()
+        sys.exit(console.exit_status)
+    elif arguments.batch is None:
+        console = HBNBCommand()
+        console.cmdloop()
+        sys.exit(console.exit_status)
+    elif arguments.batch == "-":
+        sys.exit(1 if HBNBCommand().run_batch(
+            sys.stdin, arguments.checkpoint) else 0)
+    else:
+        with open(arguments.batch, encoding="utf-8") as commands:
+            sys.exit(1 if HBNBCommand().run_batch(
+                commands, arguments.checkpoint) else 0)
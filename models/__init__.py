@@ -1,8 +1,30 @@
 #!/usr/bin/python3
-""" __init__ magic method for models directory """
+""" __init__ magic method for models directory: models.storage is created
+    and reloaded the first time it is used, so the modules of models can
+    be imported (or run, as the conversion tools of models.engine) without
+    loading the store of the current directory """
 
-from models.engine.file_storage import FileStorage
+import atexit
+import threading
+from os import getenv
 
+_storage_lock = threading.RLock()
 
-storage = FileStorage()
-storage.reload()
+
+def __getattr__(name):
+    """ Creates and reloads models.storage on first use """
+    if name != "storage":
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name))
+    with _storage_lock:
+        if "storage" not in globals():
+            if getenv("HBNB_TYPE_STORAGE") == "db":
+                from models.engine.db_storage import DBStorage
+                storage = DBStorage()
+            else:
+                from models.engine.file_storage import FileStorage
+                storage = FileStorage()
+            storage.reload()
+            atexit.register(storage.flush)
+            globals()["storage"] = storage
+    return globals()["storage"]
@@ -4,37 +4,90 @@
 import uuid
 from datetime import datetime
 import models
+from models import compact
 
 time_form = "%Y-%m-%dT%H:%M:%S.%f"
 
 
+def parse_time(value):
+    """ Returns the datetime of a to_dict() timestamp (isoformat()).
+        fromisoformat is much faster than strptime and also reads the
+        timestamps isoformat() writes without microseconds
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, time_form)
+
+
 class BaseModel:
-    """Define HBnB Base_Model"""
+    """Define HBnB Base_Model
+        _indexed: names of the attributes the storage keeps a secondary
+            index on (see FileStorage.lookup)
+    """
+    _indexed = ()
+
+    def __new__(cls, *args, **kwargs):
+        """ Creates the instance, of the compact subclass of cls
+            when HBNB_COMPACT_MODELS=1 (see models/compact.py)
+        """
+        if compact.enabled:
+            cls = compact.compact_class(cls)
+        return super().__new__(cls)
+
     def __init__(self, *args, **kwargs):
         """ Initialization of the object/instance attributes """
 
         if kwargs:
-            for key, value in kwargs.items():
-                if key == "created_at" or key == "updated_at":
-                    setattr(self, key, datetime.strptime(value, time_form))
-                elif key != "__class__":
-                    setattr(self, key, value)
+            # the instance is not stored yet: no need to go through
+            # __setattr__ for each attribute
+            self._load(kwargs)
+            for key in ("created_at", "updated_at"):
+                if key not in kwargs:
+                    continue
+                value = kwargs[key]
+                if isinstance(value, str):
+                    object.__setattr__(self, key, parse_time(value))
+                elif not isinstance(value, datetime):
+                    raise ValueError("{} is not a timestamp: {!r}".format(
+                        key, value))
+            # nor to touch() it: models.storage may be reloading, and
+            # still being created (see models/__init__.py)
             if "id" not in kwargs:
-                self.id = str(uuid.uuid4())
+                object.__setattr__(self, "id", str(uuid.uuid4()))
             if "created_at" not in kwargs:
-                self.created_at = datetime.now()
+                object.__setattr__(self, "created_at", datetime.now())
             if "updated_at" not in kwargs:
-                self.updated_at = datetime.now()
+                object.__setattr__(self, "updated_at", datetime.now())
         else:
             self.id = str(uuid.uuid4())
             self.created_at = datetime.now()
             self.updated_at = datetime.now()
             models.storage.new(self)
 
+    def __setattr__(self, name, value):
+        """ Sets the attribute and flags the instance as changed
+            in the storage (only once it has an id)
+        """
+        super().__setattr__(name, value)
+        if "id" in self.__dict__:
+            models.storage.touch(self, name)
+
     def __str__(self):
         """ Writing the __str__ method """
         clname = self.__class__.__name__
-        return "[{}] ({}) {}".format(clname, self.id, self.__dict__)
+        return "[{}] ({}) {}".format(clname, self.id, self._attributes())
+
+    def _attributes(self):
+        """ Returns the dictionary of the attributes set on the instance """
+        return self.__dict__
+
+    def _load(self, attributes):
+        """ Sets the attributes of a to_dict() dictionary without
+            flagging the instance as changed
+        """
+        self.__dict__.update(attributes)
+        self.__dict__.pop("__class__", None)
 
     def save(self):
         """ Public instance methods:
@@ -42,15 +95,22 @@ class BaseModel:
             with the current datetime
         """
         self.updated_at = datetime.now()
+        models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self):
+    def to_dict(self, attributes=None):
         """ Public instance methods:
             returns a dictionary containing all keys/values
-            of __dict__.
+            of __dict__ (or of attributes, a copy of _attributes()
+            taken earlier, for the instance as it was then).
         """
-        dic_BaseClass = self.__dict__.copy()
+        if attributes is None:
+            attributes = self._attributes()
+        dic_BaseClass = dict(attributes)
         dic_BaseClass["__class__"] = self.__class__.__name__
-        dic_BaseClass["created_at"] = self.created_at.isoformat()
-        dic_BaseClass["updated_at"] = self.updated_at.isoformat()
+        for key in ("created_at", "updated_at"):
+            value = dic_BaseClass.get(key)
+            if value is None:
+                value = getattr(self, key)
+            dic_BaseClass[key] = value.isoformat()
         return dic_BaseClass
@@ -12,5 +12,7 @@ class City(BaseModel):
             name string - empty string
             state_id - empty string (it will be the State.id)
     """
+    _indexed = ("state_id",)
+
     name = ""
     state_id = ""
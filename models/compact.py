@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Compact representation of the model instances (HBNB_COMPACT_MODELS=1).
+
+compact_class(Place) returns a subclass of Place, also named Place,
+whose schema attributes (id, created_at, updated_at and the public class
+attributes, e.g. Place.city_id) live in __slots__ instead of a
+per-instance dictionary. BaseModel.__new__ creates the instances of
+that subclass, so Place(), Place(**kwargs) and isinstance(obj, Place)
+work as usual. An unset schema attribute reads the class default (like
+Place.name), and an attribute outside the schema (set by the update
+command, for example) goes to the __dict__ of the instance, which is
+only allocated when the first such attribute is set (the _overflow
+slot records that it was).
+"""
+import os
+import models
+
+enabled = os.getenv("HBNB_COMPACT_MODELS") == "1"
+_classes = {}
+
+
+def schema(cls):
+    """returns the names of the schema attributes of cls: id, created_at,
+    updated_at, then the public class attributes that are not methods"""
+    names = ["id", "created_at", "updated_at"]
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if name.startswith("_") or name in names or \
+                    callable(value) or isinstance(value, (staticmethod,
+                                                          classmethod,
+                                                          property)):
+                continue
+            names.append(name)
+    return tuple(names)
+
+
+def compact_class(cls):
+    """returns the compact subclass of the model class cls (cls itself if
+    it is already compact)"""
+    if "_schema" in vars(cls):
+        return cls
+    compact = _classes.get(cls)
+    if compact is None:
+        compact = type(cls.__name__, (cls,), {
+            "__slots__": schema(cls) + ("_overflow",),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__,
+            "_schema": schema(cls),
+            "__getattr__": _default,
+            "__setattr__": _setattr,
+            "_attributes": _attributes,
+            "_load": _load,
+        })
+        _classes[cls] = compact
+    return compact
+
+
+def _default(self, name):
+    """returns the class default of an unset schema attribute"""
+    if name in type(self)._schema:
+        return getattr(type(self).__base__, name)
+    raise AttributeError("{!r} object has no attribute {!r}".format(
+        type(self).__name__, name))
+
+
+def _setattr(self, name, value):
+    """sets the attribute and flags the instance as changed in the
+    storage (only once it has an id)"""
+    object.__setattr__(self, name, value)
+    if name not in self._schema:
+        object.__setattr__(self, "_overflow", True)
+    try:
+        object.__getattribute__(self, "id")
+    except AttributeError:
+        return
+    models.storage.touch(self, name)
+
+
+def _attributes(self):
+    """returns a new dictionary of the attributes set on the instance"""
+    attributes = {}
+    for name in self._schema:
+        try:
+            attributes[name] = object.__getattribute__(self, name)
+        except AttributeError:
+            pass
+    # reading __dict__ would allocate it: only do so once it was used
+    try:
+        object.__getattribute__(self, "_overflow")
+    except AttributeError:
+        return attributes
+    attributes.update(object.__getattribute__(self, "__dict__"))
+    return attributes
+
+
+def _load(self, attributes):
+    """sets the attributes of a to_dict() dictionary without flagging
+    the instance as changed"""
+    schema = self._schema
+    for name, value in attributes.items():
+        if name == "__class__":
+            continue
+        object.__setattr__(self, name, value)
+        if name not in schema:
+            object.__setattr__(self, "_overflow", True)
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Crash-safe writes of the FileStorage snapshot: the new content goes to
+<path>.tmp, is fsynced, and only then renamed over <path>, so the file
+is always either the previous or the new complete snapshot. The
+previous snapshots can be kept as <path>.1 (newest) ... <path>.<n>.
+"""
+from contextlib import contextmanager
+import os
+import shutil
+
+
+def backup_paths(path, backups):
+    """returns the paths of the backups of path, newest first"""
+    return ["{}.{}".format(path, i) for i in range(1, backups + 1)]
+
+
+def fsync_dir(path):
+    """flushes the directory entry changes (renames) of the directory
+    holding path"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def rotate(path, backups):
+    """shifts the backups of path by one and keeps path as <path>.1"""
+    if backups < 1 or not os.path.exists(path):
+        return
+    paths = backup_paths(path, backups)
+    for older, newer in reversed(list(zip(paths, paths[1:]))):
+        if os.path.exists(older):
+            os.replace(older, newer)
+    if os.path.exists(paths[0]):
+        os.remove(paths[0])
+    try:
+        os.link(path, paths[0])
+    except OSError:
+        shutil.copy2(path, paths[0])
+
+
+@contextmanager
+def open_atomic(path, backups=0, binary=False):
+    """opens <path>.tmp for writing (text, or bytes if binary); when the
+    block ends without error the file is fsynced and renamed to path,
+    after the current path was rotated into the backups"""
+    tmp_path = path + ".tmp"
+    if binary:
+        mode, encoding = "wb", None
+    else:
+        mode, encoding = "w", "utf-8"
+    try:
+        with open(tmp_path, mode=mode, encoding=encoding) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    rotate(path, backups)
+    os.replace(tmp_path, path)
+    fsync_dir(path)
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+class AttributeIndex that maps the values of the indexed attributes of
+the models to the keys of the objects holding them.
+
+A model declares the attributes to index in its _indexed class
+attribute, e.g. City._indexed = ("state_id",). A list attribute (like
+Place.amenity_ids) is indexed under each of its elements.
+"""
+
+
+class AttributeIndex:
+    """
+    Summary: secondary indexes of FileStorage:
+        __buckets -> (class name, attribute) -> {value: {key: None}}
+        __values -> key -> {attribute: values indexed for that key}, so
+            an object can be unindexed after its attribute has changed
+    """
+
+    def __init__(self):
+        """creates an empty index"""
+        self.__buckets = {}
+        self.__values = {}
+
+    @staticmethod
+    def values_of(obj, name, cls=None):
+        """returns the hashable values obj holds in its attribute name.
+        obj can also be the dictionary of an instance of cls that is not
+        built yet (lazy reload of FileStorage)"""
+        if isinstance(obj, dict):
+            value = obj.get(name, getattr(cls, name, None))
+        else:
+            value = getattr(obj, name, None)
+        if isinstance(value, (list, tuple, set)):
+            values = value
+        else:
+            values = (value,)
+        return tuple(v for v in values if v.__hash__ is not None)
+
+    def add(self, key, obj, cls=None):
+        """indexes the declared attributes of obj (an instance of cls)
+        under key"""
+        if cls is None:
+            cls = type(obj)
+        self.remove(key)
+        for name in cls._indexed:
+            self.__add(key, self.values_of(obj, name, cls), name)
+
+    def update(self, key, obj, name):
+        """reindexes the attribute name of obj after it was set"""
+        if name not in type(obj)._indexed:
+            return
+        self.__remove(key, name)
+        self.__add(key, self.values_of(obj, name), name)
+
+    def remove(self, key):
+        """unindexes the object stored under key"""
+        for name in list(self.__values.get(key, ())):
+            self.__remove(key, name)
+        self.__values.pop(key, None)
+
+    def lookup(self, class_name, name, value):
+        """returns the keys of the objects of class_name whose
+        attribute name holds value"""
+        buckets = self.__buckets.get((class_name, name), {})
+        try:
+            return list(buckets.get(value, ()))
+        except TypeError:
+            return []
+
+    def count(self, class_name, name, value):
+        """returns the number of objects lookup() would return"""
+        buckets = self.__buckets.get((class_name, name), {})
+        try:
+            return len(buckets.get(value, ()))
+        except TypeError:
+            return 0
+
+    def clear(self):
+        """drops every indexed value"""
+        self.__buckets.clear()
+        self.__values.clear()
+
+    def __add(self, key, values, name):
+        """indexes values as the attribute name of the object under key"""
+        buckets = self.__buckets.setdefault(
+            (key.split(".")[0], name), {})
+        for value in values:
+            buckets.setdefault(value, {})[key] = None
+        self.__values.setdefault(key, {})[name] = values
+
+    def __remove(self, key, name):
+        """unindexes the attribute name of the object stored under key"""
+        values = self.__values.get(key, {}).pop(name, ())
+        buckets = self.__buckets.get((key.split(".")[0], name), {})
+        for value in values:
+            bucket = buckets.get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del buckets[value]
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""
+Binary snapshot format of FileStorage (HBNB_STORAGE_FORMAT=binary),
+written with marshal only:
+    b"HBNB" + version byte
+    the tuple of the class names; a record refers to its class by index
+    one record per object: (class index, id, created_at, updated_at,
+        the other attributes), timestamps in microseconds since
+        1970-01-01 (naive, like the datetimes of the models)
+    None, marking the end of the snapshot
+
+Conversion from and to file.json:
+    python3 -m models.engine.binary_snapshot to-binary file.json file.bin
+    python3 -m models.engine.binary_snapshot to-json file.bin file.json
+"""
+from datetime import datetime, timedelta
+import marshal
+import sys
+
+MAGIC = b"HBNB\x01"
+CLASSES = ("BaseModel", "User", "State", "City", "Amenity", "Place",
+           "Review")
+TAGS = {name: tag for tag, name in enumerate(CLASSES)}
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+binary = True
+
+
+class SnapshotError(ValueError):
+    """raised when a binary snapshot is damaged or truncated"""
+
+
+def to_micros(value):
+    """returns a datetime (or its isoformat()) as microseconds since
+    EPOCH"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - EPOCH) // MICROSECOND
+
+
+def encode(key, value):
+    """returns the record of the object value (a to_dict() dictionary)
+    stored under key"""
+    attrs = dict(value)
+    class_name = attrs.pop("__class__", key.split(".")[0])
+    return marshal.dumps((TAGS.get(class_name, class_name),
+                          attrs.pop("id"),
+                          to_micros(attrs.pop("created_at")),
+                          to_micros(attrs.pop("updated_at")),
+                          attrs))
+
+
+def write_items(file, chunks, positions=None):
+    """writes the header, the records chunks and the end marker to the
+    binary file object file; the (offset, length) of each record is
+    appended to the list positions when one is given"""
+    file.write(MAGIC)
+    marshal.dump(CLASSES, file)
+    offset = file.tell()
+    for chunk in chunks:
+        file.write(chunk)
+        if positions is not None:
+            positions.append((offset, len(chunk)))
+            offset += len(chunk)
+    marshal.dump(None, file)
+
+
+def decode_record(record, classes=CLASSES):
+    """returns the (key, value) pair of a record read from a snapshot
+    whose header holds the class names classes"""
+    tag, id, created, updated, value = record
+    class_name = classes[tag] if isinstance(tag, int) else tag
+    value["id"] = id
+    value["created_at"] = EPOCH + created * MICROSECOND
+    value["updated_at"] = EPOCH + updated * MICROSECOND
+    value["__class__"] = class_name
+    return "{}.{}".format(class_name, id), value
+
+
+def decode(chunk):
+    """returns the (key, value) pair of one record (bytes) written by
+    this version, whose header holds CLASSES"""
+    try:
+        return decode_record(marshal.loads(chunk))
+    except (EOFError, ValueError, TypeError, IndexError) as error:
+        raise SnapshotError("damaged record: {}".format(error))
+
+
+def iter_items(file):
+    """yields the (key, value) pairs of the snapshot in the binary file
+    object file. value is a to_dict() dictionary whose created_at and
+    updated_at are datetimes"""
+    if file.read(len(MAGIC)) != MAGIC:
+        raise SnapshotError("not a binary snapshot")
+    try:
+        classes = marshal.load(file)
+        while True:
+            record = marshal.load(file)
+            if record is None:
+                return
+            yield decode_record(record, classes)
+    except (EOFError, ValueError, TypeError, IndexError) as error:
+        raise SnapshotError("damaged snapshot: {}".format(error))
+
+
+def to_json_value(value):
+    """returns value with its timestamps back in isoformat()"""
+    value = dict(value)
+    for key in ("created_at", "updated_at"):
+        value[key] = value[key].isoformat()
+    return value
+
+
+def convert(source, destination, to_binary):
+    """converts the snapshot source (file.json when to_binary) to
+    destination, one object at a time"""
+    from models.engine import json_stream
+    if to_binary:
+        with open(source, mode="r", encoding="utf-8") as src, \
+                open(destination, mode="wb") as dst:
+            write_items(dst, (encode(key, value) for key, value
+                              in json_stream.iter_items(src)))
+    else:
+        with open(source, mode="rb") as src, \
+                open(destination, mode="w", encoding="utf-8") as dst:
+            json_stream.write_items(dst, (
+                json_stream.encode(key, to_json_value(value))
+                for key, value in iter_items(src)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("to-binary", "to-json"):
+        print("Usage: {} to-binary|to-json <source> <destination>".format(
+            sys.argv[0]), file=sys.stderr)
+        sys.exit(1)
+    convert(sys.argv[2], sys.argv[3], sys.argv[1] == "to-binary")
@@ -0,0 +1,326 @@
+#!/usr/bin/python3
+"""
+class DBStorage that stores the instances in a SQLite database, one
+table per model class. Selected with HBNB_TYPE_STORAGE=db; the database
+file is HBNB_SQLITE_PATH (default: hbnb.db).
+
+The database is the store: only the instances most recently used, at
+most HBNB_SQLITE_CACHE of them (default 10000, 0 for no limit), stay in
+memory, so the memory used does not grow with the data.
+"""
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from models.base_model import BaseModel
+from models.user import User
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.amenity import Amenity
+from models.review import Review
+from models.engine.storage_engine import StorageEngine
+
+classes = {"BaseModel": BaseModel, "User": User, "City": City,
+           "Place": Place, "State": State, "Amenity": Amenity,
+           "Review": Review}
+
+
+class DBStorage(StorageEngine):
+    """
+    Summary: SQLite storage of the instances:
+        table <Class> -> id (primary key), data (the JSON of to_dict())
+            and one indexed column per scalar attribute of _indexed
+            (the foreign keys, e.g. City.state_id)
+        table <Class>_<attribute> -> (id, value) rows of a list attribute
+            of _indexed (e.g. Place_amenity_ids), indexed on value
+        __objects -> LRU cache of the instances, least recently used
+            first: past __capacity instances, the least recently used
+            one is evicted, after its row was written if it changed
+        __instances -> every instance handed out that is still alive
+            (weak references), so an evicted instance still in use is
+            the one get() returns and the changes made to it are kept
+        __dirty -> keys changed since they were last written to the
+            database (the value is None for a destroyed object); they
+            are written before any query, and save() commits them
+        __stats -> hits, misses, evictions and write-backs (evicted
+            instances whose row was written) of the cache, see
+            cache_info()
+        __batch -> depth of the begin() batches open; save() does not
+            commit in a batch, the outermost commit() does
+    """
+
+    def __init__(self):
+        """opens the database"""
+        self.__path = os.getenv("HBNB_SQLITE_PATH", "hbnb.db")
+        self.__connection = None
+        self.__capacity = int(os.getenv("HBNB_SQLITE_CACHE", 10000))
+        self.__objects = OrderedDict()
+        self.__instances = weakref.WeakValueDictionary()
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0,
+                        "writebacks": 0}
+        self.__dirty = {}
+        self.__lock = threading.RLock()
+        self.__batch = 0
+
+    @staticmethod
+    def columns(cls):
+        """returns the scalar and the list indexed attributes of cls"""
+        scalars = []
+        lists = []
+        for name in cls._indexed:
+            if isinstance(getattr(cls, name, None), list):
+                lists.append(name)
+            else:
+                scalars.append(name)
+        return scalars, lists
+
+    def reload(self):
+        """opens the database, creates the missing tables and forgets the
+        instances read so far (except the ones with unsaved changes)"""
+        with self.__lock:
+            if self.__connection is None:
+                self.__connection = sqlite3.connect(
+                    self.__path, check_same_thread=False)
+            for name, cls in classes.items():
+                scalars, lists = self.columns(cls)
+                self.__connection.execute(
+                    'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, '
+                    'data TEXT NOT NULL{})'.format(
+                        name, "".join(", {} TEXT".format(c)
+                                      for c in scalars)))
+                for column in scalars:
+                    self.__connection.execute(
+                        'CREATE INDEX IF NOT EXISTS "{0}_{1}" '
+                        'ON "{0}" ({1})'.format(name, column))
+                for column in lists:
+                    self.__connection.execute(
+                        'CREATE TABLE IF NOT EXISTS "{}_{}" '
+                        '(id TEXT NOT NULL, value TEXT)'.format(name, column))
+                    self.__connection.execute(
+                        'CREATE INDEX IF NOT EXISTS "{0}_{1}_value" '
+                        'ON "{0}_{1}" (value)'.format(name, column))
+                    self.__connection.execute(
+                        'CREATE INDEX IF NOT EXISTS "{0}_{1}_id" '
+                        'ON "{0}_{1}" (id)'.format(name, column))
+            self.__connection.commit()
+            self.__objects = OrderedDict(
+                (key, obj) for key, obj in self.__objects.items()
+                if key in self.__dirty)
+            self.__instances = weakref.WeakValueDictionary(self.__objects)
+
+    def close(self):
+        """closes the database (save() first to keep the changes)"""
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def all(self, cls=None):
+        """returns a dictionary of all the objects, or of the objects of
+        cls only (a class or a class name)"""
+        found = {}
+        for name in self.__class_names(cls):
+            found.update(self.__select(name, ""))
+        return found
+
+    def iterate(self, cls=None):
+        """yields the (key, object) pairs of all the objects, or of the
+        objects of cls only, reading the rows batch_size at a time"""
+        batch_size = 500
+        for name in self.__class_names(cls):
+            last = ""
+            while True:
+                batch = self.__select(
+                    name, "WHERE id > ? ORDER BY id LIMIT {}".format(
+                        batch_size), (last,))
+                yield from batch.items()
+                if len(batch) < batch_size:
+                    break
+                last = next(reversed(batch)).split(".", 1)[1]
+
+    def new(self, obj):
+        """adds obj to the storage, written on the next save()"""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            self.__dirty[key] = obj
+            self.__admit(key, obj)
+
+    def touch(self, obj, name=None):
+        """flags obj as changed if it is the stored instance of its key
+        (an evicted one goes back to the cache)"""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if self.__instances.get(key) is obj:
+            with self.__lock:
+                self.__dirty[key] = obj
+                if key not in self.__objects:
+                    self.__admit(key, obj)
+
+    def delete(self, obj=None):
+        """deletes obj from the storage, on the next save()"""
+        if obj is None:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            self.__objects.pop(key, None)
+            self.__instances.pop(key, None)
+            self.__dirty[key] = None
+
+    def save(self):
+        """writes the rows of the changed objects and commits (at the end
+        of the batch, in a batch)"""
+        with self.__lock:
+            self.__sync()
+            if not self.__batch:
+                self.__connection.commit()
+
+    def begin(self):
+        """starts a batch: save() only commits at the matching commit()"""
+        with self.__lock:
+            self.__batch += 1
+
+    def commit(self):
+        """ends a batch; the outermost commit() commits the changes.
+        Returns False when no batch was open"""
+        with self.__lock:
+            if self.__batch == 0:
+                return False
+            self.__batch -= 1
+            self.save()
+        return True
+
+    def get(self, cls, id):
+        """returns the object of cls with this id, or None"""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        with self.__lock:
+            obj = self.__objects.get(key)
+            if obj is not None:
+                self.__objects.move_to_end(key)
+                self.__stats["hits"] += 1
+                return obj
+            if key in self.__dirty or cls not in classes:
+                return None
+            # the changed objects are all in the cache: no need to write
+            # them before reading this row
+            return self.__select(cls, "WHERE id = ?", (id,),
+                                 sync=False).get(key)
+
+    def cache_info(self):
+        """returns the hits, misses, evictions and write-backs of the
+        cache of instances, with its size and capacity"""
+        with self.__lock:
+            info = dict(self.__stats)
+            info["size"] = len(self.__objects)
+            info["capacity"] = self.__capacity
+        return info
+
+    def count(self, cls=None):
+        """returns the number of objects, or of objects of cls only"""
+        total = 0
+        with self.__lock:
+            self.__sync()
+            for name in self.__class_names(cls):
+                total += self.__connection.execute(
+                    'SELECT COUNT(*) FROM "{}"'.format(name)).fetchone()[0]
+        return total
+
+    def lookup(self, cls, name, value):
+        """returns a dictionary of the objects of cls whose attribute name
+        holds value, through the index of its column when it has one"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        scalars, lists = self.columns(cls)
+        if name in scalars:
+            return self.__select(cls.__name__, "WHERE {} = ?".format(name),
+                                 (value,))
+        if name in lists:
+            return self.__select(
+                cls.__name__, 'WHERE id IN (SELECT id FROM "{}_{}" '
+                'WHERE value = ?)'.format(cls.__name__, name), (value,))
+        return super().lookup(cls, name, value)
+
+    def __class_names(self, cls):
+        """returns the names of the tables to read for cls"""
+        if cls is None:
+            return list(classes)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return [cls] if cls in classes else []
+
+    def __select(self, class_name, where, params=(), sync=True):
+        """returns {key: obj} of the rows of class_name matching where,
+        reusing the instances still in memory. The changed objects are
+        written first, unless sync is False"""
+        found = {}
+        with self.__lock:
+            if sync:
+                self.__sync()
+            # read all the rows first: an eviction may write to the table
+            rows = self.__connection.execute(
+                'SELECT id, data FROM "{}" {}'.format(class_name, where),
+                params).fetchall()
+            for id, data in rows:
+                key = "{}.{}".format(class_name, id)
+                obj = self.__objects.get(key)
+                if obj is not None:
+                    self.__stats["hits"] += 1
+                else:
+                    self.__stats["misses"] += 1
+                    obj = self.__instances.get(key)
+                    if obj is None:
+                        obj = classes[class_name](**json.loads(data))
+                self.__admit(key, obj)
+                found[key] = obj
+        return found
+
+    def __admit(self, key, obj):
+        """makes obj the most recently used instance of the cache, and
+        evicts the least recently used ones past the capacity; the row
+        of an evicted instance that changed is written first"""
+        self.__objects[key] = obj
+        self.__objects.move_to_end(key)
+        self.__instances[key] = obj
+        while self.__capacity and len(self.__objects) > self.__capacity:
+            old_key, old = self.__objects.popitem(last=False)
+            self.__stats["evictions"] += 1
+            if old_key in self.__dirty:
+                self.__write(old_key, self.__dirty.pop(old_key))
+                self.__stats["writebacks"] += 1
+
+    def __sync(self):
+        """writes the changed objects to the database, uncommitted"""
+        for key, obj in self.__dirty.items():
+            self.__write(key, obj)
+        self.__dirty.clear()
+
+    def __write(self, key, obj):
+        """writes the row of obj stored under key (deletes it if obj is
+        None), uncommitted"""
+        class_name, id = key.split(".", 1)
+        scalars, lists = self.columns(classes[class_name])
+        self.__connection.execute(
+            'DELETE FROM "{}" WHERE id = ?'.format(class_name), (id,))
+        for column in lists:
+            self.__connection.execute(
+                'DELETE FROM "{}_{}" WHERE id = ?'.format(
+                    class_name, column), (id,))
+        if obj is None:
+            return
+        values = [getattr(obj, column, None) for column in scalars]
+        self.__connection.execute(
+            'INSERT INTO "{}" (id, data{}) VALUES (?, ?{})'.format(
+                class_name, "".join(", " + c for c in scalars),
+                ", ?" * len(scalars)),
+            [id, json.dumps(obj.to_dict())] + [
+                v if isinstance(v, (str, int, float)) else None
+                for v in values])
+        for column in lists:
+            items = getattr(obj, column, None) or ()
+            self.__connection.executemany(
+                'INSERT INTO "{}_{}" (id, value) VALUES (?, ?)'.format(
+                    class_name, column),
+                [(id, v) for v in items if isinstance(v, str)])
@@ -3,7 +3,11 @@
 class FileStorage that serializes instances to a JSON file and deserializes
 JSON file to instances
 """
+from contextlib import contextmanager
 import json
+import sys
+import threading
+import time
 from models.base_model import BaseModel
 from models.user import User
 from models.city import City
@@ -11,43 +15,983 @@ from models.place import Place
 from models.state import State
 from models.amenity import Amenity
 from models.review import Review
+from models.engine import atomic
+from models.engine import journal
+from models.engine import binary_snapshot
+from models.engine import json_stream
+from models.engine import parallel_reload
+from models.engine import shards
+from models.engine import snapshot_index
+from models.engine.attribute_index import AttributeIndex
+from models.engine.geo_index import GeoIndex
+from models.engine.lazy_objects import LazyObjects
+from models.engine import place_columns
+from models.engine.place_columns import PlaceColumns
+from models.engine.storage_engine import StorageEngine
 import os
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
-class FileStorage:
+class FileStorage(StorageEngine):
     """
     Summary: Definning the class to store the data and make it persistant:
         __file_path -> Private class attribute
         __objects -> Private class attribute
+        __lazy -> when True (HBNB_STORAGE_LAZY=1), reload() keeps the
+            dictionaries read from the file and __objects (a LazyObjects)
+            only builds an instance when it is first accessed
+        __format -> "json" (file.json), or "binary" (HBNB_STORAGE_FORMAT):
+            the snapshot is then the marshal format of binary_snapshot,
+            in <__file_path without .json>.bin
+        __shards -> None (one snapshot), "class" or a number of buckets
+            (HBNB_STORAGE_SHARDS): the snapshot is split into one file
+            per class or per bucket of keys (see shards), and a save
+            only rewrites the shards holding a dirty key
+        __shard_keys -> per-bucket index: shard name -> {key: None},
+            when the shards are buckets (per class, __classes is used)
+        __mapped -> when True (HBNB_STORAGE_MMAP=1), every snapshot is
+            written with an offset index (snapshot_index), and reload()
+            only maps the snapshot and its index: get() then reads the
+            one object it is asked for (__index: shard name -> the
+            SnapshotIndex of each shard still mapped, None once
+            everything is loaded), and everything else loads the rest
+            first (with shards per class, only the shard of its class)
+        __workers -> when > 1 (HBNB_STORAGE_WORKERS), reload() parses
+            the snapshot in that many processes (see parallel_reload),
+            and every snapshot is written with an offset index so a
+            single file can be cut into parts too
+        __backups -> number of previous snapshots kept as <__file_path>.1
+            (newest) ... <__file_path>.<n> (HBNB_STORAGE_BACKUPS). Saves
+            are always written to a temporary file, fsynced and renamed
+        __journal -> when True (HBNB_STORAGE_JOURNAL=1), save() appends
+            the changed objects to <__file_path>.log instead of rewriting
+            the whole file, and the log is folded back into the snapshot
+            in the background once it grows past __journal_max_bytes
+        __write_behind -> when > 0 (HBNB_STORAGE_WRITE_BEHIND, seconds),
+            save() returns at once and a background thread writes all
+            the saves of the next __write_behind seconds (or the next
+            __write_behind_ops saves, HBNB_STORAGE_WRITE_BEHIND_OPS) in
+            one go. flush() writes them right away. A background write
+            that fails keeps the saves pending, to be written again, and
+            its error (__flush_error) is raised by the next save()
+        __batch -> depth of the begin() batches open: save() only records
+            that a save was asked (__batch_saved) and the outermost
+            commit() saves once
+        __dirty -> keys created, updated or destroyed since the last save
+            (the value is None for a destroyed object). Objects are
+            flagged by new(), delete() and BaseModel.__setattr__
+        __classes -> per-class index: class name -> {key: None}, so the
+            objects of one class are found without a scan of __objects
+        __attributes -> secondary indexes over the attributes the models
+            declare in _indexed (foreign keys such as City.state_id).
+            None until the first lookup builds them (__attribute_index),
+            so a reload does not pay for an index nothing queries
+        __columns -> NumPy columns of the numeric attributes of the
+            places (PlaceColumns), for the vectorized filters of select().
+            None until the first such filter (__place_columns)
+        __geo -> grid index of the coordinates of the places (GeoIndex),
+            for near(), nearest() and within(). None until the first of
+            them (__geo_index)
+        __serialized -> cache of the '"<key>": {...}' JSON text of clean
+            objects, so save() only re-serializes the dirty ones. It is
+            a second copy of the store, only kept with
+            HBNB_STORAGE_CACHE=1, when save time matters more than memory
+        __lock -> held by the writers (new, touch, delete, reload and
+            the start of a save, see __snapshot), and by the queries of
+            the indexes, which may build them. The other readers take no
+            lock: iterate() and all(cls) go through a copy of the keys
+            (list() of a dictionary is atomic in CPython), so they
+            neither wait for each other nor see a dictionary change size
+            under them
+        __versions -> __file_path -> version of the files (see __version)
+            when this process last read or wrote them. Writes hold the
+            advisory lock <__file_path>.lock, and a save first merges
+            what other processes wrote since (see __merge) instead of
+            overwriting it
     """
     __file_path = "file.json"
     __objects = {}
+    __lazy = os.getenv("HBNB_STORAGE_LAZY") == "1"
+    __format = os.getenv("HBNB_STORAGE_FORMAT", "json")
+    __formats = {"json": json_stream, "binary": binary_snapshot}
+    __backups = int(os.getenv("HBNB_STORAGE_BACKUPS", 0))
+    __shards = shards.parse(os.getenv("HBNB_STORAGE_SHARDS"))
+    __shard_keys = {} if isinstance(__shards, int) else None
+    __mapped = os.getenv("HBNB_STORAGE_MMAP") == "1"
+    __workers = int(os.getenv("HBNB_STORAGE_WORKERS", 1))
+    __index = None
+    __write_behind = float(os.getenv("HBNB_STORAGE_WRITE_BEHIND", 0))
+    __write_behind_ops = int(os.getenv("HBNB_STORAGE_WRITE_BEHIND_OPS",
+                                       1000))
+    __pending = 0
+    __batch = 0
+    __batch_saved = False
+    __pending_cond = threading.Condition()
+    __flusher = None
+    __flush_lock = threading.Lock()
+    __flush_error = None
+    __journal = os.getenv("HBNB_STORAGE_JOURNAL") == "1"
+    __journal_max_bytes = int(os.getenv("HBNB_JOURNAL_MAX_BYTES",
+                                        1024 * 1024))
+    __dirty = {}
+    __classes = {}
+    __attributes = None
+    __columns = None
+    __geo = None
+    __serialized = {}
+    __cache = os.getenv("HBNB_STORAGE_CACHE") == "1"
+    __lock = threading.RLock()
+    __compactor = None
+    __versions = {}
 
-    def all(self):
-        """returns the dictionary __objects"""
-        return FileStorage.__objects
+    def all(self, cls=None):
+        """returns the dictionary __objects, or a dictionary of the
+        objects of cls only (a class or a class name). __objects is the
+        live dictionary: a thread going through all the objects while
+        others write uses iterate()"""
+        if cls is None:
+            self.__load_all()
+            return FileStorage.__objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__load_all(cls)
+        return self.__pick(list(FileStorage.__classes.get(cls, ())))
+
+    def iterate(self, cls=None):
+        """yields the (key, object) pairs of all the objects, or of the
+        objects of cls only, without building a dictionary of them (and,
+        in lazy mode, building each instance only when it is reached).
+        The keys are those stored when the iteration starts"""
+        objects = FileStorage.__objects
+        if cls is None:
+            self.__load_all()
+            keys = list(objects)
+        else:
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            self.__load_all(cls)
+            keys = list(FileStorage.__classes.get(cls, ()))
+        for key in keys:
+            obj = objects.get(key)
+            if obj is not None:
+                yield key, obj
+
+    def get(self, cls, id):
+        """returns the object of cls (a class or a class name) with this
+        id, or None"""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        obj = FileStorage.__objects.get(key)
+        if obj is None and FileStorage.__index is not None:
+            obj = self.__read(key)
+        return obj
+
+    async def aget(self, cls, id):
+        """get() for an event loop: a dictionary lookup, unless the
+        object is still to be read from the mapped snapshot, which is
+        then done in a worker thread"""
+        if FileStorage.__index is None:
+            return self.get(cls, id)
+        return await super().aget(cls, id)
+
+    def count(self, cls=None):
+        """returns the number of objects, or of objects of cls only"""
+        if cls is None:
+            self.__load_all()
+            return len(FileStorage.__objects)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__load_all(cls)
+        return len(FileStorage.__classes.get(cls, {}))
+
+    def lookup(self, cls, name, value):
+        """returns a dictionary of the objects of cls (a class or a class
+        name) whose attribute name holds value (or contains it, for a
+        list attribute). Indexed attributes are a hash lookup, the others
+        a scan of the objects of cls"""
+        if isinstance(cls, str):
+            cls = globals()[cls]
+        self.__load_all(cls.__name__)
+        if name in cls._indexed:
+            with FileStorage.__lock:
+                keys = self.__attribute_index().lookup(cls.__name__, name,
+                                                       value)
+            return self.__pick(keys)
+        found = {}
+        for key, obj in self.all(cls).items():
+            if value in AttributeIndex.values_of(obj, name):
+                found[key] = obj
+        return found
+
+    def plan(self, cls, conditions):
+        """returns how select() finds the objects of cls (a class or a
+        class name) meeting the conditions: (description, fetch, rest),
+        see StorageEngine.plan. The candidates come from, in order of
+        preference: the attribute index of the == condition on an
+        indexed attribute with the fewest objects, the NumPy columns
+        for the numeric conditions on places, a scan of the class"""
+        if isinstance(cls, str):
+            cls = globals()[cls]
+        name = cls.__name__
+        self.__load_all(name)
+        best = None
+        for condition in conditions:
+            attr, op, value = condition
+            if op == "==" and attr in cls._indexed:
+                with FileStorage.__lock:
+                    size = self.__attribute_index().count(name, attr, value)
+                if best is None or size < best[0]:
+                    best = size, condition
+        if best is not None:
+            size, (attr, op, value) = best
+            return ("index lookup {}.{} == {!r} ({} objects)".format(
+                        name, attr, value, size),
+                    lambda: self.lookup(cls, attr, value),
+                    [other for other in conditions if other is not best[1]])
+        numeric = []
+        if name == "Place" and place_columns.numpy is not None:
+            numeric = [condition for condition in conditions
+                       if condition[0] in place_columns.FIELDS and
+                       place_columns.is_number(condition[2])]
+        if numeric:
+            # a column holding a bool or an inexact int (NaN in the
+            # column) would not compare like the objects: scan instead
+            with FileStorage.__lock:
+                columns = self.__place_columns()
+                rows = len(columns)
+                numeric = [condition for condition in numeric
+                           if columns.exact(condition[0])]
+        if numeric:
+            return ("NumPy columns {} ({} rows): {}".format(
+                        name, rows, " and ".join(
+                            "{} {} {!r}".format(*condition)
+                            for condition in numeric)),
+                    lambda: self.__pick(self.__select_columns(numeric)),
+                    [other for other in conditions if other not in numeric])
+        return ("scan {} ({} objects)".format(name, self.count(name)),
+                lambda: self.all(cls), list(conditions))
+
+    def __select_columns(self, conditions):
+        """returns the keys of the places meeting the numeric conditions"""
+        with FileStorage.__lock:
+            return self.__place_columns().select(conditions)
+
+    def near(self, lat, lon, km):
+        """returns a dictionary of the places at most km away from the
+        point (latitude, longitude in degrees), nearest first, through
+        the grid index"""
+        self.__load_all("Place")
+        with FileStorage.__lock:
+            found = self.__geo_index().near(lat, lon, km)
+        return self.__pick(key for distance, key in found)
+
+    def nearest(self, lat, lon, k):
+        """returns a dictionary of the k places nearest to the point,
+        nearest first, through the grid index"""
+        self.__load_all("Place")
+        with FileStorage.__lock:
+            found = self.__geo_index().nearest(lat, lon, k)
+        return self.__pick(key for distance, key in found)
+
+    def within(self, min_lat, min_lon, max_lat, max_lon):
+        """returns a dictionary of the places in the box (min_lon >
+        max_lon for a box crossing the antimeridian), through the grid
+        index"""
+        self.__load_all("Place")
+        with FileStorage.__lock:
+            keys = self.__geo_index().within(min_lat, min_lon, max_lat,
+                                             max_lon)
+        return self.__pick(keys)
+
+    def __attribute_index(self):
+        """returns __attributes, indexing the stored objects the first
+        time. The caller holds __lock"""
+        if FileStorage.__attributes is None:
+            index = AttributeIndex()
+            for key, obj in list(dict.items(FileStorage.__objects)):
+                cls = globals()[key.split(".")[0]]
+                if cls._indexed:
+                    index.add(key, obj, cls)
+            FileStorage.__attributes = index
+        return FileStorage.__attributes
+
+    def __place_columns(self):
+        """returns __columns, mirroring the stored places the first
+        time. The caller holds __lock"""
+        if FileStorage.__columns is None:
+            columns = PlaceColumns()
+            objects = FileStorage.__objects
+            for key in list(FileStorage.__classes.get("Place", ())):
+                obj = dict.get(objects, key)
+                if obj is not None:
+                    columns.add(key, obj)
+            FileStorage.__columns = columns
+        return FileStorage.__columns
+
+    def __geo_index(self):
+        """returns __geo, indexing the stored places the first time.
+        The caller holds __lock"""
+        if FileStorage.__geo is None:
+            geo = GeoIndex()
+            objects = FileStorage.__objects
+            for key in list(FileStorage.__classes.get("Place", ())):
+                obj = dict.get(objects, key)
+                if obj is not None:
+                    geo.add(key, obj)
+            FileStorage.__geo = geo
+        return FileStorage.__geo
+
+    def __pick(self, keys):
+        """returns {key: object} for the keys still in __objects"""
+        objects = FileStorage.__objects
+        found = {}
+        for key in keys:
+            obj = objects.get(key)
+            if obj is not None:
+                found[key] = obj
+        return found
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         key = "{}.{}".format(obj.__class__.__name__, obj.id)
-        FileStorage.__objects[key] = obj
+        with FileStorage.__lock:
+            self.__register(key, obj)
+            FileStorage.__dirty[key] = obj
+            FileStorage.__serialized.pop(key, None)
+
+    def touch(self, obj, name=None):
+        """flags obj as changed if it is the stored instance of its key,
+        and reindexes its attribute name"""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if dict.get(FileStorage.__objects, key) is obj:
+            with FileStorage.__lock:
+                FileStorage.__dirty[key] = obj
+                FileStorage.__serialized.pop(key, None)
+                if name is not None:
+                    if FileStorage.__attributes is not None:
+                        FileStorage.__attributes.update(key, obj, name)
+                    if FileStorage.__columns is not None:
+                        FileStorage.__columns.update(key, obj, name)
+                    if FileStorage.__geo is not None and \
+                            key.startswith("Place."):
+                        FileStorage.__geo.update(key, obj, name)
+
+    def delete(self, obj=None):
+        """deletes obj from __objects if it's inside"""
+        if obj is None:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if FileStorage.__index is not None:
+            self.get(obj.__class__.__name__, obj.id)
+        with FileStorage.__lock:
+            if key in FileStorage.__objects:
+                self.__unregister(key)
+                FileStorage.__dirty[key] = None
+                FileStorage.__serialized.pop(key, None)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_dict = {}
-        for key, value in FileStorage.__objects.items():
-            json_dict[key] = value.to_dict()
-        with open(FileStorage.__file_path, mode="w", encoding="utf-8") as file:
-            json.dump(json_dict, file)
+        """serializes __objects to the JSON file (path: __file_path), or
+        only the objects changed since the last save to the journal.
+        In write-behind mode the write is left to the flush thread, in a
+        batch to the commit() ending it"""
+        with FileStorage.__lock:
+            if FileStorage.__batch:
+                FileStorage.__batch_saved = True
+                return
+        if FileStorage.__write_behind > 0:
+            self.__schedule_flush()
+            with FileStorage.__pending_cond:
+                error = FileStorage.__flush_error
+                FileStorage.__flush_error = None
+            if error is not None:
+                raise error
+            return
+        self.__persist()
+
+    def begin(self):
+        """starts a batch: save() is deferred to the matching commit()"""
+        with FileStorage.__lock:
+            FileStorage.__batch += 1
+
+    def commit(self):
+        """ends a batch; the outermost commit() saves once if a save was
+        asked in the batch. Returns False when no batch was open"""
+        with FileStorage.__lock:
+            if FileStorage.__batch == 0:
+                return False
+            FileStorage.__batch -= 1
+            if FileStorage.__batch or not FileStorage.__batch_saved:
+                return True
+            FileStorage.__batch_saved = False
+        self.save()
+        return True
+
+    def flush(self):
+        """writes the saves still pending in write-behind mode; they stay
+        pending if the write fails"""
+        with FileStorage.__flush_lock:
+            with FileStorage.__pending_cond:
+                pending = FileStorage.__pending
+                if pending == 0:
+                    return
+                FileStorage.__pending = 0
+                # the flush thread waits for new saves again
+                FileStorage.__pending_cond.notify()
+            try:
+                self.__persist()
+            except BaseException:
+                with FileStorage.__pending_cond:
+                    FileStorage.__pending += pending
+                raise
+            with FileStorage.__pending_cond:
+                FileStorage.__flush_error = None
+
+    def __persist(self):
+        """writes the changes to the journal, or the whole snapshot"""
+        if FileStorage.__journal:
+            self.__append_journal()
+            return
+        with self.__locked(True) as lock:
+            with FileStorage.__lock:
+                self.__merge(lock)
+                dirty_shards = self.__dirty_shards()
+                self.__unmap(dirty_shards)
+                dirty = dict(FileStorage.__dirty)
+                self.__clear_dirty()
+                snapshot = self.__snapshot(dirty_shards, dirty)
+            try:
+                self.__write_snapshot(snapshot)
+            except BaseException:
+                self.__restore_dirty(dirty)
+                raise
+            # the snapshot now holds everything an older journal recorded
+            for path in self.__journal_paths():
+                if os.path.exists(path):
+                    os.remove(path)
+            self.__written(lock)
 
     def reload(self):
         """deserializes the JSON file to __objects (only if the JSON file
         (__file_path) exists; otherwise, do nothing. If the file doesn’t
-        exist, no exception should be raised)"""
-        if os.path.exists(self.__file_path):
-            with open(FileStorage.__file_path, mode="r",
-                      encoding="utf-8") as file:
-                json_dict = json.load(file)
-            for key, value in json_dict.items():
-                class_name = key.split(".")
-                FileStorage.__objects[key] = globals()[class_name[0]](**value)
+        exist, no exception should be raised). Journal records left by
+        journaled saves are replayed on top of the snapshot. In lazy mode
+        the instances are only built when they are first accessed.
+        If the JSON file is damaged, the newest readable backup is used.
+        With HBNB_STORAGE_MMAP=1 and no journal, the snapshots with an
+        up-to-date index are not read yet: see __mapped. With
+        HBNB_STORAGE_WORKERS > 1 the others are parsed by several
+        processes: see __workers. The saves still pending in
+        write-behind mode are written first"""
+        self.flush()
+        with self.__locked(False) as lock, FileStorage.__lock:
+            if FileStorage.__lazy and \
+                    not isinstance(FileStorage.__objects, LazyObjects):
+                FileStorage.__objects = LazyObjects(globals(),
+                                                    FileStorage.__lock,
+                                                    FileStorage.__objects)
+            mapped = FileStorage.__mapped and not any(
+                os.path.exists(path) for path in self.__journal_paths())
+            snapshot_format = FileStorage.__formats[FileStorage.__format]
+            self.__load_all()
+            indexes = {}
+            paths = []
+            for shard, path in self.__snapshot_paths():
+                index = None
+                if mapped:
+                    index = snapshot_index.open_index(path, snapshot_format)
+                if index is not None:
+                    indexes[shard] = index
+                elif os.path.exists(path):
+                    paths.append(path)
+            FileStorage.__index = indexes or None
+            if not FileStorage.__lazy and \
+                    parallel_reload.enabled(paths, FileStorage.__workers):
+                self.__load_parallel(paths)
+            else:
+                for path in paths:
+                    self.__load_snapshot(path)
+            for path in self.__journal_paths():
+                for op, key, value in journal.records(path):
+                    if op == "set":
+                        self.__load(key, value)
+                    elif key in FileStorage.__objects:
+                        self.__unregister(key)
+            FileStorage.__versions[FileStorage.__file_path] = \
+                self.__version(lock)
+
+    def refresh(self):
+        """loads what other processes saved since this one last read or
+        wrote the files; the objects changed here and not saved yet keep
+        their local state. Returns True if anything was read"""
+        with self.__locked(False) as lock, FileStorage.__lock:
+            return self.__merge(lock)
+
+    def __read(self, key):
+        """returns the object stored under key, read from the mapped
+        snapshot if it is not loaded yet"""
+        with FileStorage.__lock:
+            indexes = FileStorage.__index
+            if key in FileStorage.__objects or indexes is None or \
+                    key in FileStorage.__dirty:
+                return FileStorage.__objects.get(key)
+            index = indexes.get(shards.shard_of(key, FileStorage.__shards))
+            value = None if index is None else index.get(key)
+            if value is None:
+                return None
+            self.__load(key, value)
+            return FileStorage.__objects.get(key)
+
+    def __load_all(self, cls=None):
+        """loads the objects of the mapped snapshots get() did not read:
+        all of them, or, with shards per class, only the shard of the
+        class named cls"""
+        if FileStorage.__index is None:
+            return
+        if cls is not None and FileStorage.__shards == "class":
+            self.__unmap([cls])
+        else:
+            self.__unmap(None)
+
+    def __unmap(self, names):
+        """loads the objects of the mapped shards named in names (all of
+        them for None) get() did not read, and unmaps them"""
+        with FileStorage.__lock:
+            indexes = FileStorage.__index
+            if indexes is None:
+                return
+            objects = FileStorage.__objects
+            dirty = FileStorage.__dirty
+            for shard in list(indexes) if names is None else names:
+                index = indexes.pop(shard, None)
+                if index is None:
+                    continue
+                for key, value in index.items():
+                    if key not in objects and key not in dirty:
+                        self.__load(key, value)
+                index.close()
+            if not indexes:
+                FileStorage.__index = None
+
+    @contextmanager
+    def __locked(self, exclusive):
+        """holds the advisory lock of the files, <__file_path>.lock,
+        exclusive to write or shared to read, and yields the lock file
+        (it holds the number of writes so far). Yields None where fcntl
+        is missing: nothing is locked then. A shared lock opens the lock
+        file read-only, and locks nothing when the file is missing and
+        cannot be created (a read-only directory: no process writes the
+        files there either)"""
+        if fcntl is None:
+            yield None
+            return
+        path = FileStorage.__file_path + ".lock"
+        try:
+            lock = open(path, mode="a+" if exclusive else "r",
+                        encoding="utf-8")
+        except FileNotFoundError:
+            if exclusive:
+                raise
+            try:
+                lock = open(path, mode="a+", encoding="utf-8")
+            except OSError:
+                yield None
+                return
+        with lock:
+            fcntl.flock(lock.fileno(),
+                        fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield lock
+
+    def __version(self, lock):
+        """returns what changes whenever a process writes the files: the
+        write counter of the lock file, then the (inode, size, mtime) of
+        the snapshot shards and of the journals, None for a missing one"""
+        version = [None]
+        if lock is not None:
+            lock.seek(0)
+            version[0] = lock.read()
+        paths = [path for shard, path in self.__snapshot_paths()]
+        for path in paths + self.__journal_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                version.append(None)
+            else:
+                version.append((stat.st_ino, stat.st_size,
+                                stat.st_mtime_ns))
+        return tuple(version)
+
+    def __written(self, lock):
+        """counts a write in the lock file and records the new version of
+        the files as seen"""
+        if lock is not None:
+            lock.seek(0)
+            count = int(lock.read() or 0) + 1
+            lock.seek(0)
+            lock.truncate()
+            lock.write(str(count))
+            lock.flush()
+        FileStorage.__versions[FileStorage.__file_path] = \
+            self.__version(lock)
+
+    def __merge(self, lock):
+        """reloads the files if another process wrote them since this one
+        last read or wrote them: every object not in __dirty takes the
+        state on disk, or is dropped if it is no longer there; the dirty
+        ones keep their local state, saved next. An object that did not
+        change on disk keeps its instance. Without journals, only the
+        shards that changed are read. Returns True if the files were
+        read"""
+        version = self.__version(lock)
+        seen = FileStorage.__versions.get(FileStorage.__file_path)
+        if version == seen:
+            return False
+        FileStorage.__versions[FileStorage.__file_path] = version
+        if all(part is None for part in version[1:]):
+            return False
+        self.__load_all()
+        paths = self.__snapshot_paths()
+        count = len(paths) + 1
+        if seen is None or len(seen) != len(version) or \
+                any(version[count:]) or any(seen[count:]):
+            changed = paths
+        else:
+            changed = [part for part, old, new in
+                       zip(paths, seen[1:], version[1:]) if old != new]
+        dirty = FileStorage.__dirty
+        on_disk = set()
+        snapshot_format = FileStorage.__formats[FileStorage.__format]
+        for shard, path in changed:
+            for key, value in shards.read(path, snapshot_format):
+                on_disk.add(key)
+                if key not in dirty:
+                    self.__reload_one(key, value)
+        for path in self.__journal_paths():
+            for op, key, value in journal.records(path):
+                if op == "set":
+                    on_disk.add(key)
+                    if key not in dirty:
+                        self.__reload_one(key, value)
+                else:
+                    on_disk.discard(key)
+        read = {shard for shard, path in changed}
+        sharding = FileStorage.__shards
+        objects = FileStorage.__objects
+        for key in [key for key in dict.keys(objects)
+                    if key not in on_disk and key not in dirty and
+                    shards.shard_of(key, sharding) in read]:
+            self.__unregister(key)
+        return True
+
+    def __reload_one(self, key, value):
+        """stores the object read as value under key, unless the stored
+        instance already holds the same attributes"""
+        current = dict.get(FileStorage.__objects, key)
+        if FileStorage.__lazy and (current is None or
+                                   isinstance(current, dict)):
+            obj = value
+        else:
+            obj = globals()[key.split(".")[0]](**value)
+            if current is not None and obj.to_dict() == current.to_dict():
+                return
+        self.__register(key, obj)
+        FileStorage.__serialized.pop(key, None)
+
+    def __schedule_flush(self):
+        """counts one pending save and wakes up the flush thread"""
+        with FileStorage.__pending_cond:
+            FileStorage.__pending += 1
+            if FileStorage.__flusher is None or \
+                    not FileStorage.__flusher.is_alive():
+                FileStorage.__flusher = threading.Thread(
+                    target=self.__flush_loop, name="hbnb-flusher",
+                    daemon=True)
+                FileStorage.__flusher.start()
+            FileStorage.__pending_cond.notify()
+
+    def __flush_loop(self):
+        """flushes __write_behind seconds after the first pending save,
+        or as soon as __write_behind_ops saves are pending. After a
+        failed write, the saves are written again __write_behind seconds
+        later"""
+        cond = FileStorage.__pending_cond
+        while True:
+            with cond:
+                while FileStorage.__pending == 0:
+                    cond.wait()
+                deadline = time.monotonic() + FileStorage.__write_behind
+                while 0 < FileStorage.__pending < \
+                        FileStorage.__write_behind_ops:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    cond.wait(remaining)
+            try:
+                self.flush()
+            except Exception as error:
+                with cond:
+                    FileStorage.__flush_error = error
+                time.sleep(FileStorage.__write_behind)
+
+    def __snapshot_path(self):
+        """returns the path of the snapshot in the current __format"""
+        if FileStorage.__format == "json":
+            return FileStorage.__file_path
+        return os.path.splitext(FileStorage.__file_path)[0] + ".bin"
+
+    def __snapshot_paths(self):
+        """returns the (shard name, path) of every shard of the snapshot"""
+        snapshot_path = self.__snapshot_path()
+        return [(shard, shards.shard_path(snapshot_path, shard))
+                for shard in shards.names(FileStorage.__shards)]
+
+    def __dirty_shards(self):
+        """returns the names of the shards holding a dirty key, or None
+        when the whole snapshot must be written: without shards, or when
+        the journals the save removes hold records for any shard"""
+        if FileStorage.__shards is None or any(
+                os.path.exists(path) for path in self.__journal_paths()):
+            return None
+        return {shards.shard_of(key, FileStorage.__shards)
+                for key in FileStorage.__dirty}
+
+    def __load_snapshot(self, snapshot_path):
+        """loads the snapshot (shard) at snapshot_path, or its newest
+        backup that can be read"""
+        snapshot_format = FileStorage.__formats[FileStorage.__format]
+        paths = [snapshot_path] + atomic.backup_paths(
+            snapshot_path, FileStorage.__backups)
+        paths = [path for path in paths if os.path.exists(path)]
+        for path in paths:
+            loaded = []
+            try:
+                if snapshot_format.binary:
+                    file = open(path, mode="rb")
+                else:
+                    file = open(path, mode="r", encoding="utf-8")
+                with file:
+                    for key, value in snapshot_format.iter_items(file):
+                        self.__load(key, value)
+                        loaded.append(key)
+                return
+            except (json.JSONDecodeError, UnicodeDecodeError,
+                    binary_snapshot.SnapshotError) as error:
+                for key in loaded:
+                    self.__unregister(key)
+                if path == paths[-1]:
+                    raise
+                print("** {} is damaged ({}), trying a backup **".format(
+                    path, error), file=sys.stderr)
+
+    def __load_parallel(self, paths):
+        """loads the snapshots at paths parsed by the processes of
+        parallel_reload; a snapshot they could not read is loaded by
+        __load_snapshot, which falls back on its backups"""
+        for path, pairs in parallel_reload.read(
+                paths, FileStorage.__formats[FileStorage.__format],
+                FileStorage.__workers):
+            if pairs is None:
+                self.__load_snapshot(path)
+                continue
+            for key, value in pairs:
+                self.__load(key, value)
+
+    def __load(self, key, value):
+        """stores the object read from the file as value under key"""
+        if not FileStorage.__lazy:
+            class_name = key.split(".")
+            value = globals()[class_name[0]](**value)
+        self.__register(key, value)
+        FileStorage.__dirty.pop(key, None)
+        FileStorage.__serialized.pop(key, None)
+
+    def __register(self, key, obj):
+        """stores obj under key in __objects and the indexes. obj is an
+        instance, or its dictionary in lazy mode"""
+        class_name = key.split(".")[0]
+        dict.__setitem__(FileStorage.__objects, key, obj)
+        FileStorage.__classes.setdefault(class_name, {})[key] = None
+        if FileStorage.__shard_keys is not None:
+            FileStorage.__shard_keys.setdefault(shards.shard_of(
+                key, FileStorage.__shards), {})[key] = None
+        if FileStorage.__attributes is not None:
+            FileStorage.__attributes.add(key, obj, globals()[class_name])
+        if class_name == "Place":
+            if FileStorage.__columns is not None:
+                FileStorage.__columns.add(key, obj)
+            if FileStorage.__geo is not None:
+                FileStorage.__geo.add(key, obj)
+
+    def __unregister(self, key):
+        """removes the object stored under key from __objects and the
+        indexes"""
+        del FileStorage.__objects[key]
+        FileStorage.__classes.get(key.split(".")[0], {}).pop(key, None)
+        if FileStorage.__shard_keys is not None:
+            FileStorage.__shard_keys.get(shards.shard_of(
+                key, FileStorage.__shards), {}).pop(key, None)
+        if FileStorage.__attributes is not None:
+            FileStorage.__attributes.remove(key)
+        if FileStorage.__columns is not None:
+            FileStorage.__columns.remove(key)
+        if FileStorage.__geo is not None:
+            FileStorage.__geo.remove(key)
+
+    def __journal_paths(self):
+        """returns the journal being compacted and the live journal,
+        in the order they must be replayed"""
+        log_path = FileStorage.__file_path + ".log"
+        return [log_path + ".compacting", log_path]
+
+    def __clear_dirty(self):
+        """forgets the dirty keys; their cached text, which a save running
+        in another thread may have stored again, is dropped too"""
+        for key in FileStorage.__dirty:
+            FileStorage.__serialized.pop(key, None)
+        FileStorage.__dirty.clear()
+
+    def __restore_dirty(self, dirty):
+        """marks dirty again the keys of a save that failed, unless they
+        were changed since"""
+        with FileStorage.__lock:
+            for key, obj in dirty.items():
+                if key not in FileStorage.__dirty:
+                    FileStorage.__dirty[key] = obj
+                    FileStorage.__serialized.pop(key, None)
+
+    def __snapshot(self, names=None, dirty=None):
+        """returns what a save writes, taken with __lock held: the (path,
+        copy of the objects) of every shard named in names (all of them
+        for None), a copy of the cache of the serialized chunks, and a
+        copy of the attributes of the objects of dirty (the keys changed
+        since the last save) without a cached chunk.
+        The writers go on changing the objects while the save encodes
+        and writes this snapshot: the cached chunks are immutable, so
+        only the objects changed since the last save are copied (a
+        shallow copy of their attributes) and the rest is a few copies
+        of dictionaries made in C. The other objects are encoded as they
+        are then: one changed in the meantime is dirty again, so the
+        next save writes it anyway"""
+        objects = FileStorage.__objects
+        if names is None:
+            names = shards.names(FileStorage.__shards)
+        parts = []
+        for shard in names:
+            if FileStorage.__shards is None:
+                part = dict.copy(objects)
+            else:
+                part = {key: dict.__getitem__(objects, key)
+                        for key in self.__shard_members(shard)}
+            path = shards.shard_path(self.__snapshot_path(), shard)
+            parts.append((path, part))
+        cached = dict.copy(FileStorage.__serialized)
+        copies = {}
+        for key, value in (dirty or {}).items():
+            # None for a destroyed object
+            if value is not None and key not in cached:
+                copies[key] = dict(value._attributes())
+        return parts, cached, copies
+
+    def __shard_members(self, shard):
+        """returns the keys ({key: None}) of the objects of the shard"""
+        if FileStorage.__shard_keys is None:
+            return FileStorage.__classes.get(shard, {})
+        return FileStorage.__shard_keys.get(shard, {})
+
+    def __serialize(self, objects, cached, copies):
+        """yields the chunk ('"<key>": {...}' JSON text, or binary record)
+        of each of the objects of a __snapshot one at a time, encoding
+        the copies of the objects with no cached chunk"""
+        serialized = FileStorage.__serialized
+        encode = FileStorage.__formats[FileStorage.__format].encode
+        for key, value in objects.items():
+            chunk = cached.get(key)
+            if chunk is None:
+                attributes = copies.get(key)
+                if attributes is not None:
+                    value = value.to_dict(attributes)
+                elif not isinstance(value, dict):
+                    # the dictionaries of lazy objects not built yet are
+                    # stored as they were read
+                    value = value.to_dict()
+                chunk = encode(key, value)
+                if FileStorage.__cache:
+                    serialized[key] = chunk
+            yield chunk
+
+    def __write_snapshot(self, snapshot):
+        """streams the objects of the __snapshot to the snapshot files,
+        atomically"""
+        parts, cached, copies = snapshot
+        snapshot_format = FileStorage.__formats[FileStorage.__format]
+        for path, objects in parts:
+            positions = None
+            if FileStorage.__mapped or FileStorage.__workers > 1:
+                positions = []
+            with atomic.open_atomic(path, FileStorage.__backups,
+                                    snapshot_format.binary) as file:
+                snapshot_format.write_items(
+                    file, self.__serialize(objects, cached, copies),
+                    positions)
+            if positions is not None:
+                snapshot_index.write(path, (
+                    (key,) + position
+                    for key, position in zip(objects, positions)))
+
+    def __append_journal(self):
+        """appends one record per dirty key to the journal and starts a
+        compaction when the journal is over its size threshold"""
+        compacting_path, log_path = self.__journal_paths()
+        with self.__locked(True) as lock, FileStorage.__lock:
+            self.__load_all()
+            self.__merge(lock)
+            records = []
+            for key, obj in FileStorage.__dirty.items():
+                if obj is None:
+                    records.append(("del", key, None))
+                else:
+                    records.append(("set", key, obj.to_dict()))
+            # the dirty keys are kept if the append fails
+            journal.append(log_path, records)
+            self.__clear_dirty()
+            self.__written(lock)
+            if (journal.size(log_path) > FileStorage.__journal_max_bytes and
+                    (FileStorage.__compactor is None or
+                     not FileStorage.__compactor.is_alive())):
+                FileStorage.__compactor = threading.Thread(
+                    target=self.__compact, name="hbnb-compactor")
+                FileStorage.__compactor.start()
+
+    def __compact(self):
+        """folds the journal into a new snapshot. New records keep going
+        to a fresh journal while the snapshot is written; the rotated
+        journal is only removed once the snapshot is on disk"""
+        compacting_path, log_path = self.__journal_paths()
+        with self.__locked(True) as lock:
+            with FileStorage.__lock:
+                if not os.path.exists(log_path):
+                    return
+                self.__load_all()
+                self.__merge(lock)
+                if os.path.exists(compacting_path):
+                    journal.repair(compacting_path)
+                    with open(log_path, mode="r", encoding="utf-8") as src, \
+                            open(compacting_path, mode="a",
+                                 encoding="utf-8") as dst:
+                        dst.write(src.read())
+                    os.remove(log_path)
+                else:
+                    os.replace(log_path, compacting_path)
+                snapshot = self.__snapshot(dirty=FileStorage.__dirty)
+            self.__write_snapshot(snapshot)
+            os.remove(compacting_path)
+            self.__written(lock)
+
+    def wait_compaction(self):
+        """blocks until a running background compaction is finished"""
+        compactor = FileStorage.__compactor
+        if compactor is not None:
+            compactor.join()
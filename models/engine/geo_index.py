@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+class GeoIndex, a grid index over the latitude/longitude of the places:
+the globe is cut into cells of cell_size degrees and each cell holds the
+keys of the places inside it, so a radius, bounding-box or nearest
+neighbour search only looks at the cells around the point.
+
+Distances are great-circle distances in kilometers (haversine()).
+"""
+import math
+
+EARTH_RADIUS = 6371.0088
+HALF_CIRCUMFERENCE = math.pi * EARTH_RADIUS
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """returns the distance in km between two points given in degrees"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) *
+         math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def in_box(lat, lon, min_lat, min_lon, max_lat, max_lon):
+    """returns True if the point is in the box; the box crosses the
+    antimeridian when min_lon > max_lon"""
+    if not min_lat <= lat <= max_lat:
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= lon <= max_lon
+    return lon >= min_lon or lon <= max_lon
+
+
+def coordinates(obj):
+    """returns the (latitude, longitude) of the place obj (an instance, or
+    its dictionary when it is not built yet), or None when they are not
+    valid coordinates. A place that was given neither has none: the 0.0
+    defaults of Place are not a location"""
+    if not isinstance(obj, dict):
+        obj = obj._attributes()
+    if "latitude" not in obj and "longitude" not in obj:
+        return None
+    lat, lon = obj.get("latitude", 0.0), obj.get("longitude", 0.0)
+    for value in (lat, lon):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return None
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        return None
+    return float(lat), float(lon)
+
+
+def radius_box(lat, lon, km):
+    """returns the bounding box (min_lat, min_lon, max_lat, max_lon) of
+    the circle of radius km around the point"""
+    dlat = math.degrees(km / EARTH_RADIUS)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90 or km >= HALF_CIRCUMFERENCE:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    ratio = math.sin(km / EARTH_RADIUS) / math.cos(math.radians(lat))
+    if ratio >= 1:
+        return min_lat, -180.0, max_lat, 180.0
+    dlon = math.degrees(math.asin(ratio))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, min_lon, max_lat, max_lon
+
+
+class GeoIndex:
+    """
+    Summary: grid of the coordinates of the places of FileStorage:
+        __cells -> (row, column) of a cell -> {key: (lat, lon)}
+        __points -> key -> (lat, lon, cell), to move or remove a place
+    """
+
+    def __init__(self, cell_size=0.1):
+        """creates an empty grid of cell_size degrees"""
+        self.__size = cell_size
+        self.__columns = math.ceil(360 / cell_size)
+        self.__cells = {}
+        self.__points = {}
+
+    def __len__(self):
+        """returns the number of places indexed"""
+        return len(self.__points)
+
+    def __cell(self, lat, lon):
+        """returns the cell of the point"""
+        return (math.floor(lat / self.__size),
+                math.floor((lon + 180) / self.__size) % self.__columns)
+
+    def add(self, key, obj):
+        """indexes the coordinates of the place obj under key"""
+        self.remove(key)
+        point = coordinates(obj)
+        if point is None:
+            return
+        cell = self.__cell(*point)
+        self.__cells.setdefault(cell, {})[key] = point
+        self.__points[key] = point + (cell,)
+
+    def update(self, key, obj, name):
+        """reindexes the place obj after its attribute name was set"""
+        if name in ("latitude", "longitude"):
+            self.add(key, obj)
+
+    def remove(self, key):
+        """unindexes the place stored under key"""
+        point = self.__points.pop(key, None)
+        if point is None:
+            return
+        cell = self.__cells[point[2]]
+        del cell[key]
+        if not cell:
+            del self.__cells[point[2]]
+
+    def clear(self):
+        """forgets every place"""
+        self.__cells.clear()
+        self.__points.clear()
+
+    def __candidates(self, min_lat, min_lon, max_lat, max_lon):
+        """yields the (key, (lat, lon)) of the places in the cells
+        overlapping the box"""
+        first = math.floor(min_lat / self.__size)
+        last = math.floor(max_lat / self.__size)
+        column = math.floor((min_lon + 180) / self.__size)
+        end = math.floor((max_lon + 180) / self.__size)
+        if min_lon > max_lon:
+            end += self.__columns
+        # columns past the last one wrap around the antimeridian
+        end = min(end, column + self.__columns - 1)
+        count = (last - first + 1) * (end - column + 1)
+        if count > len(self.__cells):
+            # a large box: cheaper to go through the non-empty cells
+            for (row, col), cell in self.__cells.items():
+                if first <= row <= last and (
+                        column <= col <= end or
+                        column <= col + self.__columns <= end):
+                    yield from cell.items()
+            return
+        for row in range(first, last + 1):
+            for col in range(column, end + 1):
+                cell = self.__cells.get((row, col % self.__columns))
+                if cell:
+                    yield from cell.items()
+
+    def within(self, min_lat, min_lon, max_lat, max_lon):
+        """returns the keys of the places in the box (min_lon > max_lon
+        for a box crossing the antimeridian)"""
+        return [key for key, (lat, lon) in self.__candidates(
+                    min_lat, min_lon, max_lat, max_lon)
+                if in_box(lat, lon, min_lat, min_lon, max_lat, max_lon)]
+
+    def near(self, lat, lon, km):
+        """returns the (distance, key) of the places at most km away from
+        the point, nearest first"""
+        found = []
+        for key, point in self.__candidates(*radius_box(lat, lon, km)):
+            distance = haversine(lat, lon, *point)
+            if distance <= km:
+                found.append((distance, key))
+        found.sort()
+        return found
+
+    def nearest(self, lat, lon, k):
+        """returns the (distance, key) of the k places nearest to the
+        point, nearest first. The search radius starts at one cell and
+        doubles until it holds k places"""
+        if k <= 0:
+            return []
+        km = self.__size * HALF_CIRCUMFERENCE / 180
+        while True:
+            found = self.near(lat, lon, km)
+            if len(found) >= k or km >= HALF_CIRCUMFERENCE:
+                return found[:k]
+            km *= 2
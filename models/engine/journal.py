@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Append-only journal used by FileStorage in journaled mode.
+
+Every create, update or destroy is written as one JSON line:
+    {"op": "set", "key": "<class name>.<id>", "value": {...to_dict()...}}
+    {"op": "del", "key": "<class name>.<id>"}
+Replaying the records in order on top of the last snapshot rebuilds
+the store. Records are idempotent, so replaying a log twice is harmless.
+A crash in the middle of an append leaves a torn last line: it is
+skipped by records() and cut off before the next append, so the records
+appended after it start on a line of their own.
+"""
+import json
+import os
+
+
+class JournalError(ValueError):
+    """raised when a line of a journal other than a torn last one is
+    damaged"""
+
+
+def repair(path):
+    """ends the journal at path with a complete line: a torn last line
+    is cut off, or, if it holds a whole record, gets its newline"""
+    try:
+        file = open(path, mode="r+b")
+    except FileNotFoundError:
+        return
+    with file:
+        end = file.seek(0, os.SEEK_END)
+        start = end
+        while start > 0:
+            step = max(0, start - 4096)
+            file.seek(step)
+            newline = file.read(start - step).rfind(b"\n")
+            if newline >= 0:
+                start = step + newline + 1
+                break
+            start = step
+        if start == end:
+            return
+        file.seek(start)
+        try:
+            json.loads(file.read(end - start))
+        except ValueError:
+            file.truncate(start)
+        else:
+            file.write(b"\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def append(path, records):
+    """appends the (op, key, value) records to the journal at path"""
+    lines = []
+    for op, key, value in records:
+        record = {"op": op, "key": key}
+        if op == "set":
+            record["value"] = value
+        lines.append(json.dumps(record) + "\n")
+    if not lines:
+        return
+    repair(path)
+    with open(path, mode="a", encoding="utf-8") as file:
+        file.write("".join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def records(path):
+    """yields the (op, key, value) records of the journal at path.
+    A torn last line (crash in the middle of an append) is ignored, any
+    other damaged line raises JournalError"""
+    if not os.path.exists(path):
+        return
+    with open(path, mode="r", encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # only the last line can lack its newline
+                if not line.endswith("\n"):
+                    return
+                raise JournalError("line {} of {} is damaged".format(
+                    number, path))
+            yield record["op"], record["key"], record.get("value")
+
+
+def size(path):
+    """returns the size in bytes of the journal at path (0 if missing)"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
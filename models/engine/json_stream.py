@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Streaming access to the top-level JSON object of file.json, so neither
+save() nor reload() has to hold a second full copy of the store:
+    iter_items() yields the (key, value) pairs one at a time
+    encode() returns the '"key": value' chunk of one pair
+    write_items() writes the chunks one at a time
+    decode() reads back the pair of one chunk
+The chunks are ASCII (json.dumps escapes the other characters), so
+their offsets in characters are also their offsets in bytes.
+"""
+import json
+
+WHITESPACE = " \t\n\r"
+binary = False
+# json.dumps with its default arguments, without the checks of each call
+_encode = json.JSONEncoder().encode
+
+
+class _Reader:
+    """incremental reader over the text of a file object"""
+
+    def __init__(self, file, chunk_size):
+        """wraps the file object file, read chunk_size characters at
+        a time"""
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        """reads the next chunk; returns False at the end of the file"""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        # values larger than a chunk are read in fewer, larger steps
+        self.chunk_size = max(self.chunk_size, len(self.buf))
+        return True
+
+    def peek(self):
+        """returns the next non-whitespace character ('' at the end)"""
+        while True:
+            while self.pos < len(self.buf) and \
+                    self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, chars):
+        """consumes the next non-whitespace character, one of chars"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError("Expecting one of {!r}".format(chars),
+                                       self.buf, self.pos)
+        self.pos += 1
+        return char
+
+    def decode(self, decoder):
+        """decodes the next JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise
+                continue
+            # a value ending the buffer may go on in the next chunk
+            if end == len(self.buf) and self.more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_items(file, chunk_size=1 << 16):
+    """yields the (key, value) pairs of the JSON object in the file object
+    file, parsing it chunk_size characters at a time"""
+    reader = _Reader(file, chunk_size)
+    decoder = json.JSONDecoder()
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.decode(decoder)
+        reader.expect(":")
+        yield key, reader.decode(decoder)
+        if reader.expect(",}") == "}":
+            return
+
+
+def encode(key, value):
+    """returns the '"key": value' chunk of the object value (a to_dict()
+    dictionary) stored under key"""
+    return _encode({key: value})[1:-1]
+
+
+def decode(chunk):
+    """returns the (key, value) pair of a '"key": value' chunk (bytes)"""
+    return next(iter(json.loads(b"{" + chunk + b"}").items()))
+
+
+def write_items(file, chunks, positions=None):
+    """writes the '"key": value' chunks as one JSON object to file; the
+    (offset, length) of each chunk is appended to the list positions
+    when one is given"""
+    file.write("{")
+    offset = 1
+    separator = ""
+    for chunk in chunks:
+        file.write(separator + chunk)
+        if positions is not None:
+            offset += len(separator)
+            positions.append((offset, len(chunk)))
+            offset += len(chunk)
+        separator = ", "
+    file.write("}")
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+class LazyObjects, the __objects dictionary of FileStorage in lazy mode.
+
+reload() stores the dictionaries read from the JSON file as they are;
+an entry is turned into a model instance the first time it is read
+through [], get(), values(), items() or pop().
+"""
+
+
+class LazyObjects(dict):
+    """
+    Summary: dictionary of <class name>.id -> instance whose values can
+    still be the raw dictionary of the instance:
+        __classes -> class name -> model class, to build the instances
+        __lock -> lock of the storage, held while an instance is built so
+        that two threads reading the same entry get the same instance
+    """
+
+    def __init__(self, classes, lock, *args):
+        """creates the dictionary, classes maps class names to models"""
+        super().__init__(*args)
+        self.__classes = classes
+        self.__lock = lock
+
+    def is_loaded(self, key):
+        """returns True if the object under key is already built"""
+        return not isinstance(dict.__getitem__(self, key), dict)
+
+    def __getitem__(self, key):
+        """returns the instance stored under key, building it if needed"""
+        value = dict.__getitem__(self, key)
+        if isinstance(value, dict):
+            with self.__lock:
+                value = dict.__getitem__(self, key)
+                if isinstance(value, dict):
+                    value = self.__classes[key.split(".")[0]](**value)
+                    dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        """returns the instance stored under key, or default"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, *default):
+        """removes and returns the instance stored under key"""
+        try:
+            value = self[key]
+        except KeyError:
+            return dict.pop(self, key, *default)
+        dict.__delitem__(self, key)
+        return value
+
+    def values(self):
+        """returns the list of the instances, building them if needed"""
+        return [self[key] for key in self]
+
+    def items(self):
+        """returns the list of (key, instance), building them if needed"""
+        return [(key, self[key]) for key in self]
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""
+Parallel reload of FileStorage (HBNB_STORAGE_WORKERS=N): the snapshot is
+cut into parts parsed by N processes, which also decode the timestamps
+to datetimes; the parent process only builds the instances.
+
+The parts are the shards of the snapshot (see shards). A shard with an
+up-to-date offset index (snapshot_index, written by every save when
+HBNB_STORAGE_WORKERS > 1) is further cut into N ranges of consecutive
+objects, so a single large file.json is parsed by every process too.
+
+The processes are forked from the parent and get their parts through
+the fork, their results coming back through a pipe each. A pool such as
+concurrent.futures.ProcessPoolExecutor would pickle the parsing function
+in a thread of its own, which blocks while a module is being imported:
+the storage is usually first used, and reloaded, by an import such as
+"from models import storage". Where fork is not
+available, or for snapshots smaller than MIN_BYTES, the reload stays
+sequential.
+"""
+import io
+import json
+import marshal
+import multiprocessing
+import os
+from models.base_model import parse_time
+from models.engine import binary_snapshot
+from models.engine import snapshot_index
+
+MIN_BYTES = 1 << 20
+
+
+def enabled(paths, workers):
+    """returns True if the snapshots at paths are worth reading with
+    workers processes"""
+    if workers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return False
+    return sum(os.path.getsize(path) for path in paths) >= MIN_BYTES
+
+
+def spans(path, snapshot_format, workers):
+    """returns the (start, end, number of objects) ranges of the snapshot
+    at path to parse separately: workers ranges of its chunks if it has
+    an up-to-date index, else [(None, None, None)] for the whole file"""
+    index = snapshot_index.open_index(path, snapshot_format)
+    if index is None:
+        return [(None, None, None)]
+    try:
+        offsets = index.offsets()
+    finally:
+        index.close()
+    found = []
+    for i in range(workers):
+        part = offsets[i * len(offsets) // workers:
+                       (i + 1) * len(offsets) // workers]
+        if part:
+            found.append((part[0][0], part[-1][0] + part[-1][1], len(part)))
+    return found
+
+
+def parse(path, binary, start, end, count):
+    """returns the (key, value) pairs of the count objects between the
+    offsets start and end of the snapshot at path (all of them when
+    start is None), with datetimes for the timestamps"""
+    if binary:
+        with open(path, mode="rb") as file:
+            if start is None:
+                return list(binary_snapshot.iter_items(file))
+            file.seek(start)
+            data = io.BytesIO(file.read(end - start))
+        try:
+            return [binary_snapshot.decode_record(marshal.load(data))
+                    for i in range(count)]
+        except (EOFError, ValueError, TypeError, IndexError) as error:
+            raise binary_snapshot.SnapshotError(
+                "damaged record: {}".format(error))
+    with open(path, mode="rb") as file:
+        if start is None:
+            objects = json.load(file)
+        else:
+            file.seek(start)
+            # the chunks are ASCII, separated by ", " (see json_stream)
+            objects = json.loads(b"{" + file.read(end - start) + b"}")
+    pairs = list(objects.items())
+    for key, value in pairs:
+        for name in ("created_at", "updated_at"):
+            timestamp = value.get(name)
+            if isinstance(timestamp, str):
+                value[name] = parse_time(timestamp)
+    return pairs
+
+
+def work(sender, parts, binary):
+    """parses the parts, (path, span), in a process, and sends the pairs
+    of each (None if it could not be read) through the connection
+    sender"""
+    for path, span in parts:
+        try:
+            pairs = parse(path, binary, *span)
+        except (ValueError, EOFError, TypeError):
+            pairs = None
+        try:
+            sender.send(pairs)
+        except OSError:
+            # the parent stopped reading
+            break
+    sender.close()
+
+
+def read(paths, snapshot_format, workers):
+    """yields (path, the (key, value) pairs of the snapshot at path) for
+    each of paths, parsed by workers processes. The pairs are None for a
+    snapshot that could not be read"""
+    parts = [(path, span) for path in paths
+             for span in spans(path, snapshot_format, workers)]
+    context = multiprocessing.get_context("fork")
+    processes = []
+    for i in range(min(workers, len(parts))):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=work, args=(sender, parts[i::workers],
+                               snapshot_format.binary), daemon=True)
+        process.start()
+        sender.close()
+        processes.append((process, receiver))
+    try:
+        pairs = []
+        for i, (path, span) in enumerate(parts):
+            # the part i is the (i // workers)th of the process i % workers
+            try:
+                part = processes[i % workers][1].recv()
+            except EOFError:
+                part = None
+            if part is None:
+                pairs = None
+            elif pairs is not None:
+                pairs.extend(part)
+            if i + 1 == len(parts) or parts[i + 1][0] != path:
+                yield path, pairs
+                pairs = []
+    finally:
+        for process, receiver in processes:
+            receiver.close()
+            process.join()
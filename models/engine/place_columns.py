@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+"""
+class PlaceColumns, a columnar mirror of the numeric attributes of the
+stored places: one NumPy array per attribute of FIELDS plus the list of
+the keys of the rows, so a filter such as "price_by_night between 50
+and 100 and max_guest >= 3" is a few vectorized comparisons instead of
+a Python loop over the objects.
+
+NumPy is optional: without it nothing is mirrored and FileStorage.select
+scans the objects instead.
+"""
+from models.place import Place
+from models.engine.storage_engine import OPERATORS
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FIELDS = ("number_rooms", "number_bathrooms", "max_guest",
+          "price_by_night", "latitude", "longitude")
+
+
+def is_number(value):
+    """returns True if value can be compared with a column: a float, or
+    an int (not a bool) that a float64 holds exactly"""
+    if isinstance(value, float):
+        return True
+    if not isinstance(value, int) or isinstance(value, bool):
+        return False
+    try:
+        return float(value) == value
+    except OverflowError:
+        return False
+
+
+class PlaceColumns:
+    """
+    Summary: numeric columns of the places stored in FileStorage:
+        __keys -> row -> key of the place
+        __rows -> key of the place -> row
+        __columns -> attribute -> float64 array of the values, one per
+            row (NaN when the value is not a number). The arrays grow
+            by doubling; a removed row is filled with the last one
+        __inexact -> attribute -> keys of the places whose value is a
+            bool or an int the column cannot hold (NaN in the column,
+            while the objects compare it as a number)
+    """
+
+    def __init__(self, capacity=1024):
+        """creates empty columns with room for capacity places"""
+        self.__keys = []
+        self.__rows = {}
+        self.__columns = {}
+        self.__inexact = {name: set() for name in FIELDS}
+        if numpy is not None:
+            for name in FIELDS:
+                self.__columns[name] = numpy.full(capacity, numpy.nan)
+
+    def __len__(self):
+        """returns the number of places mirrored"""
+        return len(self.__keys)
+
+    def exact(self, name):
+        """returns True if the column of the attribute name compares like
+        the objects, i.e. no place holds a bool or an inexact int there"""
+        return not self.__inexact[name]
+
+    @staticmethod
+    def attribute_of(obj, name):
+        """returns the attribute name of the place obj (an instance, or its
+        dictionary when it is not built yet)"""
+        if isinstance(obj, dict):
+            return obj.get(name, getattr(Place, name))
+        return getattr(obj, name, None)
+
+    @staticmethod
+    def value_of(obj, name):
+        """returns the attribute name of the place obj as a float, or NaN"""
+        value = PlaceColumns.attribute_of(obj, name)
+        return float(value) if is_number(value) else float("nan")
+
+    def add(self, key, obj):
+        """mirrors the numeric attributes of the place obj under key"""
+        if numpy is None:
+            return
+        row = self.__rows.get(key)
+        if row is None:
+            row = len(self.__keys)
+            if row == len(self.__columns[FIELDS[0]]):
+                self.__grow()
+            self.__keys.append(key)
+            self.__rows[key] = row
+        for name in FIELDS:
+            self.__set(key, row, obj, name)
+
+    def update(self, key, obj, name):
+        """mirrors the attribute name of the place obj after it was set"""
+        row = self.__rows.get(key)
+        if row is not None and name in self.__columns:
+            self.__set(key, row, obj, name)
+
+    def __set(self, key, row, obj, name):
+        """stores the attribute name of the place obj in its row"""
+        value = self.attribute_of(obj, name)
+        if is_number(value):
+            self.__columns[name][row] = value
+            self.__inexact[name].discard(key)
+            return
+        self.__columns[name][row] = numpy.nan
+        if isinstance(value, (int, float)):
+            self.__inexact[name].add(key)
+        else:
+            self.__inexact[name].discard(key)
+
+    def remove(self, key):
+        """stops mirroring the place stored under key"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        for keys in self.__inexact.values():
+            keys.discard(key)
+        last = len(self.__keys) - 1
+        if row != last:
+            moved = self.__keys[last]
+            self.__keys[row] = moved
+            self.__rows[moved] = row
+            for column in self.__columns.values():
+                column[row] = column[last]
+        self.__keys.pop()
+
+    def select(self, conditions):
+        """returns the keys of the places matching all the conditions,
+        (attribute of FIELDS, operator of OPERATORS, number) triples"""
+        size = len(self.__keys)
+        mask = numpy.ones(size, dtype=bool)
+        for name, op, value in conditions:
+            mask &= OPERATORS[op](self.__columns[name][:size], value)
+        keys = self.__keys
+        return [keys[row] for row in numpy.flatnonzero(mask).tolist()]
+
+    def clear(self):
+        """forgets every place"""
+        self.__keys = []
+        self.__rows = {}
+        self.__inexact = {name: set() for name in FIELDS}
+        for name in self.__columns:
+            self.__columns[name] = numpy.full(1024, numpy.nan)
+
+    def __grow(self):
+        """doubles the capacity of the columns"""
+        for name, column in self.__columns.items():
+            grown = numpy.full(2 * len(column), numpy.nan)
+            grown[:len(column)] = column
+            self.__columns[name] = grown
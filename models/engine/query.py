@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""
+Filter expressions of the console, e.g.
+    Place.where(price_by_night < 100, city_id == "1234").order_by(
+        -price_by_night, name).limit(10)
+    Place.where(max_guest >= 4).count()
+
+parse() turns the text after "<class>." into a Query. A Query runs
+through storage.select(), so it uses whatever index the storage has for
+its conditions (an attribute index for ==, the NumPy columns for the
+numeric attributes of places) and falls back to a scan of the class;
+Query.explain() describes the plan storage.plan() chose.
+"""
+import heapq
+import re
+from models.engine.storage_engine import OPERATORS
+
+CALL = re.compile(r"\s*\.?\s*(\w+)\s*\(")
+OPERATOR = "|".join(re.escape(op) for op in
+                    sorted(OPERATORS, key=len, reverse=True))
+CONDITION = re.compile(r"^(\w+)\s*({})\s*(.+)$".format(OPERATOR), re.S)
+
+
+def parse_value(text):
+    """returns the value of a condition: a quoted string, a number, or
+    the text itself"""
+    text = text.strip()
+    if len(text) > 1 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_condition(text):
+    """returns the (attribute, operator, value) triple of a condition such
+    as price_by_night <= 100, or None"""
+    match = CONDITION.match(text.strip())
+    if match is None:
+        return None
+    name, op, value = match.groups()
+    return name, op, parse_value(value)
+
+
+def split_args(text):
+    """splits the arguments of a call on the commas outside quotes"""
+    args = []
+    current = ""
+    quote = None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == ",":
+            args.append(current.strip())
+            current = ""
+            continue
+        current += char
+    if quote:
+        raise ValueError("unterminated string")
+    if current.strip() or args:
+        args.append(current.strip())
+    return args
+
+
+def calls(text):
+    """yields the (name, arguments text) of the chained calls of text,
+    e.g. where(a < 1).limit(2)"""
+    pos = 0
+    while pos < len(text):
+        match = CALL.match(text, pos)
+        if match is None:
+            raise ValueError("expected a call at {!r}".format(text[pos:]))
+        pos = match.end()
+        quote = None
+        start = pos
+        while pos < len(text):
+            char = text[pos]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in "\"'":
+                quote = char
+            elif char == ")":
+                break
+            pos += 1
+        if pos == len(text):
+            raise ValueError("missing ) after {}(".format(match.group(1)))
+        yield match.group(1), text[start:pos]
+        pos += 1
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+
+
+def sort_key(value):
+    """returns a key sorting numbers first, then strings, then the other
+    values by their text"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return 0, value, ""
+    if isinstance(value, str):
+        return 1, 0, value
+    return 2, 0, str(value)
+
+
+class Query:
+    """
+    Summary: a filter expression over the objects of one class:
+        cls -> the class of the objects
+        conditions -> (attribute, operator, value) triples, all to meet
+        order -> (attribute, descending) pairs of order_by()
+        limit -> the number of objects to keep, or None
+        count -> True when the query only counts the objects
+    """
+
+    def __init__(self, cls, conditions=(), order=(), limit=None,
+                 count=False):
+        """creates the query"""
+        self.cls = cls
+        self.conditions = list(conditions)
+        self.order = list(order)
+        self.limit = limit
+        self.count = count
+
+    def run(self, storage):
+        """returns the dictionary of the objects found in storage, in
+        order and limited (or their number for a count query)"""
+        items = list(storage.select(self.cls, self.conditions).items())
+        if self.order:
+            items = self.__sorted(items)
+        if self.limit is not None:
+            items = items[:self.limit]
+        if self.count:
+            return len(items)
+        return dict(items)
+
+    def explain(self, storage):
+        """returns the lines describing how the query runs in storage"""
+        description, fetch, rest = storage.plan(self.cls, self.conditions)
+        lines = ["plan: " + description]
+        for name, op, value in rest:
+            lines.append("filter: {} {} {!r}".format(name, op, value))
+        if self.order:
+            lines.append("order by: " + ", ".join(
+                "{} {}".format(name, "desc" if descending else "asc")
+                for name, descending in self.order))
+        if self.limit is not None:
+            lines.append("limit: {}".format(self.limit))
+        if self.count:
+            lines.append("count")
+        return lines
+
+    def __sorted(self, items):
+        """returns the (key, object) items in the order of order_by(); the
+        first limit of a one-attribute order are picked with a heap"""
+        if len(self.order) == 1 and self.limit is not None:
+            name, descending = self.order[0]
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            return pick(self.limit, items, key=lambda item: sort_key(
+                getattr(item[1], name, None)))
+        for name, descending in reversed(self.order):
+            items.sort(key=lambda item: sort_key(getattr(item[1], name,
+                                                         None)),
+                       reverse=descending)
+        return items
+
+
+def parse(cls, text):
+    """returns the Query over cls of text, the chained calls after
+    "<class>.": where(<condition>, ...), order_by([-]<attribute>, ...),
+    limit(<n>) and count(). Raises ValueError when text is not a query"""
+    query = Query(cls)
+    for name, args_text in calls(text):
+        args = split_args(args_text)
+        if name == "where":
+            for arg in args:
+                condition = parse_condition(arg)
+                if condition is None:
+                    raise ValueError("invalid condition {}".format(arg))
+                query.conditions.append(condition)
+        elif name == "order_by":
+            for arg in args:
+                if not re.match(r"^-?\w+$", arg):
+                    raise ValueError("invalid attribute {}".format(arg))
+                query.order.append((arg.lstrip("-"), arg.startswith("-")))
+        elif name == "limit":
+            if len(args) != 1 or not args[0].isdigit():
+                raise ValueError("limit expects a number")
+            query.limit = int(args[0])
+        elif name == "count" and not args:
+            query.count = True
+        else:
+            raise ValueError("unknown call {}()".format(name))
+    return query
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Sharded snapshots of FileStorage (HBNB_STORAGE_SHARDS): instead of one
+file.json, the objects are split into
+    class: one file per model class, file.User.json, file.Place.json...
+    N: N buckets of keys by CRC-32 of the key, file.0.json ... file.<N-1>
+        .json
+(file.User.bin... in the binary format). A missing shard holds no
+object, and a save only rewrites the shards holding a changed object.
+
+Splitting an existing snapshot into shards, and merging them back:
+    python3 -m models.engine.shards split file.json class|N
+    python3 -m models.engine.shards merge file.json class|N
+The source files are left in place.
+"""
+import os
+import sys
+import zlib
+from models.engine import atomic
+from models.engine import binary_snapshot
+from models.engine import json_stream
+from models.engine import snapshot_index
+
+CLASSES = binary_snapshot.CLASSES
+
+
+def parse(spec):
+    """returns the sharding of the HBNB_STORAGE_SHARDS value spec: None
+    (one file), "class" or the number of buckets"""
+    if not spec:
+        return None
+    if spec == "class":
+        return spec
+    buckets = int(spec)
+    if buckets < 1:
+        raise ValueError("HBNB_STORAGE_SHARDS must be 'class' or a "
+                         "number of buckets, not {!r}".format(spec))
+    return buckets
+
+
+def names(sharding):
+    """returns the names of the shards of sharding ([None] for one
+    file)"""
+    if sharding is None:
+        return [None]
+    if sharding == "class":
+        return list(CLASSES)
+    return [str(bucket) for bucket in range(sharding)]
+
+
+def shard_of(key, sharding):
+    """returns the name of the shard holding key"""
+    if sharding is None:
+        return None
+    if sharding == "class":
+        return key.split(".", 1)[0]
+    return str(zlib.crc32(key.encode()) % sharding)
+
+
+def shard_path(snapshot_path, shard):
+    """returns the path of the shard named shard of the snapshot at
+    snapshot_path (snapshot_path itself for None)"""
+    if shard is None:
+        return snapshot_path
+    root, extension = os.path.splitext(snapshot_path)
+    return "{}.{}{}".format(root, shard, extension)
+
+
+def format_of(snapshot_path):
+    """returns the module of the format of the snapshot at
+    snapshot_path, told by its extension"""
+    if snapshot_path.endswith(".bin"):
+        return binary_snapshot
+    return json_stream
+
+
+def read(path, snapshot_format):
+    """yields the (key, value) pairs of the snapshot at path, if any"""
+    if not os.path.exists(path):
+        return
+    if snapshot_format.binary:
+        file = open(path, mode="rb")
+    else:
+        file = open(path, mode="r", encoding="utf-8")
+    with file:
+        yield from snapshot_format.iter_items(file)
+
+
+def write(path, snapshot_format, chunks):
+    """writes the chunks as the snapshot at path, atomically, with its
+    offset index when HBNB_STORAGE_MMAP=1"""
+    positions = [] if os.getenv("HBNB_STORAGE_MMAP") == "1" else None
+    keys = []
+
+    def track():
+        for key, chunk in chunks:
+            keys.append(key)
+            yield chunk
+    with atomic.open_atomic(path, binary=snapshot_format.binary) as file:
+        snapshot_format.write_items(file, track(), positions)
+    if positions is not None:
+        snapshot_index.write(path, ((key,) + position for key, position
+                                    in zip(keys, positions)))
+
+
+def split(snapshot_path, sharding):
+    """writes the objects of the snapshot at snapshot_path to the shards
+    of sharding"""
+    snapshot_format = format_of(snapshot_path)
+    chunks = {shard: [] for shard in names(sharding)}
+    for key, value in read(snapshot_path, snapshot_format):
+        chunks[shard_of(key, sharding)].append(
+            (key, snapshot_format.encode(key, value)))
+    for shard, items in chunks.items():
+        write(shard_path(snapshot_path, shard), snapshot_format, items)
+
+
+def merge(snapshot_path, sharding):
+    """writes the objects of the shards of sharding to the snapshot at
+    snapshot_path, one at a time"""
+    snapshot_format = format_of(snapshot_path)
+    write(snapshot_path, snapshot_format, (
+        (key, snapshot_format.encode(key, value))
+        for shard in names(sharding)
+        for key, value in read(shard_path(snapshot_path, shard),
+                               snapshot_format)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("split", "merge"):
+        print("Usage: {} split|merge <snapshot> class|N".format(
+            sys.argv[0]), file=sys.stderr)
+        sys.exit(1)
+    sharding = parse(sys.argv[3])
+    if sys.argv[1] == "split":
+        split(sys.argv[2], sharding)
+    else:
+        merge(sys.argv[2], sharding)
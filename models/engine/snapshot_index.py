@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+"""
+Offset index of a FileStorage snapshot (HBNB_STORAGE_MMAP=1), so one
+object is read without parsing the rest of the file.
+
+The index is a sidecar file, <snapshot>.idx:
+    header: b"HBNBIDX" + version byte, then the inode, size and mtime of
+        the snapshot it was written for (an index that does not match
+        the snapshot is not used), the number of entries and the width
+        of the keys
+    entries, sorted by key: the key (padded with NUL bytes to the width),
+        the offset and the length of the chunk of the object in the
+        snapshot
+
+Both files are read through mmap: finding a key is a binary search over
+the entries, reading the object decodes its chunk only.
+"""
+import mmap
+import os
+import struct
+from models.engine import atomic
+
+MAGIC = b"HBNBIDX\x01"
+HEADER = struct.Struct("<8sQQqQH")
+
+
+def index_path(snapshot_path):
+    """returns the path of the index of the snapshot at snapshot_path"""
+    return snapshot_path + ".idx"
+
+
+def entry_struct(width):
+    """returns the struct of an entry whose key is width bytes long"""
+    return struct.Struct("<{}sQI".format(width))
+
+
+def write(snapshot_path, positions):
+    """writes, atomically, the index of the snapshot at snapshot_path
+    from the (key, offset, length) of its chunks"""
+    stat = os.stat(snapshot_path)
+    entries = sorted((key.encode(), offset, length)
+                     for key, offset, length in positions)
+    width = max((len(entry[0]) for entry in entries), default=1)
+    entry = entry_struct(width)
+    with atomic.open_atomic(index_path(snapshot_path), binary=True) as file:
+        file.write(HEADER.pack(MAGIC, stat.st_ino, stat.st_size,
+                               stat.st_mtime_ns, len(entries), width))
+        for start in range(0, len(entries), 4096):
+            file.write(b"".join(entry.pack(*item) for item in
+                                entries[start:start + 4096]))
+
+
+def open_index(snapshot_path, snapshot_format):
+    """returns the SnapshotIndex of the snapshot at snapshot_path, or
+    None when it has no index or its index was written for another
+    version of the file"""
+    try:
+        return SnapshotIndex(snapshot_path, snapshot_format)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+class SnapshotIndex:
+    """
+    Summary: a snapshot and its offset index, both memory-mapped:
+        __format -> the module of the snapshot format (json_stream or
+            binary_snapshot), whose decode() reads one chunk
+        __entries -> the mmap of the index file
+        __data -> the mmap of the snapshot
+    """
+
+    def __init__(self, snapshot_path, snapshot_format):
+        """maps the snapshot and its index; raises ValueError when the
+        index does not match the snapshot"""
+        self.__format = snapshot_format
+        self.__entries = None
+        self.__data = None
+        with open(index_path(snapshot_path), mode="rb") as file:
+            entries = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, ino, size, mtime, count, width = HEADER.unpack_from(entries)
+        with open(snapshot_path, mode="rb") as file:
+            stat = os.fstat(file.fileno())
+            if magic != MAGIC or (ino, size, mtime) != (
+                    stat.st_ino, stat.st_size, stat.st_mtime_ns):
+                entries.close()
+                raise ValueError("stale index")
+            self.__data = mmap.mmap(file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        self.__entries = entries
+        self.__count = count
+        self.__width = width
+        self.__entry = entry_struct(width)
+
+    def __len__(self):
+        """returns the number of objects in the snapshot"""
+        return self.__count
+
+    def __key(self, i):
+        """returns the padded key of the entry i"""
+        start = HEADER.size + i * self.__entry.size
+        return self.__entries[start:start + self.__width]
+
+    def find(self, key):
+        """returns the (offset, length) of the chunk of key, or None"""
+        key = key.encode()
+        if len(key) > self.__width:
+            return None
+        padded = key.ljust(self.__width, b"\0")
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__key(middle) < padded:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.__count or self.__key(low) != padded:
+            return None
+        return self.__entry.unpack_from(
+            self.__entries, HEADER.size + low * self.__entry.size)[1:]
+
+    def get(self, key):
+        """returns the value (to_dict() dictionary) stored under key in
+        the snapshot, or None"""
+        found = self.find(key)
+        if found is None:
+            return None
+        offset, length = found
+        return self.__format.decode(self.__data[offset:offset + length])[1]
+
+    def offsets(self):
+        """returns the (offset, length) of the chunks, in the order of the
+        file"""
+        return sorted(self.__entry.unpack_from(
+            self.__entries, HEADER.size + i * self.__entry.size)[1:]
+            for i in range(self.__count))
+
+    def items(self):
+        """yields the (key, value) pairs of the snapshot, in the order of
+        the file"""
+        for offset, length in self.offsets():
+            yield self.__format.decode(self.__data[offset:offset + length])
+
+    def close(self):
+        """unmaps the files"""
+        for mapped in (self.__entries, self.__data):
+            if mapped is not None:
+                mapped.close()
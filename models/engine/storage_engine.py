@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+"""
+class StorageEngine, the interface every storage engine of models
+implements (FileStorage, DBStorage). models/__init__.py picks the engine
+from the HBNB_TYPE_STORAGE environment variable.
+
+The asave(), areload() and aget() coroutines are for the code running in
+an asyncio event loop: they run save(), reload() and get() in a worker
+thread, on the same objects as the other methods, so the loop goes on
+while the files or the database are read and written.
+"""
+from abc import ABC, abstractmethod
+import asyncio
+from contextlib import contextmanager
+import operator
+from models.engine.geo_index import coordinates, haversine, in_box
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, "==": operator.eq,
+             "!=": operator.ne, ">=": operator.ge, ">": operator.gt}
+
+
+def holds(obj, name, value):
+    """returns True if the attribute name of obj is value, or contains
+    value when it is a list"""
+    attr = getattr(obj, name, None)
+    if isinstance(attr, (list, tuple, set)):
+        return value in attr
+    return attr == value
+
+
+def matches(obj, conditions):
+    """returns True if obj meets all the conditions, (attribute name,
+    operator of OPERATORS, value) triples. "==" is holds(); a comparison
+    between values of different types (e.g. "" < 10) is False"""
+    for name, op, value in conditions:
+        if op == "==":
+            if not holds(obj, name, value):
+                return False
+            continue
+        try:
+            if not OPERATORS[op](getattr(obj, name, None), value):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+class StorageEngine(ABC):
+    """
+    Summary: storage of the model instances, keyed by <class name>.id
+    """
+
+    @abstractmethod
+    def all(self, cls=None):
+        """returns a dictionary of all the objects, or of the objects of
+        cls only (a class or a class name)"""
+
+    @abstractmethod
+    def new(self, obj):
+        """adds obj to the storage (or flags it as changed)"""
+
+    @abstractmethod
+    def save(self):
+        """persists the changes"""
+
+    @abstractmethod
+    def reload(self):
+        """loads the persisted objects"""
+
+    @abstractmethod
+    def delete(self, obj=None):
+        """deletes obj from the storage if it's inside"""
+
+    @abstractmethod
+    def get(self, cls, id):
+        """returns the object of cls with this id, or None"""
+
+    def count(self, cls=None):
+        """returns the number of objects, or of objects of cls only"""
+        return len(self.all(cls))
+
+    def iterate(self, cls=None):
+        """yields the (key, object) pairs of all the objects, or of the
+        objects of cls only, one at a time"""
+        yield from self.all(cls).items()
+
+    def lookup(self, cls, name, value):
+        """returns a dictionary of the objects of cls whose attribute name
+        holds value (or contains it, for a list attribute)"""
+        return {key: obj for key, obj in self.all(cls).items()
+                if holds(obj, name, value)}
+
+    def query(self, cls, **filters):
+        """returns a dictionary of the objects of cls whose attributes
+        hold the values of filters (e.g. query(City, state_id=id)).
+        The first filter on an indexed attribute narrows the search"""
+        if isinstance(cls, str):
+            indexed = ()
+        else:
+            indexed = cls._indexed
+        names = sorted(filters, key=lambda name: name not in indexed)
+        if names:
+            found = self.lookup(cls, names[0], filters[names[0]])
+        else:
+            found = self.all(cls)
+        for name in names[1:]:
+            found = {key: obj for key, obj in found.items()
+                     if holds(obj, name, filters[name])}
+        return found
+
+    def select(self, cls, conditions):
+        """returns a dictionary of the objects of cls that meet all the
+        conditions (see matches()), e.g.
+        select(Place, [("price_by_night", "<", 100)])"""
+        description, fetch, rest = self.plan(cls, conditions)
+        return {key: obj for key, obj in fetch().items()
+                if matches(obj, rest)}
+
+    def plan(self, cls, conditions):
+        """returns how select() finds the objects of cls meeting the
+        conditions: (description, fetch, rest), fetch() returning the
+        candidate objects and rest being the conditions still to check
+        on them. An == condition on an indexed attribute of cls goes
+        through lookup(), anything else is a scan of cls"""
+        indexed = () if isinstance(cls, str) else cls._indexed
+        name = cls if isinstance(cls, str) else cls.__name__
+        for condition in conditions:
+            attr, op, value = condition
+            if op == "==" and attr in indexed:
+                rest = [other for other in conditions if other is not
+                        condition]
+                return ("index lookup {}.{} == {!r}".format(
+                            name, attr, value),
+                        lambda: self.lookup(cls, attr, value), rest)
+        return ("scan {}".format(name), lambda: self.all(cls),
+                list(conditions))
+
+    def near(self, lat, lon, km):
+        """returns a dictionary of the places at most km away from the
+        point (latitude, longitude in degrees), nearest first"""
+        return {key: obj for distance, key, obj in self.__by_distance(
+            lat, lon) if distance <= km}
+
+    def nearest(self, lat, lon, k):
+        """returns a dictionary of the k places nearest to the point,
+        nearest first"""
+        return {key: obj for distance, key, obj
+                in self.__by_distance(lat, lon)[:k]}
+
+    def within(self, min_lat, min_lon, max_lat, max_lon):
+        """returns a dictionary of the places in the box (min_lon >
+        max_lon for a box crossing the antimeridian)"""
+        found = {}
+        for key, obj in self.all("Place").items():
+            point = coordinates(obj)
+            if point is not None and in_box(*point, min_lat, min_lon,
+                                            max_lat, max_lon):
+                found[key] = obj
+        return found
+
+    def __by_distance(self, lat, lon):
+        """returns the (distance, key, place) of all the places with
+        valid coordinates, nearest first"""
+        found = []
+        for key, obj in self.all("Place").items():
+            point = coordinates(obj)
+            if point is not None:
+                found.append((haversine(lat, lon, *point), key, obj))
+        found.sort(key=lambda item: item[:2])
+        return found
+
+    def begin(self):
+        """starts a batch: the engines that can defer their saves only
+        save at the matching commit(). Batches nest"""
+
+    def commit(self):
+        """ends the batch started by begin() and saves; returns False
+        when no batch was open"""
+        self.save()
+        return True
+
+    @contextmanager
+    def batch(self):
+        """runs the with block in a batch (begin() ... commit()). There
+        is no rollback: the changes made before an error are saved"""
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.commit()
+
+    def touch(self, obj, name=None):
+        """called by BaseModel when the attribute name of obj is set"""
+
+    def flush(self):
+        """writes the saves the engine deferred, if any"""
+
+    def refresh(self):
+        """loads what other processes saved since this one last read the
+        store, for the engines that keep it in memory; returns True if
+        anything was read"""
+        return False
+
+    async def asave(self):
+        """save() run in a worker thread"""
+        await asyncio.to_thread(self.save)
+
+    async def areload(self):
+        """reload() run in a worker thread"""
+        await asyncio.to_thread(self.reload)
+
+    async def aget(self, cls, id):
+        """get() run in a worker thread"""
+        return await asyncio.to_thread(self.get, cls, id)
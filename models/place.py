@@ -18,6 +18,7 @@ class Place(BaseModel):
         longitude (float): The longitude of the place.
         amenity_ids (list): A list of Amenity ids.
     """
+    _indexed = ("city_id", "user_id", "amenity_ids")
 
     city_id = ""
     user_id = ""
@@ -13,6 +13,7 @@ class Review(BaseModel):
             place_id - empty string (it will be the Place.id)
             user_id - empty string (it will be the User.id)
     """
+    _indexed = ("place_id", "user_id")
 
     text = ""
     place_id = ""
@@ -10,6 +10,9 @@ Unittest classes:
     TestHBNBCommand_destroy
     TestHBNBCommand_update
 """
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 from io import StringIO
@@ -22,13 +25,16 @@ from models.state import State
 from models.city import City
 from models.amenity import Amenity
 from models.review import Review
+from tests.test_models.test_engine.storage_case import StorageTestCase
 
 
-class TestHBNBCommand(unittest.TestCase):
-    """Unit tests for HBNBCommand class."""
+class TestHBNBCommand(StorageTestCase):
+    """Unit tests for HBNBCommand class, on an empty storage in a
+    temporary directory."""
 
     def setUp(self):
         """Setup method to create initial conditions."""
+        super().setUp()
         self.cli = HBNBCommand()
 
     @patch('sys.stdout', new_callable=StringIO)
@@ -262,6 +268,292 @@ class TestHBNBCommand(unittest.TestCase):
         self.cli.onecmd("count BaseModel")
         self.assertEqual(mock_stdout.getvalue().strip(), "1")
 
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_lookup_missing_value(self, mock_stdout):
+        """Test lookup command with missing value."""
+        self.cli.onecmd("lookup City state_id")
+        self.assertEqual(mock_stdout.getvalue().strip(), "** value missing **")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_lookup(self, mock_stdout):
+        """Test lookup command and its <class>.lookup() form."""
+        city = City()
+        city.state_id = "state-lookup"
+        other = City()
+        self.cli.onecmd("lookup City state_id state-lookup")
+        self.cli.onecmd('City.lookup(state_id, "state-lookup")')
+        lines = mock_stdout.getvalue().strip().split("\n")
+        self.assertEqual(lines[0], lines[1])
+        self.assertIn(city.id, lines[0])
+        self.assertNotIn(other.id, lines[0])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_select_invalid_condition(self, mock_stdout):
+        """Test select command with a malformed condition."""
+        self.cli.onecmd("select Place price_by_night")
+        self.assertEqual(mock_stdout.getvalue().strip(),
+                         "** invalid condition price_by_night **")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_select(self, mock_stdout):
+        """Test select command and its <class>.select() form."""
+        place = Place()
+        place.price_by_night = 7001
+        place.max_guest = 4
+        place.name = "Loft"
+        other = Place()
+        other.price_by_night = 7002
+        self.cli.onecmd("select Place price_by_night>7000 max_guest>=3")
+        self.cli.onecmd('Place.select(price_by_night > 7000, '
+                        'name == "Loft")')
+        lines = mock_stdout.getvalue().strip().split("\n")
+        self.assertEqual(lines[0], lines[1])
+        self.assertIn(place.id, lines[0])
+        self.assertNotIn(other.id, lines[0])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_near_missing_numbers(self, mock_stdout):
+        """Test near command with missing arguments."""
+        self.cli.onecmd("near 48.85 2.35")
+        self.cli.onecmd("within 1 2 x 4")
+        self.assertEqual(mock_stdout.getvalue().strip().split("\n"),
+                         ["** 3 numbers expected **", "** invalid number **"])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_near(self, mock_stdout):
+        """Test near, nearest and within commands."""
+        louvre = Place()
+        louvre.latitude = -48.8606
+        louvre.longitude = -2.3376
+        orsay = Place()
+        orsay.latitude = -48.8600
+        orsay.longitude = -2.3266
+        self.cli.onecmd("near -48.8606 -2.3376 0.5")
+        self.cli.onecmd("nearest -48.8606 -2.3376 2")
+        self.cli.onecmd("within -48.87 -2.34 -48.85 -2.33")
+        lines = mock_stdout.getvalue().strip().split("\n")
+        self.assertIn(louvre.id, lines[0])
+        self.assertNotIn(orsay.id, lines[0])
+        self.assertLess(lines[1].index(louvre.id), lines[1].index(orsay.id))
+        self.assertIn(louvre.id, lines[2])
+        self.assertNotIn(orsay.id, lines[2])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_where(self, mock_stdout):
+        """Test <class>.where() queries and the explain command."""
+        first = Place()
+        first.city_id = "city-where"
+        first.price_by_night = 90
+        second = Place()
+        second.city_id = "city-where"
+        second.price_by_night = 40
+        self.cli.onecmd('Place.where(city_id == "city-where")'
+                        '.order_by(price_by_night)')
+        self.cli.onecmd('Place.where(city_id == "city-where").count()')
+        self.cli.onecmd('explain Place.where(city_id == "city-where", '
+                        'price_by_night > 50)')
+        self.cli.onecmd('Place.where(city_id ==)')
+        lines = mock_stdout.getvalue().strip().split("\n")
+        self.assertLess(lines[0].index(second.id), lines[0].index(first.id))
+        self.assertEqual(lines[1], "2")
+        self.assertEqual(lines[2], "plan: index lookup "
+                         "Place.city_id == 'city-where' (2 objects)")
+        self.assertEqual(lines[3], "filter: price_by_night > 50")
+        self.assertEqual(lines[4], "** invalid query: invalid condition "
+                         "city_id == **")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_all_pages(self, mock_stdout):
+        """Test all command pages: limit, offset and cursor."""
+        for _ in range(3):
+            Amenity()
+        keys = list(storage.all(Amenity))
+        self.cli.onecmd("all Amenity limit=2")
+        self.cli.onecmd("Amenity.all(offset={}, limit=1)".format(
+            len(keys) - 1))
+        lines = mock_stdout.getvalue().strip().split("\n")
+        self.assertEqual(len(eval(lines[0])), 2)
+        self.assertEqual(lines[1], "cursor=2:" + keys[1])
+        self.assertIn(keys[-1].split(".")[1], lines[2])
+        self.assertEqual(len(lines), 3)
+        pages = []
+        cursor = ""
+        while True:
+            mock_stdout.truncate(0)
+            mock_stdout.seek(0)
+            self.cli.onecmd("all Amenity limit=2 format=jsonl " + cursor)
+            lines = mock_stdout.getvalue().strip().split("\n")
+            if not lines[-1].startswith("cursor="):
+                break
+            cursor = lines.pop()
+            pages.extend(lines)
+        pages.extend(lines)
+        self.assertEqual([json.loads(line)["id"] for line in pages],
+                         [key.split(".")[1] for key in keys])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_do_all_cursor_after_destroy(self, mock_stdout):
+        """Test all command cursor once the last object shown is gone."""
+        for _ in range(4):
+            Amenity()
+        keys = list(storage.all(Amenity))
+        self.cli.onecmd("all Amenity limit=2")
+        cursor = mock_stdout.getvalue().strip().split("\n")[1]
+        storage.delete(storage.all()[keys[1]])
+        mock_stdout.truncate(0)
+        mock_stdout.seek(0)
+        self.cli.onecmd("all Amenity limit=1 " + cursor)
+        self.assertIn(keys[2].split(".")[1], mock_stdout.getvalue())
+        mock_stdout.truncate(0)
+        mock_stdout.seek(0)
+        self.cli.onecmd("all Amenity cursor=x limit=y")
+        self.assertEqual(mock_stdout.getvalue().strip(),
+                         "** invalid option limit=y **")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_create_many(self, mock_stdout):
+        """Test create_many command: one save for all the instances."""
+        with patch.object(storage, "_FileStorage__persist") as write:
+            self.cli.onecmd("create_many State 5")
+        write.assert_called_once_with()
+        ids = mock_stdout.getvalue().split()
+        self.assertEqual(len(ids), 5)
+        for state_id in ids:
+            self.assertIsNotNone(storage.get(State, state_id))
+        mock_stdout.truncate(0)
+        mock_stdout.seek(0)
+        self.cli.onecmd("create_many State")
+        self.assertEqual(mock_stdout.getvalue().strip(),
+                         "** number of instances missing **")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_import(self, mock_stdout):
+        """Test import command, with a line in error."""
+        user = User()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "users.jsonl")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('{"first_name": "Betty", "email": "b@x.io"}\n')
+                file.write('{"first_name": \n')
+                file.write('\n')
+                file.write('{"first_name": "Ann", "created_at": 5}\n')
+                file.write(json.dumps(dict(user.to_dict(),
+                                           first_name="Bob")) + "\n")
+            with patch.object(storage, "_FileStorage__persist") as write:
+                self.cli.onecmd("import User " + path)
+            write.assert_called_once_with()
+        lines = mock_stdout.getvalue().strip().split("\n")
+        self.assertTrue(lines[0].startswith("** line 2: "))
+        self.assertTrue(lines[1].startswith("** line 4: "))
+        self.assertEqual(lines[2], "2")
+        self.assertEqual(storage.get(User, user.id).first_name, "Bob")
+        self.assertEqual(len(storage.lookup(User, "email", "b@x.io")), 1)
+        self.assertEqual(storage.lookup(User, "first_name", "Ann"), {})
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_destroy_where(self, mock_stdout):
+        """Test destroy_where command."""
+        cities = [City(), City(), City()]
+        for city in cities[:2]:
+            city.state_id = "state-destroy-where"
+        self.cli.onecmd("destroy_where City state_id==state-destroy-where")
+        self.assertEqual(mock_stdout.getvalue().strip(), "2")
+        self.assertIsNone(storage.get(City, cities[0].id))
+        self.assertIsNotNone(storage.get(City, cities[2].id))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_begin_commit(self, mock_stdout):
+        """Test begin and commit commands: one save for the batch."""
+        with patch.object(storage, "_FileStorage__persist") as write:
+            self.cli.onecmd("begin")
+            self.cli.onecmd("create User")
+            self.cli.onecmd("create Place")
+            self.cli.onecmd("create_many State 2")
+            write.assert_not_called()
+            self.cli.onecmd("commit")
+            write.assert_called_once_with()
+        self.cli.onecmd("commit")
+        self.assertEqual(mock_stdout.getvalue().strip().split("\n")[-1],
+                         "** no batch to commit **")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_quit_commits_open_batch(self, mock_stdout):
+        """Test quit commits a begin without commit, with a warning."""
+        report = StringIO()
+        with patch.object(storage, "_FileStorage__persist") as write, \
+                patch('sys.stderr', report):
+            self.cli.onecmd("begin")
+            self.cli.onecmd("begin")
+            self.cli.onecmd("create User")
+            self.cli.onecmd("commit")
+            write.assert_not_called()
+            self.assertTrue(self.cli.onecmd("quit"))
+            write.assert_called_once_with()
+        self.assertEqual(report.getvalue(),
+                         "** 1 begin without commit: committed **\n")
+        self.assertEqual(self.cli.exit_status, 0)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_quit_save_error(self, mock_stdout):
+        """Test quit reports changes that could not be saved."""
+        report = StringIO()
+        with patch.object(storage, "_FileStorage__persist",
+                          side_effect=OSError("disk full")), \
+                patch('sys.stderr', report):
+            self.cli.onecmd("begin")
+            self.cli.onecmd("create User")
+            self.cli.onecmd("EOF")
+        self.assertEqual(report.getvalue().split("\n")[1],
+                         "** cannot save: OSError: disk full **")
+        self.assertEqual(self.cli.exit_status, 1)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_run_batch(self, mock_stdout):
+        """Test batch mode: errors reported by line, one save."""
+        commands = StringIO("create User\n# comment\n\nshow User nope\n"
+                            'User.update("x", {)\ncount Amenity\n'
+                            "quit\ncreate User\n")
+        report = StringIO()
+        with patch.object(storage, "_FileStorage__persist") as write:
+            errors = self.cli.run_batch(commands, report=report)
+        write.assert_called_once_with()
+        self.assertEqual(errors, 2)
+        lines = report.getvalue().split("\n")
+        self.assertEqual(lines[0], "line 4: show User nope: "
+                         "** no instance found **")
+        self.assertTrue(lines[1].startswith('line 5: User.update("x", {): '
+                                            "** SyntaxError: "))
+        self.assertTrue(lines[2].startswith("batch: 5 commands, 2 errors"))
+        self.assertTrue(lines[3].startswith("latency (ms): p50 "))
+        output = mock_stdout.getvalue().split("\n")
+        self.assertIsNotNone(storage.get(User, output[0]))
+        self.assertEqual(output[1], "** no instance found **")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_run_batch_checkpoints(self, mock_stdout):
+        """Test batch mode saves at each checkpoint."""
+        commands = StringIO("create State\n" * 5)
+        with patch.object(storage, "_FileStorage__persist") as write:
+            self.cli.run_batch(commands, checkpoint=2, report=StringIO())
+        self.assertEqual(write.call_count, 3)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_run_batch_open_batch(self, mock_stdout):
+        """Test batch mode commits a begin without commit."""
+        commands = StringIO("begin\ncreate State\n")
+        report = StringIO()
+        with patch.object(storage, "_FileStorage__persist") as write:
+            errors = self.cli.run_batch(commands, report=report)
+        write.assert_called_once_with()
+        self.assertEqual(errors, 0)
+        self.assertEqual(report.getvalue().split("\n")[0],
+                         "** 1 begin without commit: committed **")
+        with patch.object(storage, "_FileStorage__persist",
+                          side_effect=OSError("disk full")):
+            errors = self.cli.run_batch(StringIO("create State\n"),
+                                        report=StringIO())
+        self.assertEqual(errors, 1)
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_default_method(self, mock_stdout):
         """Test default method for unknown commands."""
@@ -112,5 +112,43 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(" ".join(update_aux),
                          str(self.bm_instance1.updated_at))
 
+
+class TestBaseModelTimestamps(unittest.TestCase):
+    """Test class for the timestamps read by BaseModel(**kwargs)"""
+
+    def test_round_trip(self):
+        """to_dict() timestamps are read back exactly"""
+        bm = BaseModel()
+        copy = BaseModel(**bm.to_dict())
+        self.assertEqual(copy.created_at, bm.created_at)
+        self.assertEqual(copy.updated_at, bm.updated_at)
+        self.assertNotIn("__class__", copy.__dict__)
+        self.assertEqual(list(copy.__dict__), list(bm.__dict__))
+
+    def test_without_microseconds(self):
+        """isoformat() leaves out microseconds when they are 0"""
+        when = datetime(2024, 5, 18, 19, 48, 26)
+        bm = BaseModel(id="1", created_at=when.isoformat(),
+                       updated_at=when.isoformat())
+        self.assertEqual(bm.created_at, when)
+        self.assertEqual(bm.updated_at, when)
+
+    def test_datetime_values(self):
+        """datetime timestamps are used as they are"""
+        when = datetime(2024, 5, 18, 19, 48, 26, 867683)
+        bm = BaseModel(created_at=when, updated_at=when)
+        self.assertIs(bm.created_at, when)
+        self.assertIsInstance(bm.id, str)
+
+    def test_invalid_values(self):
+        """timestamps other than strings and datetimes are refused"""
+        for value in (5, None, ["2024-05-18"]):
+            with self.assertRaises(ValueError):
+                BaseModel(created_at=value)
+            with self.assertRaises(ValueError):
+                BaseModel(updated_at=value)
+        with self.assertRaises(ValueError):
+            BaseModel(created_at="yesterday")
+
  #   if __name__ == '__main__':
  #       unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+""" Unittest for the compact models (HBNB_COMPACT_MODELS=1) """
+
+import unittest
+from models import compact
+from models.base_model import BaseModel
+from models.place import Place
+from models.user import User
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestCompactModels(StorageTestCase):
+    """Test class for models/compact.py"""
+
+    def setUp(self):
+        """SetUp method: compact models, storage in a temporary directory"""
+        super().setUp()
+        self.enabled = compact.enabled
+        compact.enabled = True
+
+    def tearDown(self):
+        """restores the storage class attributes and compact.enabled"""
+        compact.enabled = self.enabled
+        super().tearDown()
+
+    def test_slots(self):
+        """The schema attributes are slots of a subclass of the model"""
+        place = Place()
+        self.assertIsInstance(place, Place)
+        self.assertIsNot(type(place), Place)
+        self.assertEqual(type(place).__name__, "Place")
+        self.assertIs(compact.compact_class(Place), type(place))
+        self.assertIs(compact.compact_class(type(place)), type(place))
+        self.assertIn("price_by_night", type(place).__slots__)
+        self.assertIn("Place." + place.id, models.storage.all())
+
+    def test_defaults(self):
+        """Unset schema attributes read the class defaults"""
+        place = Place()
+        self.assertEqual(place.name, "")
+        self.assertEqual(place.max_guest, 0)
+        self.assertEqual(place.amenity_ids, [""])
+        self.assertEqual(Place.name, "")
+        with self.assertRaises(AttributeError):
+            place.color
+        self.assertNotIn("name", place.to_dict())
+
+    def test_to_dict(self):
+        """to_dict() and str() match the ones of the usual instances"""
+        place = Place()
+        place.name = "Loft"
+        place.price_by_night = 80
+        compact.enabled = False
+        usual = Place(**place.to_dict())
+        compact.enabled = True
+        self.assertIs(type(usual), Place)
+        self.assertEqual(usual.to_dict(), place.to_dict())
+        self.assertEqual(str(usual), str(place))
+        copy = Place(**place.to_dict())
+        self.assertEqual(copy.to_dict(), place.to_dict())
+        self.assertEqual(copy.created_at, place.created_at)
+
+    def test_overflow(self):
+        """Attributes outside the schema go to the overflow dictionary"""
+        user = User()
+        user.nickname = "Betty"
+        self.assertEqual(user.nickname, "Betty")
+        self.assertEqual(user.to_dict()["nickname"], "Betty")
+        self.assertIn("'nickname': 'Betty'", str(user))
+        copy = User(**user.to_dict())
+        self.assertEqual(copy.nickname, "Betty")
+
+    def test_touch(self):
+        """Setting an attribute flags the instance as changed"""
+        place = Place()
+        models.storage.save()
+        dirty = FileStorage._FileStorage__dirty
+        self.assertNotIn("Place." + place.id, dirty)
+        place.city_id = "c1"
+        self.assertIs(dirty["Place." + place.id], place)
+        self.assertEqual(list(models.storage.lookup(Place, "city_id", "c1")),
+                         ["Place." + place.id])
+
+    def test_reload(self):
+        """Reloaded instances are compact"""
+        place = Place()
+        place.name = "Loft"
+        base = BaseModel()
+        models.storage.save()
+        self.reset()
+        models.storage.reload()
+        copy = models.storage.get(Place, place.id)
+        self.assertIs(type(copy), type(place))
+        self.assertEqual(copy.to_dict(), place.to_dict())
+        self.assertIn("BaseModel." + base.id, models.storage.all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+""" Base class of the unittests of FileStorage on a temporary file """
+
+import unittest
+import os
+import tempfile
+from models.engine.file_storage import FileStorage
+import models
+
+# class attributes of FileStorage shared by every test as they are: its
+# locks and background threads
+SHARED = ("_FileStorage__lock", "_FileStorage__flush_lock",
+          "_FileStorage__pending_cond", "_FileStorage__flusher",
+          "_FileStorage__compactor", "_FileStorage__formats")
+
+
+class StorageTestCase(unittest.TestCase):
+    """Test case running an empty FileStorage on self.path, in a
+    temporary directory. Every other class attribute of FileStorage is
+    restored by tearDown, so a test can change any setting
+    (FileStorage._FileStorage__<name> = ...)"""
+
+    def setUp(self):
+        """SetUp method: empty storage on a temporary file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "file.json")
+        self.saved = {name: value for name, value in vars(FileStorage).items()
+                      if name.startswith("_FileStorage__") and
+                      not callable(value) and name not in SHARED}
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__versions = {}
+        FileStorage._FileStorage__index = None
+        FileStorage._FileStorage__pending = 0
+        FileStorage._FileStorage__batch = 0
+        FileStorage._FileStorage__batch_saved = False
+        FileStorage._FileStorage__flush_error = None
+        self.reset()
+        self.storage = models.storage
+
+    def tearDown(self):
+        """restores the storage class attributes"""
+        self.storage.wait_compaction()
+        self.reset()
+        for name, value in self.saved.items():
+            setattr(FileStorage, name, value)
+        self.tmp.cleanup()
+
+    def reset(self):
+        """empties the storage, closing its mapped snapshots"""
+        for index in (FileStorage._FileStorage__index or {}).values():
+            index.close()
+        FileStorage._FileStorage__index = None
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__attributes = None
+        FileStorage._FileStorage__columns = None
+        FileStorage._FileStorage__geo = None
+        FileStorage._FileStorage__dirty = {}
+        FileStorage._FileStorage__serialized = {}
+        if FileStorage._FileStorage__shard_keys is not None:
+            FileStorage._FileStorage__shard_keys = {}
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+""" Unittest for the asyncio methods of the storage engines """
+
+import unittest
+import asyncio
+import json
+import time
+from models.user import User
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestAsyncStorage(StorageTestCase,
+                       unittest.IsolatedAsyncioTestCase):
+    """Test class for asave, areload and aget of FileStorage"""
+
+    async def test_shared_objects(self):
+        """The coroutines work on the objects of the sync methods"""
+        user = User()
+        self.assertIs(await self.storage.aget(User, user.id), user)
+        self.assertIsNone(await self.storage.aget("User", "missing"))
+        user.first_name = "Betty"
+        await self.storage.asave()
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["User." + user.id]["first_name"],
+                             "Betty")
+        self.reset()
+        await self.storage.areload()
+        self.assertEqual(self.storage.get(User, user.id).first_name,
+                         "Betty")
+
+    async def test_loop_latency(self):
+        """The event loop keeps running while a large save is written"""
+        for i in range(50000):
+            User().first_name = "user {}".format(i)
+        late = []
+
+        async def tick():
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                late.append(time.perf_counter() - start - 0.005)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await self.storage.asave()
+        elapsed = time.perf_counter() - start
+        ticker.cancel()
+        self.assertGreater(len(late), 10)
+        self.assertLess(max(late), max(0.1, elapsed / 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+""" Unittest for the crash-safe saves of FileStorage """
+
+import unittest
+import json
+import os
+from models.user import User
+from models.engine import atomic
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestAtomic(StorageTestCase):
+    """Test class for atomic saves, backups and recovery"""
+
+    def setUp(self):
+        """SetUp method: storage on a temporary file, two backups"""
+        super().setUp()
+        FileStorage._FileStorage__backups = 2
+
+    def count_in(self, path):
+        """returns the number of objects in the snapshot at path"""
+        with open(path) as f:
+            return len(json.load(f))
+
+    def test_backups_rotate(self):
+        """Each save keeps the previous snapshots"""
+        for i in range(4):
+            User()
+            models.storage.save()
+        self.assertEqual(self.count_in(self.path), 4)
+        self.assertEqual(self.count_in(self.path + ".1"), 3)
+        self.assertEqual(self.count_in(self.path + ".2"), 2)
+        self.assertFalse(os.path.exists(self.path + ".3"))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_failed_write_keeps_file(self):
+        """An error in the middle of a save leaves file.json untouched"""
+        User()
+        models.storage.save()
+        with open(self.path) as f:
+            before = f.read()
+        with self.assertRaises(RuntimeError):
+            with atomic.open_atomic(self.path, 2) as file:
+                file.write("{\"User.x\": ")
+                raise RuntimeError("killed")
+        with open(self.path) as f:
+            self.assertEqual(f.read(), before)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        self.assertFalse(os.path.exists(self.path + ".2"))
+
+    def test_reload_falls_back_to_backup(self):
+        """reload() uses the newest backup when file.json is truncated"""
+        users = [User(), User()]
+        models.storage.save()
+        User()
+        models.storage.save()
+        with open(self.path) as f:
+            text = f.read()
+        with open(self.path, "w") as f:
+            f.write(text[:len(text) // 2])
+        self.reset()
+        models.storage.reload()
+        self.assertEqual(set(models.storage.all()),
+                         {"User." + u.id for u in users})
+
+    def test_reload_without_good_snapshot(self):
+        """reload() raises when no snapshot can be read"""
+        with open(self.path, "w") as f:
+            f.write("{\"User.x\": ")
+        with self.assertRaises(ValueError):
+            models.storage.reload()
+
+
+if __name__ == '__main__':
+    unittest.main()
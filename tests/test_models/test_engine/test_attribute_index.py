@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+""" Unittest for the attribute indexes of FileStorage """
+
+import unittest
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.engine.attribute_index import AttributeIndex
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestAttributeIndex(StorageTestCase):
+    """Test class for AttributeIndex and FileStorage.lookup"""
+
+    def setUp(self):
+        """SetUp method: empty storage with a few related objects"""
+        super().setUp()
+        self.state = State()
+        self.cities = [City(), City()]
+        for city in self.cities:
+            city.state_id = self.state.id
+        self.place = Place()
+        self.place.amenity_ids = ["a1", "a2"]
+        self.review = Review()
+        self.review.place_id = self.place.id
+
+    def keys(self, objs):
+        """returns the storage keys of objs"""
+        return {"{}.{}".format(type(o).__name__, o.id) for o in objs}
+
+    def test_lookup(self):
+        """lookup() finds the objects holding a value"""
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(set(found), self.keys(self.cities))
+        found = models.storage.lookup("Review", "place_id", self.place.id)
+        self.assertEqual(set(found), self.keys([self.review]))
+        self.assertEqual(models.storage.lookup(City, "state_id", "x"), {})
+
+    def test_list_attribute(self):
+        """Each element of a list attribute is indexed"""
+        for amenity_id in ("a1", "a2"):
+            found = models.storage.lookup(Place, "amenity_ids", amenity_id)
+            self.assertEqual(set(found), self.keys([self.place]))
+
+    def test_setattr_reindexes(self):
+        """Changing an indexed attribute moves the object"""
+        self.cities[0].state_id = "other"
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(set(found), self.keys(self.cities[1:]))
+        found = models.storage.lookup(City, "state_id", "other")
+        self.assertEqual(set(found), self.keys(self.cities[:1]))
+
+    def test_delete_unindexes(self):
+        """delete() removes the object from the indexes"""
+        models.storage.delete(self.cities[0])
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(set(found), self.keys(self.cities[1:]))
+
+    def test_reload_rebuilds(self):
+        """reload() rebuilds the indexes from the file"""
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__attributes = AttributeIndex()
+        models.storage.reload()
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(set(found), self.keys(self.cities))
+
+    def test_built_on_first_lookup(self):
+        """A reload leaves the indexes to the first lookup"""
+        models.storage.save()
+        self.reset()
+        models.storage.reload()
+        self.assertIsNone(FileStorage._FileStorage__attributes)
+        found = models.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(set(found), self.keys(self.cities))
+        models.storage.get(City, self.cities[0].id).state_id = "other"
+        found = models.storage.lookup(City, "state_id", "other")
+        self.assertEqual(set(found), self.keys(self.cities[:1]))
+
+    def test_unindexed_attribute(self):
+        """An attribute without index is found by a scan"""
+        self.cities[1].name = "Lagos"
+        found = models.storage.lookup(City, "name", "Lagos")
+        self.assertEqual(set(found), self.keys(self.cities[1:]))
+
+    def test_unhashable_value(self):
+        """An unhashable value is not indexed and not found"""
+        self.review.user_id = {"not": "hashable"}
+        self.assertEqual(models.storage.lookup(Review, "user_id", "x"), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+""" Unittest for the binary snapshot format of FileStorage """
+
+import unittest
+import io
+import json
+import os
+from models.place import Place
+from models.user import User
+from models.engine import binary_snapshot
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestBinarySnapshot(StorageTestCase):
+    """Test class for binary_snapshot and HBNB_STORAGE_FORMAT=binary"""
+
+    def setUp(self):
+        """SetUp method: binary storage in a temporary directory"""
+        super().setUp()
+        FileStorage._FileStorage__format = "binary"
+        self.user = User()
+        self.user.first_name = "Betty"
+        self.place = Place()
+        self.place.amenity_ids = ["a1", "a2"]
+        self.place.latitude = 43.6
+
+    def test_round_trip(self):
+        """Records decode to the to_dict() of the object"""
+        out = io.BytesIO()
+        objs = {"User." + self.user.id: self.user,
+                "Place." + self.place.id: self.place}
+        binary_snapshot.write_items(out, (
+            binary_snapshot.encode(k, o.to_dict()) for k, o in objs.items()))
+        out.seek(0)
+        for key, value in binary_snapshot.iter_items(out):
+            expected = objs[key].to_dict()
+            self.assertEqual(binary_snapshot.to_json_value(value), expected)
+            self.assertEqual(value["created_at"], objs[key].created_at)
+
+    def test_storage(self):
+        """save() and reload() in binary format"""
+        models.storage.save()
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name,
+                                                    "file.bin")))
+        self.assertFalse(os.path.exists(self.path))
+        self.reset()
+        models.storage.reload()
+        user = models.storage.get(User, self.user.id)
+        self.assertEqual(user.first_name, "Betty")
+        self.assertEqual(user.updated_at, self.user.updated_at)
+        place = models.storage.get(Place, self.place.id)
+        self.assertEqual(place.amenity_ids, ["a1", "a2"])
+        self.assertEqual(place.latitude, 43.6)
+
+    def test_truncated(self):
+        """A truncated snapshot raises a SnapshotError"""
+        models.storage.save()
+        path = os.path.join(self.tmp.name, "file.bin")
+        with open(path, "rb") as f:
+            data = f.read()
+        for size in (3, len(data) // 2, len(data) - 1):
+            with self.subTest(size=size):
+                with self.assertRaises(binary_snapshot.SnapshotError):
+                    list(binary_snapshot.iter_items(io.BytesIO(data[:size])))
+
+    def test_convert(self):
+        """file.json -> binary -> file.json gives the same objects"""
+        FileStorage._FileStorage__format = "json"
+        models.storage.save()
+        binary = os.path.join(self.tmp.name, "file.bin")
+        back = os.path.join(self.tmp.name, "back.json")
+        binary_snapshot.convert(self.path, binary, True)
+        binary_snapshot.convert(binary, back, False)
+        with open(self.path) as f1, open(back) as f2:
+            self.assertEqual(json.load(f1), json.load(f2))
+        self.assertLess(os.path.getsize(binary), os.path.getsize(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+""" Unittest for DBStorage class """
+
+import unittest
+import os
+import sqlite3
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from models.engine.db_storage import DBStorage
+from models.engine.storage_engine import StorageEngine
+import models
+
+
+class TestDBStorage(unittest.TestCase):
+    """Test class for DBStorage"""
+    cache = "10000"
+
+    def setUp(self):
+        """SetUp method: DBStorage on a temporary database, used as
+        models.storage"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "hbnb.db")
+        with patch.dict(os.environ, {"HBNB_SQLITE_PATH": self.path,
+                                     "HBNB_SQLITE_CACHE": self.cache}):
+            self.storage = DBStorage()
+        self.storage.reload()
+        self.patches = [patch("models.storage", self.storage),
+                        patch("console.storage", self.storage)]
+        for p in self.patches:
+            p.start()
+        self.state = State()
+        self.city = City()
+        self.city.state_id = self.state.id
+        self.place = Place()
+        self.place.city_id = self.city.id
+        self.place.amenity_ids = ["a1", "a2"]
+        self.storage.save()
+
+    def tearDown(self):
+        """stops the patches and removes the database"""
+        for p in self.patches:
+            p.stop()
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def fresh(self):
+        """returns a new DBStorage on the same database"""
+        self.storage.close()
+        with patch.dict(os.environ, {"HBNB_SQLITE_PATH": self.path,
+                                     "HBNB_SQLITE_CACHE": self.cache}):
+            storage = DBStorage()
+        storage.reload()
+        self.storage = storage
+        for p in self.patches:
+            p.stop()
+        self.patches = [patch("models.storage", storage),
+                        patch("console.storage", storage)]
+        for p in self.patches:
+            p.start()
+        return storage
+
+    def test_interface(self):
+        """DBStorage implements StorageEngine"""
+        self.assertIsInstance(self.storage, StorageEngine)
+
+    def test_iterate(self):
+        """iterate() goes through the rows in batches"""
+        users = {"User." + User().id for _ in range(1203)}
+        self.storage.save()
+        storage = self.fresh()
+        keys = [key for key, obj in storage.iterate(User)]
+        self.assertEqual(len(keys), 1203)
+        self.assertEqual(set(keys), users)
+        self.assertEqual(len(list(storage.iterate())), 1206)
+
+    def test_tables_and_indexes(self):
+        """One table per class, indexes on the foreign keys"""
+        con = sqlite3.connect(self.path)
+        names = {row[0] for row in con.execute(
+            "SELECT name FROM sqlite_master")}
+        con.close()
+        for name in ("User", "Place", "City", "City_state_id",
+                     "Place_city_id", "Place_amenity_ids_value"):
+            self.assertIn(name, names)
+
+    def test_persisted(self):
+        """Saved objects are read back by another DBStorage"""
+        storage = self.fresh()
+        city = storage.get(City, self.city.id)
+        self.assertEqual(city.state_id, self.state.id)
+        self.assertEqual(city.created_at, self.city.created_at)
+        self.assertIs(storage.get("City", self.city.id), city)
+        self.assertEqual(storage.count(), 3)
+        self.assertEqual(storage.count(Place), 1)
+        self.assertEqual(set(storage.all()),
+                         {"State." + self.state.id, "City." + self.city.id,
+                          "Place." + self.place.id})
+
+    def test_update_is_one_row(self):
+        """An update rewrites the row of the changed object"""
+        self.city.name = "Lagos"
+        self.city.save()
+        city = self.fresh().get(City, self.city.id)
+        self.assertEqual(city.name, "Lagos")
+
+    def test_lookup(self):
+        """lookup() and query() use the foreign key columns"""
+        found = self.storage.lookup(City, "state_id", self.state.id)
+        self.assertEqual(list(found), ["City." + self.city.id])
+        found = self.storage.lookup("Place", "amenity_ids", "a2")
+        self.assertEqual(list(found), ["Place." + self.place.id])
+        found = self.storage.query(Place, city_id=self.city.id,
+                                   amenity_ids="a1")
+        self.assertEqual(list(found), ["Place." + self.place.id])
+        self.city.state_id = "other"
+        self.assertEqual(
+            self.storage.lookup(City, "state_id", self.state.id), {})
+
+    def test_delete(self):
+        """delete() removes the row on save()"""
+        self.storage.delete(self.city)
+        self.assertIsNone(self.storage.get(City, self.city.id))
+        self.storage.save()
+        self.assertIsNone(self.fresh().get(City, self.city.id))
+
+    def test_console(self):
+        """The console works on DBStorage"""
+        with patch('sys.stdout', new_callable=StringIO) as out:
+            HBNBCommand().onecmd("create User")
+            user_id = out.getvalue().strip()
+        storage = self.fresh()
+        with patch('sys.stdout', new_callable=StringIO) as out:
+            HBNBCommand().onecmd('update User {} first_name "Betty"'.format(
+                user_id))
+            HBNBCommand().onecmd("show User {}".format(user_id))
+            self.assertIn("Betty", out.getvalue())
+        self.assertEqual(self.fresh().get(User, user_id).first_name,
+                         "Betty")
+
+
+class TestDBStorageCache(TestDBStorage):
+    """Test class for DBStorage keeping at most 2 instances in memory
+    (the tests of TestDBStorage run again with it)"""
+    cache = "2"
+
+    def test_evictions(self):
+        """The least recently used instances are evicted"""
+        storage = self.fresh()
+        storage.get(State, self.state.id)
+        storage.get(City, self.city.id)
+        storage.get(State, self.state.id)
+        self.assertEqual(storage.cache_info(), {
+            "hits": 1, "misses": 2, "evictions": 0, "writebacks": 0,
+            "size": 2, "capacity": 2})
+        storage.get(Place, self.place.id)
+        storage.get(State, self.state.id)
+        info = storage.cache_info()
+        self.assertEqual((info["hits"], info["evictions"], info["size"]),
+                         (2, 1, 2))
+
+    def test_write_back(self):
+        """A changed instance is written when it is evicted"""
+        storage = self.fresh()
+        storage.get(City, self.city.id).name = "Lagos"
+        storage.get(State, self.state.id)
+        storage.get(Place, self.place.id)
+        self.assertEqual(storage.cache_info()["writebacks"], 1)
+        # read back from the row, the evicted instance is gone
+        self.assertEqual(storage.get(City, self.city.id).name, "Lagos")
+        storage.save()
+        self.assertEqual(self.fresh().get(City, self.city.id).name, "Lagos")
+
+    def test_evicted_instance_in_use(self):
+        """An evicted instance still in use keeps its identity and its
+        changes"""
+        storage = self.fresh()
+        city = storage.get(City, self.city.id)
+        storage.get(State, self.state.id)
+        storage.get(Place, self.place.id)
+        self.assertIs(storage.get(City, self.city.id), city)
+        storage.get(State, self.state.id)
+        storage.get(Place, self.place.id)
+        city.name = "Abuja"
+        storage.save()
+        self.assertEqual(self.fresh().get(City, self.city.id).name, "Abuja")
+
+
+if __name__ == '__main__':
+    unittest.main()
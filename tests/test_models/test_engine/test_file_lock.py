@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+""" Unittest for FileStorage shared by several processes """
+
+import unittest
+from unittest.mock import patch
+import builtins
+import os
+import subprocess
+import sys
+from models.place import Place
+from models.state import State
+from models.user import User
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(models.__file__)))
+
+# creates <count> users named <name>-<i>, one save each, then destroys the
+# first third of them
+WRITER = """
+import sys
+from models.user import User
+import models
+count, name = int(sys.argv[1]), sys.argv[2]
+users = []
+for i in range(count):
+    user = User()
+    user.first_name = "{}-{}".format(name, i)
+    user.save()
+    users.append(user)
+for user in users[:count // 3]:
+    models.storage.delete(user)
+    models.storage.save()
+"""
+
+
+class TestFileLock(StorageTestCase):
+    """Test class for the locking and merging of FileStorage saves"""
+
+    def setUp(self):
+        """SetUp method: storage on an empty temporary file"""
+        super().setUp()
+        self.env = dict(os.environ, PYTHONPATH=ROOT)
+        for name in ("HBNB_TYPE_STORAGE", "HBNB_STORAGE_JOURNAL",
+                     "HBNB_STORAGE_WRITE_BEHIND"):
+            self.env.pop(name, None)
+
+    def run_process(self, code, *args):
+        """runs code in another Python process sharing the storage file"""
+        subprocess.run([sys.executable, "-c", code] + list(args),
+                       cwd=self.tmp.name, env=self.env, check=True)
+
+    def reloaded(self):
+        """returns the objects found by a fresh reload"""
+        self.reset()
+        self.storage.reload()
+        return self.storage.all()
+
+    def stress(self, writers=4, count=30):
+        """runs concurrent writer processes and checks that the store
+        holds exactly what they left"""
+        processes = [subprocess.Popen(
+            [sys.executable, "-c", WRITER, str(count), "w{}".format(n)],
+            cwd=self.tmp.name, env=self.env) for n in range(writers)]
+        for process in processes:
+            self.assertEqual(process.wait(), 0)
+        names = sorted(obj.first_name for obj in self.reloaded().values())
+        expected = sorted("w{}-{}".format(n, i) for n in range(writers)
+                          for i in range(count // 3, count))
+        self.assertEqual(names, expected)
+
+    def test_read_only_directory(self):
+        """A reload only opens the lock file to read, and locks nothing
+        when it cannot create it"""
+        User().save()
+        modes = []
+
+        def read_only(path, mode="r", *args, **kwargs):
+            if path == self.path + ".lock":
+                modes.append(mode)
+                if mode != "r":
+                    raise PermissionError(13, "Permission denied", path)
+            return builtins.open(path, mode, *args, **kwargs)
+        with patch("models.engine.file_storage.open", read_only,
+                   create=True):
+            self.assertEqual(len(self.reloaded()), 1)
+            os.remove(self.path + ".lock")
+            self.assertEqual(len(self.reloaded()), 1)
+        self.assertEqual(modes, ["r", "r", "a+"])
+
+    def test_concurrent_writers(self):
+        """No save of concurrent processes is lost"""
+        self.stress()
+
+    def test_concurrent_writers_journal(self):
+        """No save is lost in journaled mode, compactions included"""
+        self.env["HBNB_STORAGE_JOURNAL"] = "1"
+        self.env["HBNB_JOURNAL_MAX_BYTES"] = "2000"
+        self.stress()
+
+    def test_merge_before_save(self):
+        """A save keeps what another process saved in the meantime"""
+        user = User()
+        user.save()
+        self.run_process(
+            "import models\n"
+            "from models.place import Place\n"
+            "user = models.storage.get('User', '{}')\n"
+            "user.first_name = 'Betty'\n"
+            "place = Place()\n"
+            "place.name = 'Loft'\n"
+            "place.save()\n"
+            "user.save()\n".format(user.id))
+        state = State()
+        state.save()
+        self.assertEqual(self.storage.get(User, user.id).first_name,
+                         "Betty")
+        objects = self.reloaded()
+        self.assertEqual(objects["User." + user.id].first_name, "Betty")
+        self.assertIn("State." + state.id, objects)
+        self.assertEqual([place.name for place in
+                          self.storage.all(Place).values()], ["Loft"])
+
+    def test_local_changes_win(self):
+        """The objects changed here and not saved yet keep their state"""
+        user = User()
+        user.save()
+        self.run_process(
+            "import models\n"
+            "user = models.storage.get('User', '{}')\n"
+            "user.first_name = 'Other'\n"
+            "user.save()\n".format(user.id))
+        user.first_name = "Local"
+        self.storage.save()
+        self.assertIs(self.storage.get(User, user.id), user)
+        self.assertEqual(self.reloaded()["User." + user.id].first_name,
+                         "Local")
+
+    def test_refresh(self):
+        """refresh() loads the creations and destructions of others"""
+        user = User()
+        kept = State()
+        self.storage.save()
+        self.assertFalse(self.storage.refresh())
+        self.run_process(
+            "import models\n"
+            "from models.place import Place\n"
+            "models.storage.delete(models.storage.get('User', '{}'))\n"
+            "place = Place()\n"
+            "place.name = 'Loft'\n"
+            "place.save()\n".format(user.id))
+        self.assertTrue(self.storage.refresh())
+        self.assertFalse(self.storage.refresh())
+        self.assertIsNone(self.storage.get(User, user.id))
+        self.assertIs(self.storage.get(State, kept.id), kept)
+        self.assertEqual(self.storage.count(Place), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
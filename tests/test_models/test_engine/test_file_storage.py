@@ -5,6 +5,9 @@ import unittest
 import json
 import pep8
 import os
+import subprocess
+import sys
+from unittest.mock import patch
 from models.base_model import BaseModel
 from models.amenity import Amenity
 from models.city import City
@@ -14,6 +17,7 @@ from models.review import Review
 from models.user import User
 from models.engine.file_storage import FileStorage
 import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
 classes = {"BaseModel": BaseModel}
 
 
@@ -153,3 +157,158 @@ class TestFileStorage(unittest.TestCase):
         result = pep8style.check_files([
             '/tests/test_models/test_engine/test_file_storageconsole.py'])
         self.assertEqual(result.total_errors, 1)
+
+
+class TestFileStorageDirty(StorageTestCase):
+    """Test class for the dirty tracking of FileStorage"""
+
+    def setUp(self):
+        """SetUp method: storage on an empty temporary file"""
+        super().setUp()
+        FileStorage._FileStorage__cache = True
+        self.user = User()
+        self.state = State()
+        models.storage.save()
+
+    def test_save_clears_dirty(self):
+        """save() leaves no dirty key behind and caches every object"""
+        self.assertEqual(FileStorage._FileStorage__dirty, {})
+        self.assertEqual(len(FileStorage._FileStorage__serialized), 2)
+
+    def test_setattr_marks_dirty(self):
+        """Setting an attribute on a stored object flags its key"""
+        self.user.first_name = "Betty"
+        self.assertEqual(list(FileStorage._FileStorage__dirty),
+                         ["User." + self.user.id])
+        self.assertNotIn("User." + self.user.id,
+                         FileStorage._FileStorage__serialized)
+
+    def test_unstored_object_not_dirty(self):
+        """An object rebuilt from a dict is not the stored instance"""
+        copy = User(**self.user.to_dict())
+        copy.first_name = "Betty"
+        self.assertEqual(FileStorage._FileStorage__dirty, {})
+
+    def test_only_dirty_objects_serialized(self):
+        """Clean objects are written from the cache, not to_dict()"""
+        calls = []
+        to_dict = State.to_dict
+
+        def counting_to_dict(obj):
+            calls.append(obj)
+            return to_dict(obj)
+        State.to_dict = counting_to_dict
+        try:
+            self.user.first_name = "Betty"
+            models.storage.save()
+        finally:
+            State.to_dict = to_dict
+        self.assertEqual(calls, [])
+        with open(self.path) as f:
+            data = json.load(f)
+        self.assertEqual(data["User." + self.user.id]["first_name"],
+                         "Betty")
+        self.assertIn("State." + self.state.id, data)
+
+    def test_delete_marks_dirty(self):
+        """delete() removes the object and flags its key"""
+        models.storage.delete(self.state)
+        self.assertIsNone(
+            FileStorage._FileStorage__dirty["State." + self.state.id])
+        models.storage.save()
+        with open(self.path) as f:
+            self.assertNotIn("State." + self.state.id, json.load(f))
+
+
+class TestFileStorageClassIndex(StorageTestCase):
+    """Test class for the per-class index of FileStorage"""
+
+    def setUp(self):
+        """SetUp method: empty storage"""
+        super().setUp()
+        self.users = [User(), User()]
+        self.city = City()
+
+    def test_all_cls(self):
+        """all(cls) only returns the objects of cls"""
+        expected = {"User." + u.id: u for u in self.users}
+        self.assertEqual(models.storage.all(User), expected)
+        self.assertEqual(models.storage.all("User"), expected)
+        self.assertEqual(models.storage.all("Review"), {})
+        self.assertEqual(len(models.storage.all()), 3)
+
+    def test_count(self):
+        """count() with and without a class"""
+        self.assertEqual(models.storage.count(), 3)
+        self.assertEqual(models.storage.count(User), 2)
+        self.assertEqual(models.storage.count("City"), 1)
+        self.assertEqual(models.storage.count("Place"), 0)
+
+    def test_delete_updates_index(self):
+        """delete() removes the object from its class index"""
+        models.storage.delete(self.users[0])
+        self.assertEqual(models.storage.count(User), 1)
+        self.assertNotIn("User." + self.users[0].id,
+                         models.storage.all(User))
+
+    def test_reload_builds_index(self):
+        """reload() fills the index from the file"""
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        models.storage.reload()
+        self.assertEqual(models.storage.count(User), 2)
+        self.assertEqual(list(models.storage.all(City)),
+                         ["City." + self.city.id])
+
+
+class TestFileStorageBatch(StorageTestCase):
+    """Test class for the begin()/commit() batches of FileStorage"""
+
+    def test_saved_once(self):
+        """The saves of nested batches are written by the last commit"""
+        with patch.object(models.storage, "_FileStorage__persist") as write:
+            models.storage.begin()
+            User().save()
+            with models.storage.batch():
+                State().save()
+            User().save()
+            write.assert_not_called()
+            self.assertTrue(models.storage.commit())
+            write.assert_called_once_with()
+        self.assertFalse(models.storage.commit())
+
+    def test_no_save_no_write(self):
+        """A batch without save() writes nothing"""
+        with models.storage.batch():
+            User()
+        self.assertFalse(os.path.exists(self.path))
+        with models.storage.batch():
+            models.storage.save()
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 1)
+
+
+class TestFileStorageFirstUse(StorageTestCase):
+    """Test class for the creation of models.storage on first use"""
+
+    def test_incomplete_entries(self):
+        """The entries without an id or timestamps get them at reload"""
+        with open(self.path, mode="w", encoding="utf-8") as file:
+            json.dump({"User.1": {"id": "1", "__class__": "User",
+                                  "updated_at": "2020-01-01T00:00:00"},
+                       "State.2": {"__class__": "State",
+                                   "name": "Texas"}}, file)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(
+            models.__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        for name in ("HBNB_TYPE_STORAGE", "HBNB_STORAGE_JOURNAL",
+                     "HBNB_STORAGE_WRITE_BEHIND"):
+            env.pop(name, None)
+        out = subprocess.run(
+            [sys.executable, "-c", "import models; "
+             "print(sorted(type(obj).__name__ for obj in "
+             "models.storage.all().values()))"],
+            cwd=self.tmp.name, env=env, check=True, capture_output=True,
+            text=True).stdout
+        self.assertEqual(out, "['State', 'User']\n")
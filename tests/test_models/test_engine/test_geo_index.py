@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+""" Unittest for the grid index of the coordinates of the places """
+
+import unittest
+import random
+from models.place import Place
+from models.engine.file_storage import FileStorage
+from models.engine.geo_index import GeoIndex, haversine, in_box
+from models.engine.storage_engine import StorageEngine
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Test class for GeoIndex, against a scan of the points"""
+
+    def setUp(self):
+        """SetUp method: 2000 random points in a grid of 1 degree"""
+        rand = random.Random(14)
+        self.index = GeoIndex(cell_size=1.0)
+        self.points = {}
+        for i in range(2000):
+            point = (rand.uniform(-90, 90), rand.uniform(-180, 180))
+            self.points[str(i)] = point
+            self.index.add(str(i), {"latitude": point[0],
+                                    "longitude": point[1]})
+        self.rand = rand
+
+    def by_distance(self, lat, lon):
+        """returns the (distance, key) of all the points, nearest first"""
+        return sorted((haversine(lat, lon, *point), key)
+                      for key, point in self.points.items())
+
+    def test_haversine(self):
+        """Distances are great-circle kilometers"""
+        self.assertAlmostEqual(haversine(48.8566, 2.3522, 51.5074, -0.1278),
+                               343.5, delta=0.5)
+        self.assertAlmostEqual(haversine(0, 179.5, 0, -179.5), 111.2,
+                               delta=0.1)
+
+    def test_near(self):
+        """near() finds the points within the radius, nearest first"""
+        for km in (50, 800, 5000, 30000):
+            lat = self.rand.uniform(-90, 90)
+            lon = self.rand.uniform(-180, 180)
+            expected = [(d, key) for d, key in self.by_distance(lat, lon)
+                        if d <= km]
+            self.assertEqual(self.index.near(lat, lon, km), expected)
+
+    def test_near_pole_and_antimeridian(self):
+        """The search wraps around the antimeridian and the poles"""
+        for lat, lon in ((89.5, 0), (-89.9, 120), (10, 179.9), (-5, -180)):
+            expected = [(d, key) for d, key in self.by_distance(lat, lon)
+                        if d <= 1500]
+            self.assertEqual(self.index.near(lat, lon, 1500), expected)
+
+    def test_nearest(self):
+        """nearest() returns the k nearest points"""
+        for k in (1, 10, 2500):
+            lat = self.rand.uniform(-90, 90)
+            lon = self.rand.uniform(-180, 180)
+            self.assertEqual(self.index.nearest(lat, lon, k),
+                             self.by_distance(lat, lon)[:k])
+        self.assertEqual(self.index.nearest(0, 0, 0), [])
+
+    def test_within(self):
+        """within() finds the points in the box, across the antimeridian"""
+        for box in ((-10, -20, 30, 40), (-60, 170, 60, -170),
+                    (-90, -180, 90, 180)):
+            expected = sorted(key for key, point in self.points.items()
+                              if in_box(*point, *box))
+            found = self.index.within(*box)
+            self.assertEqual(sorted(found), expected)
+            self.assertEqual(len(found), len(set(found)))
+
+    def test_move_and_remove(self):
+        """Moved and removed points are reindexed"""
+        self.index.add("0", {"latitude": 1.5, "longitude": 1.5})
+        self.index.remove("1")
+        self.index.remove("1")
+        self.index.add("2", {"latitude": "north", "longitude": 0})
+        self.index.add("3", {"max_guest": 2})
+        self.assertEqual(len(self.index), 1997)
+        self.assertEqual(self.index.nearest(1.5, 1.5, 1), [(0.0, "0")])
+        self.assertEqual(self.index.within(-90, -180, 90, 180).count("1"),
+                         0)
+
+
+class TestFileStorageGeo(StorageTestCase):
+    """Test class for the geographic searches of FileStorage"""
+
+    def setUp(self):
+        """SetUp method: an empty storage and three places"""
+        super().setUp()
+        self.places = []
+        for lat, lon in ((48.8606, 2.3376), (48.8600, 2.3266),
+                         (51.5007, -0.1246)):
+            place = Place()
+            place.latitude = lat
+            place.longitude = lon
+            self.places.append(place)
+
+    def keys(self, places):
+        """returns the keys of places, in order"""
+        return ["Place." + place.id for place in places]
+
+    def test_searches(self):
+        """The index answers like the scan of StorageEngine"""
+        storage = models.storage
+        self.assertEqual(list(storage.near(48.86, 2.33, 2)),
+                         self.keys(self.places[1::-1]))
+        self.assertEqual(list(storage.nearest(51.5, 0, 2)),
+                         self.keys([self.places[2], self.places[1]]))
+        self.assertEqual(list(storage.within(48, 2, 49, 3)),
+                         self.keys(self.places[:2]))
+        for name, args in (("near", (48.86, 2.33, 400)),
+                           ("nearest", (50, 1, 3)),
+                           ("within", (40, -1, 52, 2.33))):
+            self.assertEqual(
+                list(getattr(storage, name)(*args)),
+                list(getattr(StorageEngine, name)(storage, *args)))
+
+    def test_mutations(self):
+        """Moved and destroyed places are followed"""
+        self.places[2].latitude = 48.86
+        self.places[2].longitude = 2.34
+        models.storage.delete(self.places[0])
+        self.assertEqual(list(models.storage.near(48.86, 2.33, 2)),
+                         self.keys([self.places[1], self.places[2]]))
+
+    def test_no_coordinates(self):
+        """A place never given coordinates is not at (0, 0)"""
+        Place()
+        located = Place()
+        located.latitude = 0.0
+        located.longitude = 0.0
+        self.assertEqual(list(models.storage.near(0, 0, 1)),
+                         self.keys([located]))
+        self.assertEqual(list(StorageEngine.near(models.storage, 0, 0, 1)),
+                         self.keys([located]))
+
+    def test_built_on_first_search(self):
+        """A reload leaves the grid to the first search"""
+        models.storage.save()
+        self.reset()
+        models.storage.reload()
+        self.assertIsNone(FileStorage._FileStorage__geo)
+        self.assertEqual(list(models.storage.within(48, 2, 49, 3)),
+                         self.keys(self.places[:2]))
+        self.assertEqual(len(FileStorage._FileStorage__geo), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+""" Unittest for the journaled mode of FileStorage """
+
+import unittest
+from unittest.mock import patch
+import json
+import os
+from models.base_model import BaseModel
+from models.user import User
+from models.engine import journal
+from models.engine.file_storage import FileStorage
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestJournal(StorageTestCase):
+    """Test class for the FileStorage journal"""
+
+    def setUp(self):
+        """SetUp method: journaled storage on an empty temporary file"""
+        super().setUp()
+        FileStorage._FileStorage__journal = True
+
+    def reloaded(self):
+        """returns the keys found by a fresh reload"""
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        return self.storage.all()
+
+    def test_save_appends_only_changes(self):
+        """Each save appends one record per changed object"""
+        user = User()
+        user.save()
+        BaseModel().save()
+        with open(self.path + ".log") as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 2)
+        self.assertFalse(os.path.exists(self.path))
+        user.first_name = "Betty"
+        user.save()
+        with open(self.path + ".log") as f:
+            record = json.loads(f.readlines()[-1])
+        self.assertEqual(record["op"], "set")
+        self.assertEqual(record["value"]["first_name"], "Betty")
+
+    def test_reload_replays_journal(self):
+        """reload() replays creates, updates and destroys"""
+        user = User()
+        user.save()
+        gone = BaseModel()
+        gone.save()
+        user.first_name = "Betty"
+        user.save()
+        self.storage.delete(gone)
+        self.storage.save()
+        objects = self.reloaded()
+        self.assertEqual(list(objects), ["User." + user.id])
+        self.assertEqual(objects["User." + user.id].first_name, "Betty")
+
+    def test_torn_record_is_ignored(self):
+        """A half written last record does not break reload()"""
+        user = User()
+        user.save()
+        with open(self.path + ".log", "a") as f:
+            f.write('{"op": "set", "key": "User.x", "val')
+        self.assertIn("User." + user.id, self.reloaded())
+
+    def test_append_after_torn_record(self):
+        """The saves journaled after a torn record are not lost"""
+        user = User()
+        user.save()
+        with open(self.path + ".log", "a") as f:
+            f.write('{"op": "set", "key": "User.x", "val')
+        other = User()
+        other.save()
+        user.first_name = "Betty"
+        user.save()
+        objects = self.reloaded()
+        self.assertEqual(sorted(objects), sorted(["User." + user.id,
+                                                  "User." + other.id]))
+        self.assertEqual(objects["User." + user.id].first_name, "Betty")
+
+    def test_damaged_record_raises(self):
+        """A damaged line before the last one is not skipped"""
+        User().save()
+        User().save()
+        with open(self.path + ".log") as f:
+            lines = f.readlines()
+        with open(self.path + ".log", "w") as f:
+            f.write(lines[0][:10] + "\n" + lines[1])
+        with self.assertRaises(journal.JournalError):
+            self.reloaded()
+
+    def test_failed_append_keeps_changes(self):
+        """The changes a failed append did not write are kept for the
+        next save"""
+        user = User()
+        with patch.object(journal, "append", side_effect=OSError):
+            with self.assertRaises(OSError):
+                user.save()
+        self.storage.save()
+        self.assertIn("User." + user.id, self.reloaded())
+
+    def test_compaction(self):
+        """The journal is folded into file.json past the threshold"""
+        FileStorage._FileStorage__journal_max_bytes = 1
+        users = [User() for i in range(3)]
+        self.storage.save()
+        self.storage.wait_compaction()
+        self.assertFalse(os.path.exists(self.path + ".log"))
+        self.assertFalse(os.path.exists(self.path + ".log.compacting"))
+        with open(self.path) as f:
+            self.assertEqual(len(json.load(f)), 3)
+        self.assertEqual(len(self.reloaded()), 3)
+
+    def test_full_save_drops_journal(self):
+        """A full save supersedes the journal"""
+        User().save()
+        FileStorage._FileStorage__journal = False
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path + ".log"))
+        self.assertEqual(len(self.reloaded()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
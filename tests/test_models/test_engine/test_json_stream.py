@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+""" Unittest for the streaming JSON reader and writer """
+
+import unittest
+import io
+import json
+from models.engine import json_stream
+
+
+class TestJsonStream(unittest.TestCase):
+    """Test class for iter_items and write_items"""
+
+    def setUp(self):
+        """SetUp method: a JSON object with awkward values"""
+        self.data = {
+            "User.1": {"id": "1", "name": "a \"quoted\" }, {\"key\": 1"},
+            "Place.2": {"id": "2", "amenity_ids": ["x", "y"],
+                        "latitude": 43.6, "max_guest": 12345678},
+            "Review.3": {"id": "3", "text": "\u00e9t\u00e9 \n"},
+        }
+
+    def read(self, text, chunk_size):
+        """returns the items read from text chunk_size characters at
+        a time"""
+        return list(json_stream.iter_items(io.StringIO(text), chunk_size))
+
+    def test_round_trip(self):
+        """write_items() output is read back by iter_items()"""
+        out = io.StringIO()
+        json_stream.write_items(out, ("{}: {}".format(json.dumps(k),
+                                                      json.dumps(v))
+                                      for k, v in self.data.items()))
+        self.assertEqual(json.loads(out.getvalue()), self.data)
+        self.assertEqual(out.getvalue(), json.dumps(self.data))
+        for chunk_size in (1, 2, 7, 64, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.read(out.getvalue(), chunk_size),
+                                 list(self.data.items()))
+
+    def test_json_dump_output(self):
+        """A file written by json.dump with indentation is read"""
+        text = json.dumps(self.data, indent=4)
+        self.assertEqual(dict(self.read(text, 3)), self.data)
+
+    def test_empty(self):
+        """An empty object yields nothing"""
+        self.assertEqual(self.read(" { } ", 1), [])
+
+    def test_truncated(self):
+        """A truncated file raises a JSONDecodeError"""
+        text = json.dumps(self.data)[:-10]
+        with self.assertRaises(json.JSONDecodeError):
+            self.read(text, 8)
+        with self.assertRaises(json.JSONDecodeError):
+            self.read("", 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
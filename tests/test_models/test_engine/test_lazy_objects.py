@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+""" Unittest for the lazy reload mode of FileStorage """
+
+import unittest
+from unittest.mock import patch
+import json
+import threading
+import time
+from models.city import City
+from models.user import User
+from models.engine.lazy_objects import LazyObjects
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestLazyObjects(StorageTestCase):
+    """Test class for LazyObjects and the lazy mode of FileStorage"""
+
+    def setUp(self):
+        """SetUp method: saves two objects and reloads them lazily"""
+        super().setUp()
+        self.user = User()
+        self.user.first_name = "Betty"
+        self.city = City()
+        self.city.state_id = "state"
+        models.storage.save()
+        self.reset()
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        self.objects = models.storage.all()
+        self.user_key = "User." + self.user.id
+        self.city_key = "City." + self.city.id
+
+    def test_nothing_built_on_reload(self):
+        """reload() keeps the dictionaries as they are"""
+        self.assertIsInstance(self.objects, LazyObjects)
+        self.assertFalse(self.objects.is_loaded(self.user_key))
+        self.assertFalse(self.objects.is_loaded(self.city_key))
+        self.assertEqual(models.storage.count(), 2)
+
+    def test_built_on_access(self):
+        """An instance is built once, on first access"""
+        user = self.objects[self.user_key]
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.first_name, "Betty")
+        self.assertTrue(self.objects.is_loaded(self.user_key))
+        self.assertFalse(self.objects.is_loaded(self.city_key))
+        self.assertIs(self.objects.get(self.user_key), user)
+
+    def test_all_cls(self):
+        """all(cls) only builds the instances of cls"""
+        cities = models.storage.all(City)
+        self.assertIsInstance(cities[self.city_key], City)
+        self.assertFalse(self.objects.is_loaded(self.user_key))
+
+    def test_lookup(self):
+        """The attribute indexes are built without building instances"""
+        found = models.storage.lookup(City, "state_id", "state")
+        self.assertEqual(list(found), [self.city_key])
+        self.assertFalse(self.objects.is_loaded(self.user_key))
+
+    def test_values(self):
+        """values() and items() build every instance"""
+        self.assertEqual({type(o) for o in self.objects.values()},
+                         {User, City})
+        self.assertTrue(all(isinstance(o, (User, City))
+                            for k, o in self.objects.items()))
+
+    def test_save_unbuilt(self):
+        """save() writes unbuilt entries without building them"""
+        self.objects[self.city_key].name = "Lagos"
+        models.storage.save()
+        self.assertFalse(self.objects.is_loaded(self.user_key))
+        with open(self.path) as f:
+            data = json.load(f)
+        self.assertEqual(data[self.user_key]["first_name"], "Betty")
+        self.assertEqual(data[self.city_key]["name"], "Lagos")
+
+    def test_delete(self):
+        """delete() of a built instance"""
+        models.storage.delete(self.objects[self.user_key])
+        self.assertNotIn(self.user_key, self.objects)
+        self.assertEqual(models.storage.count(User), 0)
+
+    def test_threads_build_once(self):
+        """Two threads reading the same entry get the same instance"""
+        load = User._load
+        found = []
+
+        def slow_load(obj, attributes):
+            time.sleep(0.05)
+            load(obj, attributes)
+
+        def read():
+            found.append(models.storage.get(User, self.user.id))
+
+        with patch.object(User, "_load", slow_load):
+            threads = [threading.Thread(target=read) for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(found), 2)
+        self.assertIs(found[0], found[1])
+        self.assertIs(self.objects[self.user_key], found[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
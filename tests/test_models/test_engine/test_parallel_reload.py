@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+""" Unittest for the parallel reload of FileStorage """
+
+import unittest
+from unittest.mock import patch
+import multiprocessing
+import os
+from models.place import Place
+from models.user import User
+from models.engine import json_stream
+from models.engine import parallel_reload
+from models.engine.file_storage import FileStorage
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(),
+                     "fork is not available")
+class TestParallelReload(StorageTestCase):
+    """Test class for parallel_reload and HBNB_STORAGE_WORKERS"""
+
+    def setUp(self):
+        """SetUp method: storage reloaded by 3 processes in a temporary
+        directory, whatever the size of the snapshot"""
+        super().setUp()
+        FileStorage._FileStorage__workers = 3
+        self.min_bytes = patch.object(parallel_reload, "MIN_BYTES", 0)
+        self.min_bytes.start()
+        self.users = [User() for i in range(20)]
+        for i, user in enumerate(self.users):
+            user.first_name = "user {}".format(i)
+        self.place = Place()
+        self.place.latitude = 43.6
+
+    def tearDown(self):
+        """stops the patch of MIN_BYTES"""
+        self.min_bytes.stop()
+        super().tearDown()
+
+    def check_reload(self):
+        """a reload by the processes finds the objects as they were
+        saved"""
+        expected = {key: obj.to_dict()
+                    for key, obj in self.storage.all().items()}
+        self.reset()
+        with patch.object(FileStorage, "_FileStorage__load_snapshot",
+                          side_effect=AssertionError("sequential reload")):
+            self.storage.reload()
+        self.assertEqual({key: obj.to_dict() for key, obj in
+                          self.storage.all().items()}, expected)
+        self.assertEqual(len(self.storage.near(43.6, 0, 1)), 1)
+
+    def test_spans(self):
+        """An indexed snapshot is cut into one range per process"""
+        self.storage.save()
+        spans = parallel_reload.spans(self.path, json_stream, 3)
+        self.assertEqual([count for start, end, count in spans], [7, 7, 7])
+        self.assertEqual(spans[0][1] + 2, spans[1][0])
+        os.remove(self.path + ".idx")
+        self.assertEqual(parallel_reload.spans(self.path, json_stream, 3),
+                         [(None, None, None)])
+
+    def test_reload_json(self):
+        """Parallel reload of a JSON snapshot, with and without index"""
+        self.storage.save()
+        self.check_reload()
+        os.remove(self.path + ".idx")
+        self.check_reload()
+
+    def test_reload_binary(self):
+        """Parallel reload of a binary snapshot"""
+        FileStorage._FileStorage__format = "binary"
+        self.storage.save()
+        self.check_reload()
+
+    def test_damaged(self):
+        """A snapshot the processes cannot read raises like a sequential
+        reload"""
+        self.storage.save()
+        with open(self.path, mode="w", encoding="utf-8") as file:
+            file.write('{"User.1": {')
+        self.reset()
+        with self.assertRaises(ValueError):
+            self.storage.reload()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+""" Unittest for the NumPy columns of the places """
+
+import unittest
+from models.place import Place
+from models.user import User
+from models.engine import place_columns
+from models.engine.place_columns import PlaceColumns
+from models.engine.file_storage import FileStorage
+from models.engine.storage_engine import matches
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+@unittest.skipIf(place_columns.numpy is None, "NumPy is not installed")
+class TestPlaceColumns(unittest.TestCase):
+    """Test class for PlaceColumns"""
+
+    def setUp(self):
+        """SetUp method: three places in the columns"""
+        self.columns = PlaceColumns(capacity=2)
+        for i, price in enumerate((50, 120, 80)):
+            self.columns.add("Place.{}".format(i),
+                             {"price_by_night": price, "max_guest": i})
+
+    def test_select(self):
+        """Rows meeting every condition are selected"""
+        self.assertEqual(
+            self.columns.select([("price_by_night", ">=", 50),
+                                 ("price_by_night", "<=", 100)]),
+            ["Place.0", "Place.2"])
+        self.assertEqual(
+            self.columns.select([("price_by_night", "<", 100),
+                                 ("max_guest", ">", 0)]), ["Place.2"])
+        self.assertEqual(len(self.columns), 3)
+
+    def test_remove(self):
+        """The last row fills the removed one"""
+        self.columns.remove("Place.0")
+        self.columns.remove("Place.0")
+        self.assertEqual(len(self.columns), 2)
+        self.assertEqual(self.columns.select([("max_guest", ">=", 0)]),
+                         ["Place.2", "Place.1"])
+
+    def test_update(self):
+        """An updated attribute is mirrored"""
+        place = Place()
+        place.price_by_night = 300
+        self.columns.add("Place.x", place)
+        place.price_by_night = 20
+        self.columns.update("Place.x", place, "price_by_night")
+        self.assertIn("Place.x", self.columns.select(
+            [("price_by_night", "<", 30)]))
+
+    def test_not_a_number(self):
+        """A value that is not a number is in no range"""
+        self.columns.add("Place.s", {"price_by_night": "cheap"})
+        self.assertNotIn("Place.s", self.columns.select(
+            [("price_by_night", ">=", 0)]))
+        self.columns.add("Place.d", {})
+        self.assertIn("Place.d", self.columns.select(
+            [("price_by_night", "==", 0)]))
+
+    def test_exact(self):
+        """Bools and inexact ints are not held by the columns"""
+        self.assertTrue(self.columns.exact("max_guest"))
+        self.columns.add("Place.b", {"max_guest": True})
+        self.assertFalse(self.columns.exact("max_guest"))
+        self.columns.add("Place.b", {"max_guest": 2})
+        self.assertTrue(self.columns.exact("max_guest"))
+        self.columns.add("Place.i", {"price_by_night": 2 ** 53 + 1})
+        self.assertFalse(self.columns.exact("price_by_night"))
+        self.columns.remove("Place.i")
+        self.assertTrue(self.columns.exact("price_by_night"))
+        self.columns.add("Place.o", {"latitude": 10 ** 400})
+        self.assertFalse(self.columns.exact("latitude"))
+        self.assertTrue(place_columns.is_number(2 ** 60))
+        self.assertFalse(place_columns.is_number(2 ** 53 + 1))
+        self.assertFalse(place_columns.is_number(False))
+
+
+class TestFileStorageSelect(StorageTestCase):
+    """Test class for FileStorage.select"""
+
+    def setUp(self):
+        """SetUp method: an empty storage"""
+        super().setUp()
+        self.places = []
+        for price, guests in ((50, 2), (90, 4), (150, 4)):
+            place = Place()
+            place.price_by_night = price
+            place.max_guest = guests
+            self.places.append(place)
+
+    def keys(self, places):
+        """returns the keys of places"""
+        return {"Place." + place.id for place in places}
+
+    def test_select(self):
+        """select() returns the places meeting every condition"""
+        conditions = [("price_by_night", ">=", 50),
+                      ("price_by_night", "<=", 100),
+                      ("max_guest", ">=", 3)]
+        found = models.storage.select(Place, conditions)
+        self.assertEqual(set(found), self.keys(self.places[1:2]))
+        self.assertEqual(found, {
+            key: obj for key, obj in models.storage.all(Place).items()
+            if matches(obj, conditions)})
+
+    def test_mutations(self):
+        """select() follows updates and deletions"""
+        self.places[0].max_guest = 6
+        models.storage.delete(self.places[1])
+        found = models.storage.select("Place", [("max_guest", ">", 3)])
+        self.assertEqual(set(found), self.keys([self.places[0],
+                                                self.places[2]]))
+
+    def test_other_conditions(self):
+        """Conditions on other attributes are checked on the objects"""
+        self.places[2].name = "Loft"
+        found = models.storage.select(Place, [("price_by_night", ">", 60),
+                                              ("name", "==", "Loft")])
+        self.assertEqual(set(found), self.keys(self.places[2:]))
+        user = User()
+        user.first_name = "Betty"
+        self.assertEqual(list(models.storage.select(
+            User, [("first_name", "!=", "Bob")])), ["User." + user.id])
+        self.assertEqual(models.storage.select(
+            User, [("first_name", "<", 3)]), {})
+
+    def test_inexact_values(self):
+        """Bools and large ints compare as they do on the objects"""
+        self.places[0].max_guest = True
+        self.places[1].price_by_night = 2 ** 53 + 1
+        for conditions in ([("max_guest", "==", 1)],
+                           [("max_guest", "<", 3)],
+                           [("price_by_night", ">", 2 ** 53)],
+                           [("price_by_night", "<", 2 ** 53 + 1)],
+                           [("price_by_night", "<", 2 ** 53 + 2)]):
+            found = models.storage.select(Place, conditions)
+            self.assertEqual(found, {
+                key: obj for key, obj in models.storage.all(Place).items()
+                if matches(obj, conditions)}, conditions)
+
+    def test_built_on_first_select(self):
+        """A reload leaves the columns to the first numeric filter"""
+        models.storage.save()
+        self.reset()
+        models.storage.reload()
+        self.assertIsNone(FileStorage._FileStorage__columns)
+        found = models.storage.select(Place, [("max_guest", ">", 3)])
+        self.assertEqual(set(found), self.keys(self.places[1:]))
+        if place_columns.numpy is not None:
+            self.assertEqual(len(FileStorage._FileStorage__columns), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+""" Unittest for the filter expressions of models/engine/query.py """
+
+import unittest
+from models.place import Place
+from models.user import User
+from models.engine import place_columns
+from models.engine import query
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestQueryParse(unittest.TestCase):
+    """Test class for query.parse"""
+
+    def test_parse(self):
+        """Conditions, order, limit and count are read"""
+        parsed = query.parse(Place, 'where(price_by_night < 100, '
+                                    'name == "a, b", max_guest>=2.5)'
+                                    '.order_by(-price_by_night, name)'
+                                    '.limit(10)')
+        self.assertIs(parsed.cls, Place)
+        self.assertEqual(parsed.conditions,
+                         [("price_by_night", "<", 100),
+                          ("name", "==", "a, b"), ("max_guest", ">=", 2.5)])
+        self.assertEqual(parsed.order, [("price_by_night", True),
+                                        ("name", False)])
+        self.assertEqual(parsed.limit, 10)
+        self.assertFalse(parsed.count)
+        self.assertTrue(query.parse(Place, "where().count()").count)
+        self.assertEqual(query.parse(Place, "where(id == 'x)')").conditions,
+                         [("id", "==", "x)")])
+
+    def test_parse_errors(self):
+        """Malformed queries raise ValueError"""
+        for text in ("where(price_by_night)", "where(a < 1", "limit(x)",
+                     "order_by(a b)", "drop()", "where(a == 'x)",
+                     "where(a < 1) junk"):
+            with self.assertRaises(ValueError):
+                query.parse(Place, text)
+
+
+class TestQueryRun(StorageTestCase):
+    """Test class for Query.run and Query.explain over FileStorage"""
+
+    def setUp(self):
+        """SetUp method: an empty storage and four places"""
+        super().setUp()
+        self.places = []
+        for city, price, name in (("c1", 80, "b"), ("c1", 120, "a"),
+                                  ("c2", 60, "c"), ("c1", 80, "a")):
+            place = Place()
+            place.city_id = city
+            place.price_by_night = price
+            place.name = name
+            self.places.append(place)
+
+    def run_query(self, text):
+        """returns the places found by the query text"""
+        return list(query.parse(Place, text).run(models.storage).values())
+
+    def test_where(self):
+        """where() keeps the places meeting every condition"""
+        self.assertEqual(self.run_query(
+            'where(city_id == "c1", price_by_night < 100)'),
+            [self.places[0], self.places[3]])
+        self.assertEqual(self.run_query("where(name != 'a')"),
+                         [self.places[0], self.places[2]])
+
+    def test_order_by_limit(self):
+        """order_by() sorts on each attribute in turn, limit() cuts"""
+        p = self.places
+        self.assertEqual(self.run_query("where().order_by(price_by_night, "
+                                        "-name)"), [p[2], p[0], p[3], p[1]])
+        self.assertEqual(self.run_query("where().order_by(-price_by_night)"
+                                        ".limit(2)"), [p[1], p[0]])
+        self.assertEqual(self.run_query("where(city_id == 'c1').limit(1)"),
+                         [p[0]])
+        self.assertEqual(query.parse(Place, "where(price_by_night >= 80)"
+                                     ".count()").run(models.storage), 3)
+
+    def test_explain(self):
+        """The plan uses the smallest index, the columns, or a scan"""
+        lines = query.parse(Place, 'where(price_by_night < 100, '
+                                   'city_id == "c2", user_id == "u")'
+                                   '.limit(3)').explain(models.storage)
+        self.assertEqual(lines, [
+            "plan: index lookup Place.user_id == 'u' (0 objects)",
+            "filter: price_by_night < 100", "filter: city_id == 'c2'",
+            "limit: 3"])
+        lines = query.parse(User, "where(first_name == 'x')"
+                                  ".order_by(-email)").explain(
+                                      models.storage)
+        self.assertEqual(lines, ["plan: scan User (0 objects)",
+                                 "filter: first_name == 'x'",
+                                 "order by: email desc"])
+
+    @unittest.skipIf(place_columns.numpy is None, "NumPy is not installed")
+    def test_explain_columns(self):
+        """Numeric conditions on places use the NumPy columns"""
+        lines = query.parse(Place, "where(price_by_night < 100, "
+                                   "name == 'a')").explain(models.storage)
+        self.assertEqual(lines, [
+            "plan: NumPy columns Place (4 rows): price_by_night < 100",
+            "filter: name == 'a'"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+""" Unittest for the sharded snapshots of FileStorage """
+
+import unittest
+from unittest.mock import patch
+import json
+import os
+from models.place import Place
+from models.review import Review
+from models.user import User
+from models.engine import atomic
+from models.engine import json_stream
+from models.engine import shards
+from models.engine.file_storage import FileStorage
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestShards(StorageTestCase):
+    """Test class for shards and HBNB_STORAGE_SHARDS"""
+
+    def setUp(self):
+        """SetUp method: storage sharded per class in a temporary
+        directory"""
+        super().setUp()
+        self.shard("class")
+        self.users = [User() for i in range(10)]
+        self.place = Place()
+        self.review = Review()
+
+    def shard(self, sharding):
+        """empties the storage and shards it by sharding"""
+        FileStorage._FileStorage__shards = sharding
+        FileStorage._FileStorage__shard_keys = \
+            {} if isinstance(sharding, int) else None
+        self.reset()
+
+    def shard_path(self, shard):
+        """returns the path of the shard named shard"""
+        return shards.shard_path(self.path, shard)
+
+    def keys_in(self, shard):
+        """returns the keys stored in the shard file named shard"""
+        with open(self.shard_path(shard), encoding="utf-8") as file:
+            return sorted(json.load(file))
+
+    def test_parse(self):
+        """HBNB_STORAGE_SHARDS values"""
+        self.assertIsNone(shards.parse(None))
+        self.assertIsNone(shards.parse(""))
+        self.assertEqual(shards.parse("class"), "class")
+        self.assertEqual(shards.parse("8"), 8)
+        with self.assertRaises(ValueError):
+            shards.parse("0")
+        with self.assertRaises(ValueError):
+            shards.parse("table")
+
+    def test_class_shards(self):
+        """One file per class, and a save only rewrites the shards of the
+        changed objects"""
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.keys_in("User"), sorted(
+            "User." + user.id for user in self.users))
+        self.assertEqual(self.keys_in("Review"), ["Review." + self.review.id])
+        inodes = {shard: os.stat(self.shard_path(shard)).st_ino
+                  for shard in ("User", "Place", "Review")}
+        self.review.text = "Great"
+        self.storage.delete(self.place)
+        self.storage.save()
+        self.assertEqual(os.stat(self.shard_path("User")).st_ino,
+                         inodes["User"])
+        self.assertNotEqual(os.stat(self.shard_path("Review")).st_ino,
+                            inodes["Review"])
+        self.assertEqual(self.keys_in("Place"), [])
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(self.storage.count(User), 10)
+        self.assertEqual(self.storage.count(Place), 0)
+        self.assertEqual(self.storage.get(Review, self.review.id).text,
+                         "Great")
+
+    def test_bucket_shards(self):
+        """N files, each key in the bucket of its CRC-32"""
+        self.shard(4)
+        users = [User() for i in range(40)]
+        self.storage.save()
+        found = []
+        for shard in shards.names(4):
+            for key in self.keys_in(shard):
+                self.assertEqual(shards.shard_of(key, 4), shard)
+                found.append(key)
+        self.assertEqual(sorted(found), sorted(
+            "User." + user.id for user in users))
+        users[0].first_name = "Betty"
+        shard = shards.shard_of("User." + users[0].id, 4)
+        inodes = {name: os.stat(self.shard_path(name)).st_ino
+                  for name in shards.names(4)}
+        self.storage.save()
+        for name in shards.names(4):
+            self.assertEqual(os.stat(self.shard_path(name)).st_ino ==
+                             inodes[name], name != shard)
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(self.storage.count(), 40)
+        self.assertEqual(self.storage.get(User, users[0].id).first_name,
+                         "Betty")
+
+    def test_failed_shard_write(self):
+        """The changes of a shard that could not be written are saved by
+        the next save"""
+        self.storage.save()
+        self.review.text = "Great"
+        with patch.object(atomic, "open_atomic", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.storage.save()
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(self.storage.get(Review, self.review.id).text,
+                         "Great")
+
+    def test_refresh_changed_shard(self):
+        """refresh() reads the shards another process rewrote"""
+        self.storage.save()
+        user = self.users[0]
+        changed = user.to_dict()
+        changed["first_name"] = "Other"
+        chunks = []
+        for key, value in shards.read(self.shard_path("User"), json_stream):
+            if key == "User." + user.id:
+                value = changed
+            if key != "User." + self.users[1].id:
+                chunks.append((key, json_stream.encode(key, value)))
+        shards.write(self.shard_path("User"), json_stream, chunks)
+        self.assertTrue(self.storage.refresh())
+        self.assertEqual(self.storage.get(User, user.id).first_name,
+                         "Other")
+        self.assertIsNone(self.storage.get(User, self.users[1].id))
+        self.assertIs(self.storage.get(Review, self.review.id), self.review)
+
+    def test_mapped_class_shards(self):
+        """With shards per class and HBNB_STORAGE_MMAP=1, a query of one
+        class only loads its shard"""
+        FileStorage._FileStorage__mapped = True
+        self.storage.save()
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(len(dict.keys(self.storage.all())), 12)
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(self.storage.count(User), 10)
+        self.assertEqual(len(dict.keys(FileStorage._FileStorage__objects)),
+                         10)
+        self.review = self.storage.get(Review, self.review.id)
+        self.review.text = "Great"
+        self.storage.save()
+        self.assertEqual(len(dict.keys(FileStorage._FileStorage__objects)),
+                         11)
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(self.storage.get(Review, self.review.id).text,
+                         "Great")
+        self.assertEqual(self.storage.count(), 12)
+
+    def test_split_merge(self):
+        """The migration tool splits a snapshot and merges it back"""
+        FileStorage._FileStorage__shards = None
+        self.storage.save()
+        with open(self.path, encoding="utf-8") as file:
+            expected = json.load(file)
+        shards.split(self.path, 3)
+        found = {}
+        for shard in shards.names(3):
+            with open(self.shard_path(shard), encoding="utf-8") as file:
+                found.update(json.load(file))
+        self.assertEqual(found, expected)
+        os.remove(self.path)
+        shards.merge(self.path, 3)
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(json.load(file), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
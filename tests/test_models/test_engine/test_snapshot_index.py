@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+""" Unittest for the offset index of FileStorage snapshots """
+
+import unittest
+import os
+from models.place import Place
+from models.user import User
+from models.engine import binary_snapshot
+from models.engine import json_stream
+from models.engine import snapshot_index
+from models.engine.file_storage import FileStorage
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestSnapshotIndex(StorageTestCase):
+    """Test class for snapshot_index and HBNB_STORAGE_MMAP=1"""
+
+    def setUp(self):
+        """SetUp method: mapped storage in a temporary directory"""
+        super().setUp()
+        FileStorage._FileStorage__mapped = True
+        self.users = [User() for i in range(20)]
+        for i, user in enumerate(self.users):
+            user.first_name = "user {}".format(i)
+        self.place = Place()
+        self.place.latitude = 43.6
+
+    def loaded(self):
+        """returns the number of objects actually in memory"""
+        return len(dict.keys(FileStorage._FileStorage__objects))
+
+    def check_index(self, path, snapshot_format):
+        """the index of a save finds every object of the snapshot"""
+        self.storage.save()
+        index = snapshot_index.open_index(path, snapshot_format)
+        self.assertIsNotNone(index)
+        try:
+            self.assertEqual(len(index), 21)
+            for user in self.users:
+                self.assertEqual(User(**index.get("User." + user.id))
+                                 .to_dict(), user.to_dict())
+            self.assertIsNone(index.get("User.missing"))
+            self.assertIsNone(index.get("User." + "x" * 100))
+            self.assertEqual(sorted(key for key, value in index.items()),
+                             sorted(self.storage.all()))
+        finally:
+            index.close()
+
+    def test_index_json(self):
+        """The index of a JSON snapshot"""
+        self.check_index(self.path, json_stream)
+
+    def test_index_binary(self):
+        """The index of a binary snapshot"""
+        FileStorage._FileStorage__format = "binary"
+        self.check_index(os.path.join(self.tmp.name, "file.bin"),
+                         binary_snapshot)
+
+    def test_stale_index(self):
+        """An index written for another version of the snapshot is not
+        used, and reload() then reads the whole file"""
+        self.storage.save()
+        with open(self.path, mode="a", encoding="utf-8") as file:
+            file.write(" ")
+        self.assertIsNone(snapshot_index.open_index(self.path, json_stream))
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(self.loaded(), 21)
+
+    def test_get_reads_one_object(self):
+        """After reload(), get() reads only the object it is asked for,
+        and anything else loads the rest"""
+        self.storage.save()
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(self.loaded(), 0)
+        user = self.storage.get(User, self.users[3].id)
+        self.assertEqual(user.first_name, "user 3")
+        self.assertIs(self.storage.get(User, self.users[3].id), user)
+        self.assertIsNone(self.storage.get(User, "missing"))
+        self.assertEqual(self.loaded(), 1)
+        self.assertEqual(self.storage.count(User), 20)
+        self.assertEqual(self.loaded(), 21)
+        self.assertIs(self.storage.get(User, self.users[3].id), user)
+        self.assertEqual(len(self.storage.near(43.6, 0, 1)), 1)
+
+    def test_delete_and_save(self):
+        """Deletions and changes of a mapped store are saved, with the
+        objects never read"""
+        self.storage.save()
+        self.reset()
+        self.storage.reload()
+        gone = self.storage.get(User, self.users[0].id)
+        self.storage.delete(gone)
+        self.assertIsNone(self.storage.get(User, self.users[0].id))
+        changed = self.storage.get(User, self.users[1].id)
+        changed.first_name = "Betty"
+        self.storage.save()
+        self.reset()
+        self.storage.reload()
+        self.assertIsNone(self.storage.get(User, self.users[0].id))
+        self.assertEqual(self.storage.get(User, self.users[1].id).first_name,
+                         "Betty")
+        self.assertEqual(self.storage.count(User), 19)
+        self.assertIn("Place." + self.place.id, self.storage.all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+""" Unittest for FileStorage used by several threads """
+
+import unittest
+import threading
+from models.user import User
+from models.engine.file_storage import FileStorage
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestThreads(StorageTestCase):
+    """Test class for the thread safety of FileStorage"""
+
+    def setUp(self):
+        """SetUp method: storage on an empty temporary file"""
+        super().setUp()
+        self.errors = []
+
+    def run_threads(self, *targets):
+        """runs the targets in threads, recording their exceptions"""
+        def guarded(target):
+            try:
+                target()
+            except Exception as error:
+                self.errors.append(error)
+        threads = [threading.Thread(target=guarded, args=(target,))
+                   for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.errors, [])
+
+    def test_stress(self):
+        """Writers, readers and saves run together without errors, and
+        the last save holds every object"""
+        done = threading.Event()
+
+        def writer(name):
+            def write():
+                users = []
+                for i in range(300):
+                    user = User()
+                    user.first_name = "{}-{}".format(name, i)
+                    users.append(user)
+                    if i % 3 == 2:
+                        self.storage.delete(users.pop(0))
+            return write
+
+        def reader():
+            while not done.is_set():
+                for key, obj in self.storage.iterate(User):
+                    self.assertEqual(key, "User." + obj.id)
+                for key, obj in self.storage.iterate():
+                    self.assertEqual(key, "User." + obj.id)
+                self.storage.all(User)
+                self.storage.count(User)
+
+        def saver():
+            while not done.is_set():
+                self.storage.save()
+
+        writers = [writer("w{}".format(n)) for n in range(4)]
+
+        def write_all():
+            try:
+                self.run_threads(*writers)
+            finally:
+                done.set()
+        self.run_threads(write_all, reader, reader, saver)
+        self.storage.save()
+        names = sorted(user.first_name for user in
+                       self.storage.all(User).values())
+        self.assertEqual(len(names), 4 * 200)
+        self.reset()
+        self.storage.reload()
+        self.assertEqual(sorted(user.first_name for user in
+                                self.storage.all(User).values()), names)
+
+    def test_snapshot(self):
+        """A save writes the objects as they were when it started"""
+        FileStorage._FileStorage__cache = True
+        user = User()
+        user.first_name = "Betty"
+        kept = User()
+        self.storage.save()
+        user.first_name = "Holberton"
+        objects, cached, copies = self.storage._FileStorage__snapshot(
+            dirty=FileStorage._FileStorage__dirty)
+        user.first_name = "Ada"
+        kept.first_name = "Ada"
+        key = "User." + user.id
+        self.assertEqual(list(copies), [key])
+        self.assertEqual(user.to_dict(copies[key])["first_name"],
+                         "Holberton")
+        self.assertNotIn("Ada", cached["User." + kept.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+""" Unittest for the write-behind mode of FileStorage """
+
+import unittest
+import json
+import os
+import time
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand
+from models.user import User
+from models.engine import atomic
+from models.engine.file_storage import FileStorage
+import models
+from tests.test_models.test_engine.storage_case import StorageTestCase
+
+
+class TestWriteBehind(StorageTestCase):
+    """Test class for save() in write-behind mode and flush()"""
+
+    def setUp(self):
+        """SetUp method: write-behind storage on a temporary file"""
+        super().setUp()
+        FileStorage._FileStorage__write_behind = 60
+        FileStorage._FileStorage__write_behind_ops = 1000
+
+    def tearDown(self):
+        """flushes before the storage class attributes are restored"""
+        models.storage.flush()
+        super().tearDown()
+
+    def stored(self):
+        """returns the keys in the JSON file"""
+        with open(self.path) as f:
+            return set(json.load(f))
+
+    def wait_for_file(self):
+        """waits (at most 5 seconds) for the flush thread"""
+        for i in range(500):
+            if os.path.exists(self.path):
+                return
+            time.sleep(0.01)
+
+    def test_save_is_deferred(self):
+        """save() does not write until flush()"""
+        user = User()
+        user.save()
+        self.assertFalse(os.path.exists(self.path))
+        models.storage.flush()
+        self.assertEqual(self.stored(), {"User." + user.id})
+
+    def test_flush_after_delay(self):
+        """The flush thread writes after the delay"""
+        FileStorage._FileStorage__write_behind = 0.05
+        user = User()
+        user.save()
+        self.wait_for_file()
+        self.assertEqual(self.stored(), {"User." + user.id})
+
+    def test_flush_after_ops(self):
+        """The flush thread writes once enough saves are pending"""
+        FileStorage._FileStorage__write_behind_ops = 3
+        users = [User() for i in range(3)]
+        for user in users:
+            user.save()
+        self.wait_for_file()
+        self.assertEqual(len(self.stored()), 3)
+
+    def test_reload_flushes(self):
+        """reload() writes the pending saves before reading the file"""
+        user = User()
+        user.save()
+        user.first_name = "Betty"
+        user.save()
+        models.storage.reload()
+        self.assertEqual(self.stored(), {"User." + user.id})
+        self.assertEqual(models.storage.get(User, user.id).first_name,
+                         "Betty")
+
+    def test_failed_flush_keeps_saves(self):
+        """The saves of a flush that failed stay pending"""
+        user = User()
+        user.save()
+        with patch.object(atomic, "open_atomic", side_effect=OSError):
+            with self.assertRaises(OSError):
+                models.storage.flush()
+        self.assertFalse(os.path.exists(self.path))
+        models.storage.flush()
+        self.assertEqual(self.stored(), {"User." + user.id})
+
+    def test_failed_background_write(self):
+        """The error of a failed background write is raised by the next
+        save(), and the saves are written again"""
+        FileStorage._FileStorage__write_behind = 0.05
+        user = User()
+        with patch.object(atomic, "open_atomic",
+                          side_effect=OSError("disk full")):
+            user.save()
+            for i in range(500):
+                if FileStorage._FileStorage__flush_error is not None:
+                    break
+                time.sleep(0.01)
+        with self.assertRaisesRegex(OSError, "disk full"):
+            User().save()
+        self.wait_for_file()
+        self.assertIn("User." + user.id, self.stored())
+
+    def test_quit_flushes(self):
+        """The console flushes on quit"""
+        with patch('sys.stdout', new_callable=StringIO) as out:
+            cli = HBNBCommand()
+            cli.onecmd("create User")
+            self.assertFalse(os.path.exists(self.path))
+            cli.onecmd("quit")
+        self.assertEqual(self.stored(),
+                         {"User." + out.getvalue().strip()})
+
+
+if __name__ == '__main__':
+    unittest.main()